@@ -3,11 +3,14 @@ Module d'authentification Télérecours
 """
 
 import asyncio
+import json
+import os
 from typing import Dict, Optional
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
-from bs4 import BeautifulSoup
 
 from config import TelecoursConfig
+from navigateur import obtenir_page_session
+from parseur import analyser_html
 
 
 class TelecoursAuth:
@@ -31,10 +34,11 @@ class TelecoursAuth:
         
         print("🌐 Connexion à Télérecours...")
         
-        # Ouvrir la page de connexion
+        # Ouvrir la page de connexion (prête dès que les trois champs du formulaire existent)
         config_login = CrawlerRunConfig(
             session_id=self.config.session_id,
-            page_timeout=self.config.page_timeout,
+            wait_for="js:() => ['#Username', '#password-field', '#login-submit'].every(sel => document.querySelector(sel))",
+            page_timeout=self.config.timeout_connexion,
             cache_mode=0,
             verbose=False
         )
@@ -52,8 +56,6 @@ class TelecoursAuth:
         
         # Remplir et soumettre le formulaire
         js_login = f"""
-        await new Promise(resolve => setTimeout(resolve, 500));
-        
         const usernameField = document.querySelector('#Username');
         if (usernameField) {{
             usernameField.value = '{self.config.username}';
@@ -64,8 +66,6 @@ class TelecoursAuth:
             passwordField.value = '{self.config.password}';
         }}
         
-        await new Promise(resolve => setTimeout(resolve, 300));
-        
         const submitButton = document.querySelector('#login-submit');
         if (submitButton) {{
             submitButton.click();
@@ -77,7 +77,7 @@ class TelecoursAuth:
             js_code=js_login,
             js_only=True,
             wait_for="css:li[name^='TA']",  # Attendre la page de sélection
-            page_timeout=self.config.page_timeout,
+            page_timeout=self.config.timeout_connexion,
             cache_mode=0,
             verbose=False
         )
@@ -96,6 +96,91 @@ class TelecoursAuth:
         
         return True
     
+    async def verifier_session(self, crawler: AsyncWebCrawler) -> bool:
+        """
+        Vérifie que la session courante donne accès à la sélection des juridictions
+        (laisse la page sur la sélection des juridictions)
+        
+        Returns:
+            bool: True si la session est authentifiée
+        """
+        # Attendre la sélection des juridictions OU le formulaire de login (session expirée)
+        config_verif = CrawlerRunConfig(
+            session_id=self.config.session_id,
+            wait_for="js:() => document.querySelector(\"li[name^='TA']\") !== null || document.querySelector('#Username') !== null",
+            page_timeout=self.config.timeout_verification_session,
+            cache_mode=0,
+            verbose=False
+        )
+        
+        result = await crawler.arun(
+            url=self.config.selection_juridiction_url,
+            config=config_verif
+        )
+        
+        self.is_authenticated = (
+            result.success
+            and analyser_html(result.html, self.config.parseur_html).select_one("li[name^='TA']") is not None
+        )
+        return self.is_authenticated
+    
+    async def connecter(self, crawler: AsyncWebCrawler) -> bool:
+        """
+        Connexion en réutilisant la session sauvegardée si elle est encore valide
+        (login complet uniquement si la session a expiré)
+        
+        Returns:
+            bool: True si connexion réussie
+        """
+        if self.config.reutiliser_session and self.config.fichier_session.exists():
+            print("🌐 Reprise de la session sauvegardée...")
+            
+            if await self.verifier_session(crawler):
+                print("   ✅ Session toujours valide (login évité)")
+                return True
+            
+            print("   ⚠️  Session expirée, nouvelle connexion")
+        
+        if not await self.login(crawler):
+            return False
+        
+        # Même avec --nouvelle-session : la session fraîche sert aux exécutions suivantes
+        if self.config.sauvegarder_session:
+            await self.sauvegarder_etat_session(crawler)
+        
+        return True
+    
+    async def sauvegarder_etat_session(self, crawler: AsyncWebCrawler):
+        """Sauvegarde cookies + localStorage pour les exécutions suivantes"""
+        etat = await self.exporter_etat_session(crawler)
+        if not etat:
+            return
+        
+        fichier = self.config.fichier_session
+        fichier.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Fichier sensible (cookies d'authentification) : lisible par le seul propriétaire
+        fichier_tmp = fichier.with_suffix('.tmp')
+        with open(os.open(fichier_tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w', encoding='utf-8') as f:
+            json.dump(etat, f)
+        os.replace(fichier_tmp, fichier)
+        
+        if self.config.verbose:
+            print(f"   💾 Session sauvegardée ({fichier})")
+    
+    async def exporter_etat_session(self, crawler: AsyncWebCrawler) -> Optional[Dict]:
+        """
+        Exporte l'état de la session authentifiée (cookies + localStorage)
+        
+        Returns:
+            Dict: storage_state Playwright, ou None si la session est introuvable
+        """
+        page = obtenir_page_session(crawler, self.config.session_id)
+        if page is None:
+            return None
+        
+        return await page.context.storage_state()
+    
     async def setup_cookie_hook(self, crawler: AsyncWebCrawler):
         """Configure le hook pour capturer les cookies"""
         
@@ -103,10 +188,12 @@ class TelecoursAuth:
             """Hook pour capturer les cookies"""
             try:
                 cookies_playwright = await context.cookies()
-                self.cookies = {
+                # Mise à jour en place : le dict est partagé avec MessageScraper
+                self.cookies.clear()
+                self.cookies.update({
                     cookie['name']: cookie['value'] 
                     for cookie in cookies_playwright
-                }
+                })
                 
                 if self.config.verbose and len(self.cookies) > 0 and url and "Login" in url:
                     print(f"   🍪 Session établie ({len(self.cookies)} cookies)")
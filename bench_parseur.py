@@ -0,0 +1,119 @@
+"""
+Benchmark des backends d'analyse HTML sur les pages de messages sauvegardées
+
+Pour chaque page extractions/*/message_*.html et chaque backend (parseur.py) :
+temps de parsing seul, temps parsing + extraction des liens PDF, et
+vérification que l'extraction est identique à celle de 'html.parser'.
+
+Usage:
+    python bench_parseur.py
+    python bench_parseur.py --repetitions 50 --fichiers "extractions/TA75/message_*.html"
+"""
+
+import argparse
+import asyncio
+import glob
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import List
+
+from config import TelecoursConfig
+from parseur import PARSEURS_DISPONIBLES, PARSEUR_PAR_DEFAUT, analyser_html, resoudre_parseur
+from scraper_messages import MessageScraper
+
+
+async def mesurer(fonction, repetitions: int) -> float:
+    """Temps moyen d'un appel (fonction ou coroutine), en millisecondes"""
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        resultat = fonction()
+        if asyncio.iscoroutine(resultat):
+            await resultat
+    return (time.perf_counter() - debut) * 1000 / repetitions
+
+
+async def bench(fichiers: List[str], repetitions: int):
+    """Mesure chaque backend sur chaque page et compare les extractions"""
+    config = TelecoursConfig(utiliser_index=False)
+    parseurs = [nom for nom in PARSEURS_DISPONIBLES if resoudre_parseur(nom) == nom]
+
+    scrapers = {
+        nom: MessageScraper(replace(config, parseur_html=nom), {})
+        for nom in parseurs
+    }
+
+    totaux = {nom: [0.0, 0.0] for nom in parseurs}
+    differences = 0
+
+    print(f"{'Page':<32} {'Parseur':<12} {'Parsing':>10} {'+ Extraction':>14}")
+    print("-" * 72)
+
+    for fichier in fichiers:
+        html = Path(fichier).read_text(encoding='utf-8')
+        page = f"{Path(fichier).parent.name}/{Path(fichier).name}"
+        reference = await scrapers[PARSEUR_PAR_DEFAUT].extraire_liens_pdf(html)
+
+        for nom, scraper in scrapers.items():
+            temps_parsing = await mesurer(lambda: analyser_html(html, nom), repetitions)
+            temps_extraction = await mesurer(lambda: scraper.extraire_liens_pdf(html), repetitions)
+
+            identique = await scraper.extraire_liens_pdf(html) == reference
+            if not identique:
+                differences += 1
+
+            totaux[nom][0] += temps_parsing
+            totaux[nom][1] += temps_extraction
+
+            print(
+                f"{page:<32} {nom:<12} {temps_parsing:>8.2f}ms {temps_extraction:>12.2f}ms"
+                f"{'' if identique else '  ⚠️  extraction différente'}"
+            )
+
+    print("-" * 72)
+    for nom in parseurs:
+        parsing, extraction = totaux[nom]
+        print(
+            f"{'Moyenne par page':<32} {nom:<12} "
+            f"{parsing / len(fichiers):>8.2f}ms {extraction / len(fichiers):>12.2f}ms"
+        )
+
+    if differences:
+        print(f"\n⚠️  {differences} extraction(s) différente(s) de '{PARSEUR_PAR_DEFAUT}'")
+    else:
+        print(f"\n✅ Extractions identiques pour tous les parseurs ({', '.join(parseurs)})")
+
+    for scraper in scrapers.values():
+        await scraper.fermer()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark des parseurs HTML sur les messages sauvegardés"
+    )
+    parser.add_argument(
+        '--fichiers',
+        type=str,
+        default="extractions/*/message_*.html",
+        help="Motif glob des pages de messages à analyser"
+    )
+    parser.add_argument(
+        '--repetitions',
+        type=int,
+        default=20,
+        help="Nombre de mesures par page et par parseur"
+    )
+
+    args = parser.parse_args()
+
+    fichiers = sorted(glob.glob(args.fichiers))
+    if not fichiers:
+        print(f"❌ Aucune page trouvée pour '{args.fichiers}'")
+        return
+
+    print(f"📊 {len(fichiers)} page(s), {args.repetitions} répétition(s)\n")
+    asyncio.run(bench(fichiers, max(1, args.repetitions)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Benchmark de bout en bout du scraper contre le Télérecours simulé (mock_telerecours.py)
+
+Lance le serveur simulé, exécute le vrai parcours (login, détection, sélection,
+liste, lecture, téléchargements) avec un vrai navigateur, puis affiche le temps
+total, la latence par étape et le débit.
+
+Usage:
+    python bench_scraper.py --juridictions 3 --messages 20
+    python bench_scraper.py --juridictions 6 --messages 50 --latence 80 --workers 3 --detail-http
+"""
+
+import argparse
+import asyncio
+import functools
+import shutil
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+from crawl4ai import AsyncWebCrawler
+
+from config import TelecoursConfig
+from auth import TelecoursAuth
+from notifs import NotificationDetector
+from scraper_messages import MessageScraper
+from detail_http import LecteurMessagesHttp
+from navigateur import creer_browser_config, installer_blocage_ressources
+from workers import scraper_juridictions_en_parallele
+from sortie import lire_messages
+from mock_telerecours import ServeurTelerecoursSimule, URL_LOGIN, URL_SELECTION
+
+
+# Étapes mesurées : (libellé, classe, méthode)
+ETAPES = [
+    ("connexion", TelecoursAuth, 'login'),
+    ("vérification session", TelecoursAuth, 'verifier_session'),
+    ("détection", NotificationDetector, 'get_juridictions_avec_notifs'),
+    ("sélection juridiction", NotificationDetector, 'selectionner_juridiction'),
+    ("liste des messages", MessageScraper, '_lister_messages'),
+    ("lecture (navigateur)", MessageScraper, '_lire_message_navigateur'),
+    ("lecture (HTTP)", LecteurMessagesHttp, 'lire_message'),
+    ("téléchargements / message", MessageScraper, 'telecharger_pdfs_message'),
+    ("retour liste", MessageScraper, '_retour_liste'),
+    ("juridiction complète", MessageScraper, 'scraper_tous_messages'),
+]
+
+
+class Chronometre:
+    """Mesure la durée de chaque appel des méthodes instrumentées (toutes instances, workers compris)"""
+
+    def __init__(self):
+        self.durees: Dict[str, List[float]] = defaultdict(list)
+        self._originales = []
+
+    def instrumenter(self, etape: str, classe, nom_methode: str):
+        originale = getattr(classe, nom_methode)
+        durees = self.durees[etape]
+
+        @functools.wraps(originale)
+        async def mesuree(*args, **kwargs):
+            debut = time.perf_counter()
+            try:
+                return await originale(*args, **kwargs)
+            finally:
+                durees.append(time.perf_counter() - debut)
+
+        setattr(classe, nom_methode, mesuree)
+        self._originales.append((classe, nom_methode, originale))
+
+    def restaurer(self):
+        for classe, nom_methode, originale in reversed(self._originales):
+            setattr(classe, nom_methode, originale)
+        self._originales.clear()
+
+
+def percentile(valeurs: List[float], p: float) -> float:
+    valeurs = sorted(valeurs)
+    return valeurs[min(len(valeurs) - 1, int(round(p * (len(valeurs) - 1))))]
+
+
+async def parcours_complet(config: TelecoursConfig) -> Dict:
+    """Même enchaînement que main_auto (sans confirmation interactive)"""
+    resultats = {'juridictions_traitees': 0, 'total_messages': 0}
+
+    async with AsyncWebCrawler(config=creer_browser_config(config)) as crawler:
+        auth = TelecoursAuth(config)
+        await auth.setup_cookie_hook(crawler)
+        await installer_blocage_ressources(crawler, config)
+
+        if not await auth.connecter(crawler):
+            return resultats
+
+        detector = NotificationDetector(config)
+        juridictions = await detector.get_juridictions_avec_notifs(crawler)
+
+        if config.workers > 1:
+            etat_session = await auth.exporter_etat_session(crawler)
+            resultats = await scraper_juridictions_en_parallele(config, juridictions, etat_session)
+            await crawler.crawler_strategy.kill_session(config.session_id)
+            return resultats
+
+        scraper = MessageScraper(config, auth.cookies)
+        try:
+            for juridiction in juridictions:
+                if not await detector.selectionner_juridiction(crawler, juridiction):
+                    continue
+
+                nb_messages = await scraper.scraper_tous_messages(
+                    crawler=crawler,
+                    code_juridiction=juridiction.code,
+                    messages_non_lus_seulement=True,
+                    max_messages=config.max_messages_par_juridiction
+                )
+
+                if nb_messages:
+                    resultats['juridictions_traitees'] += 1
+                    resultats['total_messages'] += nb_messages
+        finally:
+            await scraper.fermer()
+            await crawler.crawler_strategy.kill_session(config.session_id)
+
+    return resultats
+
+
+def compter_pdfs(config: TelecoursConfig) -> tuple:
+    """PDFs présents dans les fichiers de sortie produits (nombre, taille en Mo)"""
+    nb_pdfs = 0
+    taille = 0
+    for fichier in config.output_dir.glob("*/messages_*.*json"):
+        for msg in lire_messages(fichier):
+            for pdf in msg.get('fichiers_telecharges', []):
+                nb_pdfs += 1
+                taille += pdf.get('taille') or len(pdf.get('contenu_base64') or '') * 3 // 4
+    return nb_pdfs, taille / (1024 * 1024)
+
+
+def afficher_rapport(chronometre: Chronometre, resultats: Dict, duree: float, serveur: ServeurTelerecoursSimule, config: TelecoursConfig):
+    print("\n" + "=" * 78)
+    print("📊 RÉSULTATS DU BENCHMARK")
+    print("=" * 78)
+
+    print(f"\n{'Étape':<28} {'Appels':>7} {'Total':>9} {'Moyenne':>10} {'p50':>9} {'p95':>9}")
+    print("-" * 78)
+    for etape, _, _ in ETAPES:
+        durees = chronometre.durees.get(etape)
+        if not durees:
+            continue
+        print(
+            f"{etape:<28} {len(durees):>7} {sum(durees):>8.2f}s "
+            f"{sum(durees) / len(durees) * 1000:>8.0f}ms "
+            f"{percentile(durees, 0.5) * 1000:>7.0f}ms {percentile(durees, 0.95) * 1000:>7.0f}ms"
+        )
+
+    print(f"\n{'Requêtes reçues par le serveur':<40}")
+    print("-" * 78)
+    for etape, nombre in sorted(serveur.requetes.items(), key=lambda e: -e[1]):
+        print(f"   {etape:<36} {nombre:>6}")
+
+    total_messages = resultats['total_messages']
+    nb_pdfs, taille_pdfs = compter_pdfs(config)
+    print("\n" + "-" * 78)
+    print(f"⏱️  Temps total        : {duree:.2f}s")
+    print(f"📍 Juridictions       : {resultats['juridictions_traitees']}")
+    print(f"📬 Messages           : {total_messages} ({total_messages / duree:.2f} message(s)/s)")
+    print(f"📥 PDFs               : {nb_pdfs} ({nb_pdfs / duree:.2f} PDF/s, {taille_pdfs / duree:.2f} Mo/s)")
+
+
+async def bench(args):
+    serveur = ServeurTelerecoursSimule(
+        nb_juridictions=args.juridictions,
+        messages_par_juridiction=args.messages,
+        latence_ms=args.latence,
+        latence_pdf_ms=args.latence_pdf,
+        taille_page=args.taille_page
+    )
+    url = await serveur.demarrer()
+
+    dossier_travail = Path(tempfile.mkdtemp(prefix="bench_telerecours_"))
+    config = TelecoursConfig(
+        username="bench",
+        password="bench",
+        base_url=url,
+        login_url=url + URL_LOGIN,
+        selection_juridiction_url=url + URL_SELECTION,
+        output_dir=dossier_travail / "extractions",
+        pdfs_dir=dossier_travail / "pdfs",
+        blobs_dir=dossier_travail / "extractions" / "blobs",
+        max_messages_par_juridiction=args.messages,
+        reutiliser_session=False,
+        sauvegarder_session=False,
+        fichier_session=dossier_travail / ".session" / "storage_state.json",
+        utiliser_index=False,
+        workers=max(1, args.workers),
+        detail_http=args.detail_http,
+        telechargement_http=not args.no_http,
+        headless=not args.no_headless
+    )
+
+    print(f"🧪 Télérecours simulé sur {url}")
+    print(f"   {args.juridictions} juridiction(s) x {args.messages} message(s), "
+          f"latence {args.latence} ms (PDF {args.latence_pdf} ms), {config.workers} worker(s)")
+
+    chronometre = Chronometre()
+    for etape, classe, nom_methode in ETAPES:
+        chronometre.instrumenter(etape, classe, nom_methode)
+
+    try:
+        debut = time.perf_counter()
+        resultats = await parcours_complet(config)
+        duree = time.perf_counter() - debut
+
+        afficher_rapport(chronometre, resultats, duree, serveur, config)
+
+    finally:
+        chronometre.restaurer()
+        await serveur.arreter()
+        if not args.garder_sorties:
+            shutil.rmtree(dossier_travail, ignore_errors=True)
+        else:
+            print(f"\n📁 Sorties conservées dans {dossier_travail}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark de bout en bout contre un Télérecours simulé en local"
+    )
+    parser.add_argument('--juridictions', type=int, default=3, help="Nombre de juridictions (N)")
+    parser.add_argument('--messages', type=int, default=20, help="Messages non lus par juridiction (M)")
+    parser.add_argument('--latence', type=int, default=50, help="Latence serveur par page (ms)")
+    parser.add_argument('--latence-pdf', type=int, default=100, help="Latence serveur par PDF (ms)")
+    parser.add_argument('--taille-page', type=int, default=20, help="Lignes par page de la grille des messages")
+    parser.add_argument('--workers', type=int, default=1, help="Juridictions traitées en parallèle")
+    parser.add_argument('--detail-http', action='store_true', help="Lecture des messages en HTTP direct")
+    parser.add_argument('--no-http', action='store_true', help="Téléchargements via le navigateur uniquement")
+    parser.add_argument('--no-headless', action='store_true', help="Afficher le navigateur")
+    parser.add_argument('--garder-sorties', action='store_true', help="Conserver les JSON et PDFs produits")
+
+    args = parser.parse_args()
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
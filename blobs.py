@@ -0,0 +1,132 @@
+"""
+Magasin des PDFs adressé par contenu
+
+Chaque PDF est écrit une seule fois sous le nom de son empreinte SHA-256
+(extractions/blobs/ab/abcdef....pdf) ; les messages ne portent que l'empreinte,
+la taille et le nom de fichier. Un même PDF reçu plusieurs fois (accusés,
+pièces jointes répétées) n'occupe qu'une place sur le disque.
+
+Le contenu base64 attendu par le webhook ou par --pdfs-inline est produit par
+blocs en relisant le blob : un PDF n'est jamais gardé en mémoire sous forme
+encodée.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import secrets
+import shutil
+from pathlib import Path
+from typing import Dict, Iterator
+
+
+# Taille des blocs lus et encodés (multiple de 3 : les blocs base64 se concatènent sans remplissage)
+TAILLE_BLOC = 3 * 64 * 1024
+
+
+class MagasinBlobs:
+    """PDFs stockés sous leur empreinte SHA-256, écriture atomique et sans doublon"""
+
+    def __init__(self, dossier: Path):
+        self.dossier = dossier
+
+    def chemin(self, empreinte: str) -> Path:
+        """Fichier d'un blob (sous-dossier des 2 premiers caractères de l'empreinte)"""
+        return self.dossier / empreinte[:2] / f"{empreinte}.pdf"
+
+    @staticmethod
+    def _chemin_temporaire(chemin: Path) -> Path:
+        """Nom temporaire unique : plusieurs workers peuvent écrire le même blob"""
+        return chemin.with_name(f"{chemin.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp")
+
+    def stocker(self, contenu: bytes) -> Dict:
+        """Écrit le PDF s'il n'est pas déjà présent
+
+        Returns:
+            Dict: {'sha256': empreinte, 'taille': octets}
+        """
+        empreinte = hashlib.sha256(contenu).hexdigest()
+        chemin = self.chemin(empreinte)
+
+        if not chemin.exists():
+            chemin.parent.mkdir(parents=True, exist_ok=True)
+            chemin_tmp = self._chemin_temporaire(chemin)
+            chemin_tmp.write_bytes(contenu)
+            os.replace(chemin_tmp, chemin)
+
+        return {'sha256': empreinte, 'taille': len(contenu)}
+
+    def lire(self, empreinte: str) -> bytes:
+        """Contenu d'un blob"""
+        return self.chemin(empreinte).read_bytes()
+
+    def importer(self, chemin_source: Path) -> Dict:
+        """Déplace un PDF téléchargé sur le disque dans le magasin, sans le charger en mémoire
+
+        Returns:
+            Dict: {'sha256': empreinte, 'taille': octets}
+        """
+        empreinte = hashlib.sha256()
+        with open(chemin_source, 'rb') as f:
+            for bloc in iter(lambda: f.read(TAILLE_BLOC), b''):
+                empreinte.update(bloc)
+        empreinte = empreinte.hexdigest()
+        taille = chemin_source.stat().st_size
+
+        chemin = self.chemin(empreinte)
+        if chemin.exists():
+            chemin_source.unlink()
+        else:
+            chemin.parent.mkdir(parents=True, exist_ok=True)
+            chemin_tmp = self._chemin_temporaire(chemin)
+            shutil.move(str(chemin_source), str(chemin_tmp))
+            os.replace(chemin_tmp, chemin)
+
+        return {'sha256': empreinte, 'taille': taille}
+
+    def base64_par_blocs(self, empreinte: str) -> Iterator[str]:
+        """Contenu base64 d'un blob, encodé bloc par bloc en lisant le fichier"""
+        with open(self.chemin(empreinte), 'rb') as f:
+            for bloc in iter(lambda: f.read(TAILLE_BLOC), b''):
+                yield base64.b64encode(bloc).decode('ascii')
+
+    def json_par_blocs(self, valeur) -> Iterator[str]:
+        """Sérialise en JSON par morceaux, contenu base64 des PDFs stockés compris
+
+        Chaque fichier portant une empreinte (sha256) reçoit son 'contenu_base64',
+        lu et encodé au fil de l'écriture : aucun PDF n'est chargé en entier.
+        """
+        if isinstance(valeur, dict):
+            yield '{'
+            for i, (cle, sous_valeur) in enumerate(valeur.items()):
+                yield (', ' if i else '') + json.dumps(str(cle), ensure_ascii=False) + ': '
+                yield from self.json_par_blocs(sous_valeur)
+            if valeur.get('sha256') and 'contenu_base64' not in valeur:
+                yield ', "contenu_base64": "'
+                yield from self.base64_par_blocs(valeur['sha256'])
+                yield '"'
+            yield '}'
+        elif isinstance(valeur, (list, tuple)):
+            yield '['
+            for i, element in enumerate(valeur):
+                if i:
+                    yield ', '
+                yield from self.json_par_blocs(element)
+            yield ']'
+        else:
+            yield json.dumps(valeur, ensure_ascii=False)
+
+    def corps_json(self, valeur) -> Iterator[bytes]:
+        """Corps HTTP JSON en flux (transfert par morceaux), regroupé en blocs de TAILLE_BLOC"""
+        tampon = []
+        taille = 0
+        for morceau in self.json_par_blocs(valeur):
+            tampon.append(morceau)
+            taille += len(morceau)
+            if taille >= TAILLE_BLOC:
+                yield ''.join(tampon).encode('utf-8')
+                tampon = []
+                taille = 0
+        if tampon:
+            yield ''.join(tampon).encode('utf-8')
@@ -0,0 +1,160 @@
+"""
+Boîte d'envoi persistante du webhook (SQLite)
+
+Chaque payload est enregistré avant son envoi et n'est supprimé qu'une fois
+accepté par le webhook. Un échec (timeout, erreur réseau, 5xx) reprogramme
+l'envoi avec un délai exponentiel ; les envois encore en attente en fin
+d'exécution sont repris à l'exécution suivante.
+"""
+
+import hashlib
+import json
+import random
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def cle_idempotence(code_juridiction: str, msg_id: str) -> str:
+    """Clé stable d'un message (en-tête Idempotency-Key) : le destinataire peut écarter les doublons"""
+    return hashlib.sha256(f"{code_juridiction}:{msg_id}".encode('utf-8')).hexdigest()[:32]
+
+
+def cle_lot(cles: List[str]) -> str:
+    """Clé d'idempotence d'un lot : identique pour les mêmes messages, quel que soit l'ordre"""
+    return hashlib.sha256('|'.join(sorted(cles)).encode('utf-8')).hexdigest()[:32]
+
+
+class BoiteEnvoi:
+    """Payloads en attente de livraison, clé d'idempotence en clé primaire"""
+
+    def __init__(self, chemin: Path, backoff_initial: float = 2.0, backoff_max: float = 300.0):
+        chemin.parent.mkdir(parents=True, exist_ok=True)
+        self.chemin = chemin
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.connexion = sqlite3.connect(str(chemin), timeout=30)
+        # WAL : plusieurs workers partagent la même boîte d'envoi
+        self.connexion.execute("PRAGMA journal_mode=WAL")
+        self.connexion.execute("""
+            CREATE TABLE IF NOT EXISTS envois (
+                cle TEXT PRIMARY KEY,
+                code_juridiction TEXT NOT NULL,
+                msg_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                tentatives INTEGER NOT NULL DEFAULT 0,
+                prochain_essai REAL,
+                derniere_erreur TEXT,
+                cree_le TEXT
+            )
+        """)
+        self.connexion.commit()
+
+    def deposer(self, cle: str, code_juridiction: str, msg_id: str, payload: Dict, reserve_jusqua: float):
+        """Enregistre un payload à livrer, réservé par l'appelant jusqu'à reserve_jusqua
+
+        Un message déjà présent (réextrait) est remplacé et redevient à livrer.
+        """
+        self.connexion.execute("""
+            INSERT INTO envois (cle, code_juridiction, msg_id, payload, prochain_essai, cree_le)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (cle)
+            DO UPDATE SET payload = excluded.payload, prochain_essai = excluded.prochain_essai, tentatives = 0
+        """, (
+            cle, code_juridiction, msg_id, json.dumps(payload, ensure_ascii=False),
+            reserve_jusqua, time.strftime('%Y-%m-%d %H:%M:%S')
+        ))
+        self.connexion.commit()
+
+    def reserver_echus(self, reserve_jusqua: float, limite: int) -> List[str]:
+        """Réserve les envois dont la date de relance est passée
+
+        La réservation (prochain_essai repoussé) empêche un autre worker de
+        prendre le même envoi ; elle expire d'elle-même si l'envoi n'aboutit pas.
+
+        Returns:
+            List[str]: Clés réservées
+        """
+        maintenant = time.time()
+        echus = self.connexion.execute(
+            "SELECT cle, prochain_essai FROM envois WHERE prochain_essai <= ? ORDER BY prochain_essai LIMIT ?",
+            (maintenant, limite)
+        ).fetchall()
+
+        reserves = []
+        for cle, prochain_essai in echus:
+            curseur = self.connexion.execute(
+                "UPDATE envois SET prochain_essai = ? WHERE cle = ? AND prochain_essai = ?",
+                (reserve_jusqua, cle, prochain_essai)
+            )
+            if curseur.rowcount == 1:
+                reserves.append(cle)
+        self.connexion.commit()
+        return reserves
+
+    def lire(self, cle: str) -> Optional[Dict]:
+        """Envoi en attente : {'code_juridiction', 'msg_id', 'payload', 'tentatives'} (None si déjà acquitté)"""
+        ligne = self.connexion.execute(
+            "SELECT code_juridiction, msg_id, payload, tentatives FROM envois WHERE cle = ?",
+            (cle,)
+        ).fetchone()
+        if ligne is None:
+            return None
+
+        return {
+            'code_juridiction': ligne[0],
+            'msg_id': ligne[1],
+            'payload': json.loads(ligne[2]),
+            'tentatives': ligne[3]
+        }
+
+    def acquitter(self, cle: str):
+        """Supprime un envoi accepté par le webhook"""
+        self.connexion.execute("DELETE FROM envois WHERE cle = ?", (cle,))
+        self.connexion.commit()
+
+    def reprogrammer(self, cle: str, erreur: str) -> float:
+        """Reprogramme un envoi en échec avec un délai exponentiel (et un peu d'aléa)
+
+        Returns:
+            float: Délai avant la prochaine tentative, en secondes
+        """
+        tentatives = self.connexion.execute(
+            "SELECT tentatives FROM envois WHERE cle = ?", (cle,)
+        ).fetchone()
+        tentatives = (tentatives[0] if tentatives else 0) + 1
+
+        delai = min(self.backoff_initial * 2 ** (tentatives - 1), self.backoff_max)
+        delai *= random.uniform(0.8, 1.2)
+
+        self.connexion.execute(
+            "UPDATE envois SET tentatives = ?, prochain_essai = ?, derniere_erreur = ? WHERE cle = ?",
+            (tentatives, time.time() + delai, erreur, cle)
+        )
+        self.connexion.commit()
+        return delai
+
+    def rejeter(self, cle: str, erreur: str):
+        """Écarte un envoi refusé définitivement (4xx) : conservé, mais plus relancé"""
+        self.connexion.execute(
+            "UPDATE envois SET tentatives = tentatives + 1, prochain_essai = NULL, derniere_erreur = ? WHERE cle = ?",
+            (erreur, cle)
+        )
+        self.connexion.commit()
+
+    def prochaine_relance(self) -> Optional[float]:
+        """Date (time.time) de la prochaine relance programmée, None si rien à relancer"""
+        return self.connexion.execute(
+            "SELECT MIN(prochain_essai) FROM envois WHERE prochain_essai IS NOT NULL"
+        ).fetchone()[0]
+
+    def nb_en_attente(self) -> int:
+        """Envois non acquittés et encore relançables"""
+        return self.connexion.execute(
+            "SELECT COUNT(*) FROM envois WHERE prochain_essai IS NOT NULL"
+        ).fetchone()[0]
+
+    def fermer(self):
+        """Ferme la connexion SQLite"""
+        self.connexion.close()
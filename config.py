@@ -4,7 +4,7 @@ Configuration globale du scraper Télérecours
 
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple
 
 
 @dataclass
@@ -30,15 +30,93 @@ class TelecoursConfig:
     messages_lus: bool = False  # Si True, scrape les messages lus au lieu des non lus
     verbose: bool = True
     
+    # Backend d'analyse HTML ('lxml' rapide, repli automatique sur 'html.parser')
+    parseur_html: str = "lxml"
+    
+    # Index des messages déjà traités (scraping incrémental entre exécutions)
+    utiliser_index: bool = True
+    index_path: Path = Path("./extractions/index_messages.sqlite")
+    
+    # Pagination de la grille des messages
+    max_pages_liste: int = 50  # Garde-fou : pages parcourues au plus par juridiction
+    depuis: Optional[str] = None  # Date limite 'DD/MM/YYYY' : les messages plus anciens sont ignorés
+    timeout_pagination: int = 20000
+    
+    # Reprise d'une exécution interrompue (points de reprise dans extractions/.reprise/)
+    reprendre: bool = False
+    points_reprise: bool = False  # Activé par --auto une fois l'exécution démarrée : les autres modes ne sauvegardent rien
+    
+    # Format de sortie : 'ndjson' (un message par ligne, écrit au fil de l'eau) ou 'json' (tableau historique)
+    format_sortie: str = "ndjson"
+    
+    # PDFs : magasin adressé par contenu (messages avec empreinte SHA-256 et taille)
+    # ou contenu base64 dans chaque message (pdfs_inline, ancien format)
+    blobs_dir: Path = Path("./extractions/blobs")
+    pdfs_inline: bool = False
+    
     # Configuration navigateur
     headless: bool = True
     page_timeout: int = 30000
     
+    # Délais maximaux par étape (ms) : chaque étape attend une condition DOM réelle
+    timeout_connexion: int = 30000   # Formulaire de login, puis sélection des juridictions
+    timeout_selection: int = 20000   # Accueil de la juridiction après __doPostBack
+    timeout_messages: int = 20000    # Lignes de la grille des messages
+    timeout_lecture: int = 20000     # En-tête #divEnteteMsg du message
+    timeout_retour: int = 15000      # Retour à la liste (#btRetour)
+    
+    # Ressources bloquées dans le navigateur (les scripts du site restent chargés)
+    bloquer_ressources: Tuple[str, ...] = ("image", "font", "stylesheet", "media")
+    # Domaines (et leurs sous-domaines) bloqués : comparés au nom d'hôte de chaque requête
+    bloquer_domaines: Tuple[str, ...] = (
+        "google-analytics.com", "googletagmanager.com", "xiti.com", "matomo.cloud", "piwik.pro"
+    )
+    
     # Session
     session_id: str = "telerecours_session"
     
+    # Session persistante entre les exécutions (cookies + localStorage Playwright)
+    reutiliser_session: bool = True  # False : ignorer la session sauvegardée (login complet)
+    sauvegarder_session: bool = True  # Sauvegarder la session après un login complet
+    fichier_session: Path = Path("./.session/storage_state.json")
+    
+    # Workers parallèles (mode --auto) : 1 navigateur par worker, login partagé
+    workers: int = 1
+    # Cookies de session serveur ASP.NET retirés pour que chaque worker ait son propre état
+    cookies_session_serveur: Tuple[str, ...] = ("ASP.NET_SessionId",)
+    timeout_verification_session: int = 10000  # ms
+    
+    # Téléchargement HTTP direct des PDFs (cookies de session, sans navigateur)
+    telechargement_http: bool = True
+    http_max_connexions: int = 4
+    http_max_connexions_par_hote: int = 4
+    max_telechargements_par_message: int = 4  # Pièces d'un même message téléchargées en parallèle
+    http_timeout: int = 60  # secondes
+    timeout_telechargement: int = 15000  # ms, attente de l'événement download (accusés onclick)
+    capture_memoire: bool = True  # PDFs interceptés en mémoire, sans passage par pdfs/
+    detail_http: bool = False  # Détail des messages lu en HTTP (rejeu du postback lireMessage)
+    navigation_directe: bool = True  # Ouvrir le message suivant depuis le détail, sans #btRetour
+    
     # Webhook
     webhook_url: Optional[str] = None
+    # Livraison en arrière-plan : file bornée vidée par des tâches d'envoi (client aiohttp partagé)
+    webhook_envoyeurs: int = 2
+    webhook_taille_file: int = 20  # Le scraping attend si la file est pleine
+    webhook_max_connexions: int = 4
+    webhook_timeout: int = 30  # secondes
+    # Boîte d'envoi persistante : payloads conservés jusqu'à acceptation, relances exponentielles
+    webhook_boite_envoi: Path = Path("./extractions/boite_envoi.sqlite")
+    webhook_backoff_initial: float = 2.0  # secondes, doublé à chaque échec
+    webhook_backoff_max: float = 300.0
+    webhook_delai_vidage: int = 60  # secondes d'attente des relances en fin d'exécution
+    # Envoi par lots : 1 = un message par requête (format historique) ; au-delà, un lot part dès
+    # qu'il atteint webhook_lot_messages messages, webhook_lot_octets octets ou webhook_lot_delai secondes
+    webhook_lot_messages: int = 1
+    webhook_lot_octets: int = 10 * 1024 * 1024
+    webhook_lot_delai: float = 2.0
+    webhook_gzip: bool = False  # Corps compressé (Content-Encoding: gzip)
+    # 'json' : PDFs en base64 dans le JSON ; 'multipart' : JSON + PDFs en parties binaires (non compressées)
+    webhook_format: str = "json"
     
     def __post_init__(self):
         """Créer les dossiers si nécessaire"""
@@ -0,0 +1,294 @@
+"""
+Lecture des messages en HTTP direct (rejeu du postback lireMessage, sans navigateur)
+
+Le navigateur ouvre les deux premiers messages normalement : les requêtes POST
+déclenchées par lireMessage(msg_id, msg_type) sont enregistrées, comparées, et
+servent de modèle pour lire les messages suivants avec les cookies de session.
+"""
+
+import asyncio
+import re
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin
+import aiohttp
+
+from config import TelecoursConfig
+from parseur import analyser_html
+
+
+# Champs d'état ASP.NET : valeurs du second échantillon capturé, jamais modélisées
+CHAMPS_ETAT_ASPNET = (
+    '__VIEWSTATE', '__VIEWSTATEGENERATOR', '__VIEWSTATEENCRYPTED',
+    '__EVENTVALIDATION', '__PREVIOUSPAGE'
+)
+
+# En-têtes de la requête capturée à ne pas rejouer
+EN_TETES_IGNORES = ('cookie', 'content-length', 'host')
+
+MARQUEUR_ID = '\x00ID\x00'
+MARQUEUR_TYPE = '\x00TYPE\x00'
+
+RE_POSTBACK = re.compile(r"__doPostBack\('([^']*)',\s*'([^']*)'\)")
+RE_WINDOW_OPEN = re.compile(r"window\.open\('([^']+)'")
+RE_NUMERO_DOSSIER = re.compile(r"\s*(\d+)")
+
+
+class LecteurMessagesHttp:
+    """Rejoue le postback lireMessage en HTTP pour lire le détail des messages"""
+
+    def __init__(self, config: TelecoursConfig, cookies: Dict[str, str]):
+        self.config = config
+        self.cookies = cookies  # Même dict que TelecoursAuth.cookies
+        self.echantillons: List[Dict] = []
+        self.modele: Optional[Dict] = None
+        self.desactive = False
+        self.nb_echecs = 0
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def pret(self) -> bool:
+        """Vrai si le modèle de requête est appris et utilisable"""
+        return self.modele is not None and not self.desactive
+
+    def _desactiver(self, raison: str):
+        """Repli définitif sur le navigateur pour le reste de l'exécution"""
+        if not self.desactive and self.config.verbose:
+            print(f"      ⚠️  Lecture HTTP désactivée ({raison}), retour au navigateur")
+        self.desactive = True
+
+    @asynccontextmanager
+    async def apprendre(self, page, msg_id: str, msg_type: str):
+        """Enregistre la requête POST émise par le navigateur pendant l'ouverture d'un message
+
+        Usage:
+            async with lecteur.apprendre(page, msg_id, msg_type):
+                ...  # lireMessage(msg_id, msg_type) dans le navigateur
+        """
+        requetes = []
+
+        def sur_requete(request):
+            if request.method == 'POST' and request.resource_type in ('document', 'xhr', 'fetch'):
+                requetes.append(request)
+
+        page.on('request', sur_requete)
+        try:
+            yield
+        finally:
+            page.remove_listener('request', sur_requete)
+
+        if not requetes or self.modele is not None or self.desactive:
+            return
+
+        request = requetes[0]
+        self.echantillons.append({
+            'msg_id': msg_id,
+            'msg_type': msg_type,
+            'url': request.url,
+            'headers': {
+                nom: valeur for nom, valeur in request.headers.items()
+                if nom.lower() not in EN_TETES_IGNORES
+            },
+            'champs': parse_qsl(request.post_data or '', keep_blank_values=True)
+        })
+
+        if len(self.echantillons) >= 2:
+            self._construire_modele(*self.echantillons[-2:])
+
+    @staticmethod
+    def _en_modele(valeur: str, msg_id: str, msg_type: Optional[str]) -> str:
+        """Remplace l'identifiant (et le type) du message par des marqueurs"""
+        valeur = valeur.replace(msg_id, MARQUEUR_ID)
+        if msg_type:
+            valeur = valeur.replace(msg_type, MARQUEUR_TYPE)
+        return valeur
+
+    @staticmethod
+    def _remplir(modele: str, msg_id: str, msg_type: str) -> str:
+        """Remplace les marqueurs par l'identifiant et le type d'un message"""
+        return modele.replace(MARQUEUR_ID, msg_id).replace(MARQUEUR_TYPE, msg_type)
+
+    def _construire_modele(self, e1: Dict, e2: Dict):
+        """Déduit le modèle de requête à partir de deux ouvertures de messages"""
+        if [nom for nom, _ in e1['champs']] != [nom for nom, _ in e2['champs']]:
+            self._desactiver("requêtes lireMessage non comparables")
+            return
+
+        # Le type n'est modélisé que s'il varie entre les deux échantillons
+        type_variable = e1['msg_type'] != e2['msg_type']
+        type_modele = e1['msg_type'] if type_variable else None
+
+        def modeliser(v1: str, v2: str) -> Optional[str]:
+            if v1 == v2:
+                return v1
+            modele = self._en_modele(v1, e1['msg_id'], type_modele)
+            if self._remplir(modele, e2['msg_id'], e2['msg_type']) != v2:
+                return None
+            return modele
+
+        url = modeliser(e1['url'], e2['url'])
+        champs = []
+        for (nom, v1), (_, v2) in zip(e1['champs'], e2['champs']):
+            if nom in CHAMPS_ETAT_ASPNET:
+                champs.append((nom, v2))
+                continue
+
+            modele = modeliser(v1, v2)
+            if modele is None:
+                break
+            champs.append((nom, modele))
+
+        if url is None or len(champs) != len(e2['champs']):
+            self._desactiver("paramètres lireMessage non reconnus")
+            return
+
+        self.modele = {
+            'url': url,
+            'headers': e2['headers'],
+            'champs': champs,
+            'type_variable': type_variable,
+            'type_fixe': e2['msg_type']
+        }
+
+        if self.config.verbose:
+            print("      ⚡ Postback lireMessage appris : lecture des messages suivants en HTTP")
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Session HTTP partagée (keep-alive)"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.config.http_max_connexions_par_hote),
+                cookie_jar=aiohttp.DummyCookieJar(),
+                timeout=aiohttp.ClientTimeout(total=self.config.http_timeout)
+            )
+        return self._session
+
+    def _get_headers(self, headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """En-têtes + cookies de session à jour"""
+        return {
+            **(headers or {}),
+            'Cookie': '; '.join(f"{nom}={valeur}" for nom, valeur in self.cookies.items())
+        }
+
+    def _mettre_a_jour_cookies(self, response: aiohttp.ClientResponse):
+        """Répercute les Set-Cookie du serveur dans le dict partagé"""
+        for nom, morsel in response.cookies.items():
+            self.cookies[nom] = morsel.value
+
+    @staticmethod
+    def _est_le_message(html: str, msg_id: str, dossier: str) -> bool:
+        """Vrai si le détail reçu est celui du message demandé (identifiant ou numéro de dossier)"""
+        match_dossier = RE_NUMERO_DOSSIER.match(dossier or '')
+        return msg_id in html or (match_dossier is not None and match_dossier.group(1) in html)
+
+    async def lire_message(self, msg_id: str, msg_type: str, dossier: str = '') -> Optional[Tuple[str, str]]:
+        """Lit le détail d'un message en HTTP
+
+        Args:
+            msg_id: Identifiant du message
+            msg_type: Type du message
+            dossier: Colonne dossier de la grille (ex: "2431661 - Monsieur X"), pour vérifier la réponse
+
+        Returns:
+            Tuple[str, str]: (HTML du détail, URL), ou None pour passer par le navigateur
+        """
+        if not self.pret:
+            return None
+
+        # Type jamais observé en variation : seul le type appris est rejouable
+        if not self.modele['type_variable'] and msg_type != self.modele['type_fixe']:
+            return None
+
+        url = self._remplir(self.modele['url'], msg_id, msg_type)
+        data = urlencode([
+            (nom, self._remplir(valeur, msg_id, msg_type))
+            for nom, valeur in self.modele['champs']
+        ])
+
+        try:
+            session = self._get_session()
+            async with session.post(url, data=data, headers=self._get_headers(self.modele['headers'])) as response:
+                self._mettre_a_jour_cookies(response)
+                html = await response.text()
+                url_detail = str(response.url)
+                status = response.status
+
+        except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError) as e:
+            print(f"      ⚠️  Erreur lecture HTTP {msg_id}: {e}")
+            return None
+
+        if status != 200 or 'divEnteteMsg' not in html:
+            self.nb_echecs += 1
+            if self.nb_echecs >= 2:
+                self._desactiver(f"réponse inattendue ({status})")
+            return None
+
+        # Un état ASP.NET périmé peut renvoyer le détail d'un autre message
+        if not self._est_le_message(html, msg_id, dossier):
+            self._desactiver(f"détail reçu sans le message {msg_id}")
+            return None
+
+        return html, url_detail
+
+    async def telecharger_postback(self, html_detail: str, url_detail: str, id_lien: str) -> Optional[bytes]:
+        """Télécharge un PDF onclick (accusé) en rejouant le postback du lien
+
+        Args:
+            html_detail: HTML du détail du message (obtenu en HTTP)
+            url_detail: URL du détail du message
+            id_lien: Attribut id du lien hplGenFichier
+
+        Returns:
+            bytes: Contenu du PDF, ou None si le lien n'est pas rejouable
+        """
+        soup = analyser_html(html_detail, self.config.parseur_html)
+        lien = soup.find('a', id=id_lien)
+        if not lien:
+            return None
+
+        action_js = f"{lien.get('href', '')} {lien.get('onclick', '')}"
+        match_postback = RE_POSTBACK.search(action_js)
+        match_open = RE_WINDOW_OPEN.search(action_js)
+
+        try:
+            session = self._get_session()
+
+            if match_postback:
+                form = lien.find_parent('form') or soup.find('form')
+                if not form:
+                    return None
+
+                # Champs du formulaire tels que le navigateur les enverrait
+                champs = [
+                    (champ['name'], champ.get('value', ''))
+                    for champ in form.find_all('input', attrs={'name': True})
+                    if champ.get('type', 'text').lower() not in ('submit', 'button', 'image', 'checkbox', 'radio')
+                    and champ['name'] not in ('__EVENTTARGET', '__EVENTARGUMENT')
+                ]
+                champs += [('__EVENTTARGET', match_postback.group(1)), ('__EVENTARGUMENT', match_postback.group(2))]
+
+                requete = session.post(
+                    urljoin(url_detail, form.get('action') or url_detail),
+                    data=urlencode(champs),
+                    headers=self._get_headers({'Content-Type': 'application/x-www-form-urlencoded'})
+                )
+            elif match_open:
+                requete = session.get(urljoin(url_detail, match_open.group(1)), headers=self._get_headers())
+            else:
+                return None
+
+            async with requete as response:
+                self._mettre_a_jour_cookies(response)
+                contenu = await response.read()
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"         ⚠️  Erreur postback {id_lien}: {e}")
+            return None
+
+        return contenu if contenu.startswith(b'%PDF') else None
+
+    async def fermer(self):
+        """Ferme la session HTTP"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,70 @@
+"""
+Index persistant des messages déjà traités (SQLite)
+Permet de ne pas rouvrir ni retélécharger un message d'une exécution à l'autre
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Set
+
+
+class IndexMessages:
+    """Index des messages extraits / livrés, clé (code_juridiction, msg_id)"""
+
+    def __init__(self, chemin: Path):
+        chemin.parent.mkdir(parents=True, exist_ok=True)
+        self.chemin = chemin
+        self.connexion = sqlite3.connect(str(chemin), timeout=30)
+        # WAL : lectures et écritures concurrentes entre workers
+        self.connexion.execute("PRAGMA journal_mode=WAL")
+        self.connexion.execute("""
+            CREATE TABLE IF NOT EXISTS messages (
+                code_juridiction TEXT NOT NULL,
+                msg_id TEXT NOT NULL,
+                objet TEXT,
+                date_message TEXT,
+                extrait_le TEXT,
+                livre_le TEXT,
+                PRIMARY KEY (code_juridiction, msg_id)
+            )
+        """)
+        self.connexion.commit()
+
+    def messages_traites(self, code_juridiction: str, livraison_requise: bool) -> Set[str]:
+        """Identifiants des messages à ne pas retraiter pour une juridiction
+
+        Args:
+            code_juridiction: Code de la juridiction (ex: 'TA93')
+            livraison_requise: Si True, un message extrait mais non livré au webhook est retraité
+
+        Returns:
+            Set[str]: msg_id déjà traités
+        """
+        requete = "SELECT msg_id FROM messages WHERE code_juridiction = ? AND extrait_le IS NOT NULL"
+        if livraison_requise:
+            requete += " AND livre_le IS NOT NULL"
+
+        return {ligne[0] for ligne in self.connexion.execute(requete, (code_juridiction,))}
+
+    def marquer_extrait(self, code_juridiction: str, msg_id: str, objet: str = None, date_message: str = None):
+        """Enregistre un message dont le détail et les PDFs ont été extraits"""
+        self.connexion.execute("""
+            INSERT INTO messages (code_juridiction, msg_id, objet, date_message, extrait_le)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (code_juridiction, msg_id)
+            DO UPDATE SET objet = excluded.objet, date_message = excluded.date_message, extrait_le = excluded.extrait_le
+        """, (code_juridiction, msg_id, objet, date_message, time.strftime('%Y-%m-%d %H:%M:%S')))
+        self.connexion.commit()
+
+    def marquer_livre(self, code_juridiction: str, msg_id: str):
+        """Enregistre la livraison d'un message au webhook"""
+        self.connexion.execute(
+            "UPDATE messages SET livre_le = ? WHERE code_juridiction = ? AND msg_id = ?",
+            (time.strftime('%Y-%m-%d %H:%M:%S'), code_juridiction, msg_id)
+        )
+        self.connexion.commit()
+
+    def fermer(self):
+        """Ferme la connexion SQLite"""
+        self.connexion.close()
@@ -13,49 +13,19 @@ import argparse
 import getpass
 import time
 import os
-import json
 from pathlib import Path
-from crawl4ai import AsyncWebCrawler, BrowserConfig
+from crawl4ai import AsyncWebCrawler
 
 from config import TelecoursConfig
 from auth import TelecoursAuth
 from notifs import NotificationDetector
 from scraper_messages import MessageScraper
-from utils import print_header, print_summary, compte_pdfs_dossier, send_webhook
-
-
-async def envoyer_resultats_webhook(config: TelecoursConfig, juridictions: list):
-    """Envoie les résultats de toutes les juridictions vers le webhook"""
-    
-    print("\n📤 Envoi des résultats vers le webhook...")
-    
-    tous_les_messages = []
-    
-    for juridiction in juridictions:
-        json_file = config.get_juridiction_dir(juridiction.code) / f"messages_{juridiction.code}.json"
-        
-        if json_file.exists():
-            with open(json_file, 'r', encoding='utf-8') as f:
-                messages = json.load(f)
-                
-                # Ajouter le code juridiction à chaque message
-                for msg in messages:
-                    msg['code_juridiction'] = juridiction.code
-                    msg['nom_juridiction'] = juridiction.nom
-                
-                tous_les_messages.extend(messages)
-    
-    if tous_les_messages:
-        payload = {
-            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
-            'nb_juridictions': len(juridictions),
-            'nb_messages_total': len(tous_les_messages),
-            'messages': tous_les_messages
-        }
-        
-        send_webhook(config.webhook_url, payload)
-    else:
-        print("⚠️  Aucun message à envoyer")
+from navigateur import creer_browser_config, installer_blocage_ressources
+from workers import scraper_juridictions_en_parallele
+from reprise import PointReprise
+from sortie import FORMATS_SORTIE
+from utils import print_header, print_summary, compte_pdfs_dossier, parser_date_message
+from webhook import FORMATS_WEBHOOK
 
 
 async def main_auto(config: TelecoursConfig):
@@ -66,14 +36,7 @@ async def main_auto(config: TelecoursConfig):
     print_header("🤖 MODE AUTOMATIQUE - EXTRACTION COMPLÈTE")
     
     # Configuration du navigateur
-    browser_config = BrowserConfig(
-        headless=config.headless,
-        verbose=False,
-        viewport_width=1920,
-        viewport_height=1080,
-        accept_downloads=True,
-        downloads_path=str(config.pdfs_dir.absolute())
-    )
+    browser_config = creer_browser_config(config)
     
     start_time = time.time()
     total_messages = 0
@@ -85,16 +48,29 @@ async def main_auto(config: TelecoursConfig):
         # Authentification
         auth = TelecoursAuth(config)
         await auth.setup_cookie_hook(crawler)
+        await installer_blocage_ressources(crawler, config)
         
-        if not await auth.login(crawler):
+        if not await auth.connecter(crawler):
             return
         
         # Détection des notifications
         detector = NotificationDetector(config)
-        juridictions = await detector.get_juridictions_avec_notifs(crawler)
+        reprise = PointReprise(config)
+        
+        if config.reprendre and reprise.existe():
+            # Les messages déjà ouverts ne sont plus notifiés : on repart de l'exécution interrompue
+            juridictions = reprise.juridictions_a_reprendre(
+                await detector.get_juridictions_avec_notifs(crawler, inclure_sans_notif=True)
+            )
+            print(f"\n♻️  Reprise de l'exécution interrompue : {len(juridictions)} juridiction(s) restante(s)")
+        else:
+            if config.reprendre:
+                print("\n⚠️  Aucune exécution interrompue à reprendre, extraction normale")
+            juridictions = await detector.get_juridictions_avec_notifs(crawler)
         
         if not juridictions:
             print("\n📭 Aucune notification trouvée")
+            reprise.terminer_execution()
             return
         
         await detector.afficher_juridictions_avec_notifs(juridictions)
@@ -105,47 +81,70 @@ async def main_auto(config: TelecoursConfig):
             print("❌ Extraction annulée")
             return
         
-        # Traiter chaque juridiction
-        scraper = MessageScraper(config, auth.cookies)
+        if not (config.reprendre and reprise.existe()):
+            reprise.demarrer_execution([j.code for j in juridictions])
+        config.points_reprise = True
         
-        for i, juridiction in enumerate(juridictions, 1):
-            print(f"\n{'='*70}")
-            print(f"📍 Juridiction {i}/{len(juridictions)}: {juridiction.code} ({juridiction.nom})")
-            print(f"   {juridiction.nb_notifs} message(s) non lu(s)")
-            print(f"{'='*70}")
-            
-            # Sélectionner la juridiction
-            if not await detector.selectionner_juridiction(crawler, juridiction):
-                print(f"⚠️  Impossible de sélectionner {juridiction.code}, on passe à la suivante")
-                continue
+        # Mode parallèle : un navigateur par worker, login partagé
+        if config.workers > 1:
+            etat_session = await auth.exporter_etat_session(crawler)
+            resultats = await scraper_juridictions_en_parallele(config, juridictions, etat_session)
+            reprise.terminer_execution()
             
-            # Scraper les messages NON LUS
-            messages = await scraper.scraper_tous_messages(
-                crawler=crawler,
-                code_juridiction=juridiction.code,
-                messages_non_lus_seulement=not config.scraper_messages_lus,
-                max_messages=config.max_messages_par_juridiction
+            duration = time.time() - start_time
+            print_summary(
+                resultats['juridictions_traitees'],
+                resultats['total_messages'],
+                resultats['total_pdfs'],
+                duration
             )
             
-            if messages:
-                total_messages += len(messages)
-                juridictions_traitees += 1
-                
-                # Compter les PDFs
-                pdfs_dir = config.get_pdfs_dir(juridiction.code)
-                nb_pdfs = compte_pdfs_dossier(pdfs_dir)
-                total_pdfs += nb_pdfs
-                
-                print(f"\n   ✅ {len(messages)} message(s) extrait(s)")
-                print(f"   📥 {nb_pdfs} PDF(s) téléchargé(s)")
+            await crawler.crawler_strategy.kill_session(config.session_id)
+            return
         
-        # Résumé final
-        duration = time.time() - start_time
-        print_summary(juridictions_traitees, total_messages, total_pdfs, duration)
+        # Traiter chaque juridiction
+        scraper = MessageScraper(config, auth.cookies)
         
-        # Les messages ont déjà été envoyés individuellement au webhook pendant le scraping
-        if config.webhook_url and total_messages > 0:
-            print(f"\n✅ {total_messages} message(s) envoyé(s) au webhook individuellement")
+        try:
+            for i, juridiction in enumerate(juridictions, 1):
+                print(f"\n{'='*70}")
+                print(f"📍 Juridiction {i}/{len(juridictions)}: {juridiction.code} ({juridiction.nom})")
+                print(f"   {juridiction.nb_notifs} message(s) non lu(s)")
+                print(f"{'='*70}")
+                
+                # Sélectionner la juridiction
+                if not await detector.selectionner_juridiction(crawler, juridiction):
+                    print(f"⚠️  Impossible de sélectionner {juridiction.code}, on passe à la suivante")
+                    continue
+                
+                # Scraper les messages NON LUS
+                nb_messages = await scraper.scraper_tous_messages(
+                    crawler=crawler,
+                    code_juridiction=juridiction.code,
+                    messages_non_lus_seulement=not config.scraper_messages_lus,
+                    max_messages=config.max_messages_par_juridiction
+                )
+                
+                if nb_messages:
+                    total_messages += nb_messages
+                    juridictions_traitees += 1
+                    
+                    # Compter les PDFs
+                    pdfs_dir = config.get_pdfs_dir(juridiction.code)
+                    nb_pdfs = compte_pdfs_dossier(pdfs_dir)
+                    total_pdfs += nb_pdfs
+                    
+                    print(f"\n   ✅ {nb_messages} message(s) extrait(s)")
+                    print(f"   📥 {nb_pdfs} PDF(s) téléchargé(s)")
+            
+            reprise.terminer_execution()
+            
+            # Résumé final
+            duration = time.time() - start_time
+            print_summary(juridictions_traitees, total_messages, total_pdfs, duration)
+        finally:
+            # Dernières livraisons au webhook (envoyées en arrière-plan pendant le scraping)
+            await scraper.fermer()
         
         await crawler.crawler_strategy.kill_session(config.session_id)
 
@@ -157,14 +156,7 @@ async def main_juridiction(config: TelecoursConfig, code_juridiction: str):
     
     print_header(f"📍 EXTRACTION - {code_juridiction}")
     
-    browser_config = BrowserConfig(
-        headless=config.headless,
-        verbose=False,
-        viewport_width=1920,
-        viewport_height=1080,
-        accept_downloads=True,
-        downloads_path=str(config.pdfs_dir.absolute())
-    )
+    browser_config = creer_browser_config(config)
     
     start_time = time.time()
     
@@ -173,13 +165,17 @@ async def main_juridiction(config: TelecoursConfig, code_juridiction: str):
         # Authentification
         auth = TelecoursAuth(config)
         await auth.setup_cookie_hook(crawler)
+        await installer_blocage_ressources(crawler, config)
         
-        if not await auth.login(crawler):
+        if not await auth.connecter(crawler):
             return
         
         # Détection des notifications
         detector = NotificationDetector(config)
-        juridictions = await detector.get_juridictions_avec_notifs(crawler)
+        juridictions = await detector.get_juridictions_avec_notifs(
+            crawler,
+            inclure_sans_notif=config.reprendre
+        )
         
         # Chercher la juridiction demandée
         juridiction_cible = next(
@@ -200,22 +196,22 @@ async def main_juridiction(config: TelecoursConfig, code_juridiction: str):
         
         # Scraper les messages
         scraper = MessageScraper(config, auth.cookies)
-        messages = await scraper.scraper_tous_messages(
-            crawler=crawler,
-            code_juridiction=code_juridiction,
-            messages_non_lus_seulement=not config.scraper_messages_lus,
-            max_messages=config.max_messages_par_juridiction
-        )
-        
-        # Résumé
-        duration = time.time() - start_time
-        nb_pdfs = compte_pdfs_dossier(config.get_pdfs_dir(code_juridiction))
-        
-        print_summary(1, len(messages) if messages else 0, nb_pdfs, duration)
-        
-        # Les messages ont déjà été envoyés individuellement au webhook pendant le scraping
-        if config.webhook_url and messages:
-            print(f"\n✅ {len(messages)} message(s) envoyé(s) au webhook individuellement")
+        try:
+            nb_messages = await scraper.scraper_tous_messages(
+                crawler=crawler,
+                code_juridiction=code_juridiction,
+                messages_non_lus_seulement=not config.scraper_messages_lus,
+                max_messages=config.max_messages_par_juridiction
+            )
+            
+            # Résumé
+            duration = time.time() - start_time
+            nb_pdfs = compte_pdfs_dossier(config.get_pdfs_dir(code_juridiction))
+            
+            print_summary(1, nb_messages, nb_pdfs, duration)
+        finally:
+            # Dernières livraisons au webhook (envoyées en arrière-plan pendant le scraping)
+            await scraper.fermer()
         
         await crawler.crawler_strategy.kill_session(config.session_id)
 
@@ -227,22 +223,16 @@ async def main_interactif(config: TelecoursConfig):
     
     print_header("💬 MODE INTERACTIF")
     
-    browser_config = BrowserConfig(
-        headless=config.headless,
-        verbose=False,
-        viewport_width=1920,
-        viewport_height=1080,
-        accept_downloads=True,
-        downloads_path=str(config.pdfs_dir.absolute())
-    )
+    browser_config = creer_browser_config(config)
     
     async with AsyncWebCrawler(config=browser_config) as crawler:
         
         # Authentification
         auth = TelecoursAuth(config)
         await auth.setup_cookie_hook(crawler)
+        await installer_blocage_ressources(crawler, config)
         
-        if not await auth.login(crawler):
+        if not await auth.connecter(crawler):
             return
         
         # Détection des notifications
@@ -270,32 +260,35 @@ async def main_interactif(config: TelecoursConfig):
         elif choix == "1":
             # Extraire toutes
             scraper = MessageScraper(config, auth.cookies)
-            start_time = time.time()
-            total_messages = 0
-            total_pdfs = 0
-            
-            for i, juridiction in enumerate(juridictions, 1):
-                print(f"\n{'='*70}")
-                print(f"📍 Juridiction {i}/{len(juridictions)}: {juridiction.code}")
-                print(f"{'='*70}")
+            try:
+                start_time = time.time()
+                total_messages = 0
+                total_pdfs = 0
                 
-                if not await detector.selectionner_juridiction(crawler, juridiction):
-                    continue
+                for i, juridiction in enumerate(juridictions, 1):
+                    print(f"\n{'='*70}")
+                    print(f"📍 Juridiction {i}/{len(juridictions)}: {juridiction.code}")
+                    print(f"{'='*70}")
+                    
+                    if not await detector.selectionner_juridiction(crawler, juridiction):
+                        continue
+                    
+                    nb_messages = await scraper.scraper_tous_messages(
+                        crawler=crawler,
+                        code_juridiction=juridiction.code,
+                        messages_non_lus_seulement=not config.scraper_messages_lus,
+                        max_messages=config.max_messages_par_juridiction
+                    )
+                    
+                    if nb_messages:
+                        total_messages += nb_messages
+                        nb_pdfs = compte_pdfs_dossier(config.get_pdfs_dir(juridiction.code))
+                        total_pdfs += nb_pdfs
                 
-                messages = await scraper.scraper_tous_messages(
-                    crawler=crawler,
-                    code_juridiction=juridiction.code,
-                    messages_non_lus_seulement=not config.scraper_messages_lus,
-                    max_messages=config.max_messages_par_juridiction
-                )
-                
-                if messages:
-                    total_messages += len(messages)
-                    nb_pdfs = compte_pdfs_dossier(config.get_pdfs_dir(juridiction.code))
-                    total_pdfs += nb_pdfs
-            
-            duration = time.time() - start_time
-            print_summary(len(juridictions), total_messages, total_pdfs, duration)
+                duration = time.time() - start_time
+                print_summary(len(juridictions), total_messages, total_pdfs, duration)
+            finally:
+                await scraper.fermer()
         
         elif choix == "2":
             # Choisir une juridiction
@@ -315,23 +308,23 @@ async def main_interactif(config: TelecoursConfig):
                 return
             
             scraper = MessageScraper(config, auth.cookies)
-            start_time = time.time()
-            
-            messages = await scraper.scraper_tous_messages(
-                crawler=crawler,
-                code_juridiction=code,
-                messages_non_lus_seulement=not config.scraper_messages_lus,
-                max_messages=config.max_messages_par_juridiction
-            )
-            
-            duration = time.time() - start_time
-            nb_pdfs = compte_pdfs_dossier(config.get_pdfs_dir(code))
-            
-            print_summary(1, len(messages) if messages else 0, nb_pdfs, duration)
-            
-            # Les messages ont déjà été envoyés individuellement au webhook pendant le scraping
-            if config.webhook_url:
-                print(f"\n✅ Messages envoyés au webhook individuellement")
+            try:
+                start_time = time.time()
+                
+                nb_messages = await scraper.scraper_tous_messages(
+                    crawler=crawler,
+                    code_juridiction=code,
+                    messages_non_lus_seulement=not config.scraper_messages_lus,
+                    max_messages=config.max_messages_par_juridiction
+                )
+                
+                duration = time.time() - start_time
+                nb_pdfs = compte_pdfs_dossier(config.get_pdfs_dir(code))
+                
+                print_summary(1, nb_messages, nb_pdfs, duration)
+            finally:
+                # Dernières livraisons au webhook (envoyées en arrière-plan pendant le scraping)
+                await scraper.fermer()
         
         await crawler.crawler_strategy.kill_session(config.session_id)
 
@@ -378,6 +371,92 @@ def main():
         type=str,
         help="Mot de passe Télérecours (sinon lu depuis TELERECOURS_PASSWORD ou demandé)"
     )
+    parser.add_argument(
+        '--ignorer-index',
+        action='store_true',
+        help="Désactiver l'index des messages déjà traités (tout est retraité, rien n'est enregistré)"
+    )
+    parser.add_argument(
+        '--depuis',
+        type=str,
+        help="Ignorer les messages antérieurs à cette date (JJ/MM/AAAA) ; arrête le parcours des pages"
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help="Reprendre l'exécution interrompue là où elle s'est arrêtée (messages déjà terminés non rejoués)"
+    )
+    parser.add_argument(
+        '--format-sortie',
+        choices=FORMATS_SORTIE,
+        default='ndjson',
+        help="Format des fichiers messages_<TA> : ndjson (écrit message par message) ou json (tableau en fin de juridiction)"
+    )
+    parser.add_argument(
+        '--pdfs-inline',
+        action='store_true',
+        help="Garder le contenu base64 des PDFs dans les messages au lieu du magasin extractions/blobs/"
+    )
+    parser.add_argument(
+        '--webhook-lot',
+        type=int,
+        default=1,
+        help="Messages regroupés par requête webhook (1 = un message par requête)"
+    )
+    parser.add_argument(
+        '--webhook-lot-octets',
+        type=int,
+        default=10 * 1024 * 1024,
+        help="Taille estimée maximale d'un lot webhook en octets, base64 des PDFs compris (défaut : 10 Mo)"
+    )
+    parser.add_argument(
+        '--webhook-lot-delai',
+        type=float,
+        default=2.0,
+        help="Secondes d'attente au plus pour compléter un lot webhook avant de l'envoyer"
+    )
+    parser.add_argument(
+        '--webhook-gzip',
+        action='store_true',
+        help="Compresser le corps des requêtes webhook (Content-Encoding: gzip)"
+    )
+    parser.add_argument(
+        '--webhook-format',
+        choices=FORMATS_WEBHOOK,
+        default='json',
+        help="json : PDFs en base64 dans le JSON ; multipart : JSON + PDFs en parties binaires"
+    )
+    parser.add_argument(
+        '--nouvelle-session',
+        action='store_true',
+        help="Ignorer la session sauvegardée et refaire un login complet"
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help="Nombre de juridictions traitées en parallèle en mode --auto (1 navigateur par worker)"
+    )
+    parser.add_argument(
+        '--charger-ressources',
+        action='store_true',
+        help="Ne pas bloquer images, polices, CSS et analytics dans le navigateur"
+    )
+    parser.add_argument(
+        '--no-http',
+        action='store_true',
+        help="Désactiver le téléchargement HTTP direct des PDFs (navigateur uniquement)"
+    )
+    parser.add_argument(
+        '--no-capture-memoire',
+        action='store_true',
+        help="Télécharger les PDFs sur le disque (pdfs/) au lieu de les intercepter en mémoire"
+    )
+    parser.add_argument(
+        '--detail-http',
+        action='store_true',
+        help="Lire le détail des messages en HTTP (rejeu du postback lireMessage) au lieu du navigateur"
+    )
     parser.add_argument(
         '--webhook',
         type=str,
@@ -386,14 +465,36 @@ def main():
     
     args = parser.parse_args()
     
+    if args.depuis and parser_date_message(args.depuis) is None:
+        parser.error(f"--depuis : date invalide '{args.depuis}' (format attendu JJ/MM/AAAA)")
+    
     # Configuration
     config = TelecoursConfig(
         headless=not args.no_headless,  # headless par défaut, sauf si --no-headless
         max_messages_par_juridiction=args.max_messages,
         scraper_messages_lus=args.messages_lus,
-        webhook_url=args.webhook
+        webhook_url=args.webhook,
+        telechargement_http=not args.no_http,
+        capture_memoire=not args.no_capture_memoire,
+        workers=max(1, args.workers),
+        detail_http=args.detail_http,
+        reutiliser_session=not args.nouvelle_session,
+        utiliser_index=not args.ignorer_index,
+        reprendre=args.resume,
+        depuis=args.depuis,
+        format_sortie=args.format_sortie,
+        pdfs_inline=args.pdfs_inline,
+        webhook_lot_messages=max(1, args.webhook_lot),
+        webhook_lot_octets=max(1, args.webhook_lot_octets),
+        webhook_lot_delai=max(0.0, args.webhook_lot_delai),
+        webhook_gzip=args.webhook_gzip,
+        webhook_format=args.webhook_format
     )
     
+    if args.charger_ressources:
+        config.bloquer_ressources = ()
+        config.bloquer_domaines = ()
+    
     # Demander les identifiants
     print("=" * 70)
     print("🔐 IDENTIFIANTS TÉLÉRECOURS")
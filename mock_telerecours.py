@@ -0,0 +1,669 @@
+"""
+Serveur Télérecours simulé (aiohttp.web) pour mesurer le scraper hors ligne
+
+Reproduit le parcours réel : login, sélection des juridictions (li[name=TA..] +
+__doPostBack), onglet Messages (grille paginée Page$N), détail des messages
+et /telecharger/*.pdf.
+
+Les pages servies sont les pages Télérecours capturées
+(extractions/*/message_*.html) : seuls les identifiants, les liens et les
+cibles de postback effacés par la capture sont réécrits (formulaire form1 et
+champs d'état, #divEnteteMsg, accusés hplGenFichier, #btRetour, liens
+/telecharger/). Le détail d'un message est une page capturée ; la liste et
+l'accueil reprennent la mise en page capturée (en-tête, onglets, pied de
+page) autour de la grille, faute de capture de ces pages. Login et sélection
+de juridiction restent minimaux. Les contenus des PDFs, expéditeurs et
+rapporteurs viennent des extractions sauvegardées (messages_*.ndjson ou .json).
+
+Usage:
+    python mock_telerecours.py --juridictions 3 --messages 40 --latence 80
+"""
+
+import argparse
+import asyncio
+import base64
+import glob
+import hashlib
+import secrets
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from html import escape
+from itertools import cycle
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from aiohttp import web
+from bs4 import BeautifulSoup
+
+from blobs import MagasinBlobs
+from sortie import lire_messages
+
+
+COOKIE_AUTH = '.ASPXAUTH'
+COOKIE_SESSION = 'ASP.NET_SessionId'
+
+URL_LOGIN = '/AuthentifierUtilisateur/Login.aspx'
+URL_SELECTION = '/AuthentifierUtilisateur/SelectionJuridiction.aspx'
+URL_ACCUEIL = '/Accueil/Accueil.aspx'
+
+CIBLE_JURIDICTION = 'ctl00$ContentPlaceHolder1$lvJuridictions'
+CIBLE_ONGLET = 'ctl00$Onglets'
+CIBLE_GRILLE = 'ctl00$ContentPlaceHolder1$gvMessages'
+CIBLE_LIRE = 'ctl00$ContentPlaceHolder1$lireMessage'
+CIBLE_RETOUR = 'ctl00$ContentPlaceHolder1$btRetour'
+CIBLE_ACCUSE = 'ctl00$ContentPlaceHolder1$hplGenFichier'
+
+NOMS_JURIDICTIONS = {
+    'TA44': 'Nantes', 'TA75': 'Paris', 'TA77': 'Melun',
+    'TA78': 'Versailles', 'TA93': 'Montreuil', 'TA95': 'Cergy-Pontoise'
+}
+
+# Champs d'état ASP.NET, dans l'ordre des <input> vidés par la capture
+CHAMPS_ETAT = ('__EVENTTARGET', '__EVENTARGUMENT', '__VIEWSTATE')
+
+# Marqueurs remplacés à chaque réponse (les pages capturées contiennent des accolades)
+MARQUE_VIEWSTATE = '@@VIEWSTATE@@'
+MARQUE_TRIBUNAL = '@@TRIBUNAL@@'
+MARQUE_CONTENU = '@@CONTENU@@'
+MARQUE_PDF = '@@PDF{}@@'
+
+# PDF minimal utilisé si aucune extraction n'est disponible
+PDF_MINIMAL = (
+    b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+    b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 595 842]>>endobj\n"
+    b"trailer<</Root 1 0 R>>\n%%EOF\n"
+)
+
+SCRIPT_ASPNET = """
+<script>
+function __doPostBack(cible, argument) {
+    var form = document.forms['form1'];
+    form.__EVENTTARGET.value = cible;
+    form.__EVENTARGUMENT.value = argument;
+    form.submit();
+}
+function ouvrirMessage() { __doPostBack('%(onglet)s', 'Messages'); }
+function lireMessage(id, type) { __doPostBack('%(lire)s', id + '|' + type); }
+</script>
+""" % {'onglet': CIBLE_ONGLET, 'lire': CIBLE_LIRE}
+
+
+@dataclass
+class ModeleMessage:
+    """Page de détail capturée servant de modèle (page réécrite, ligne de la grille, PDFs)"""
+
+    page: str  # Page capturée réécrite, avec ses marqueurs
+    msg_type: str
+    expediteur: str
+    dossier: str
+    objet: str
+    rapporteur: str
+    pdfs: List[tuple] = field(default_factory=list)  # (nom, contenu), dans l'ordre des liens de la page
+    accuses: List[bytes] = field(default_factory=list)
+
+
+@dataclass
+class MessageSimule:
+    """Message d'une juridiction simulée"""
+
+    msg_id: str
+    modele: ModeleMessage
+    date: str
+    lu: bool = False
+    # Lien de téléchargement -> contenu : {hash: (nom, contenu)}
+    pdfs: Dict[str, tuple] = field(default_factory=dict)
+
+
+@dataclass
+class SessionSimulee:
+    """État serveur d'une session ASP.NET (ASP.NET_SessionId)"""
+
+    juridiction: Optional[str] = None
+    page: int = 1
+
+
+def lire_pdf_capture(fichier_pdf: Dict, magasin: MagasinBlobs) -> bytes:
+    """Contenu d'un PDF sauvegardé : base64 dans le message, sinon blob (vide si absent)"""
+    if fichier_pdf.get('contenu_base64'):
+        return base64.b64decode(fichier_pdf['contenu_base64'])
+    try:
+        return magasin.lire(fichier_pdf.get('sha256') or '')
+    except OSError:
+        return b''
+
+
+def reecrire_page_capturee(html: str) -> BeautifulSoup:
+    """Rétablit les identifiants, liens et postbacks effacés lors de la capture d'une page
+
+    Les liens /telecharger/ reçoivent les marqueurs MARQUE_PDF (0, 1...), le
+    __VIEWSTATE et le nom du tribunal leurs marqueurs, remplacés à chaque réponse.
+    """
+    soup = BeautifulSoup(html, 'lxml')
+
+    # Formulaire ASP.NET unique et champs d'état (premiers <input> du formulaire)
+    form = soup.find('form')
+    form.attrs = {'method': 'post', 'action': '', 'id': 'form1', 'name': 'form1'}
+    champs = form.find('div')
+    for champ, nom in zip(champs.find_all('input'), CHAMPS_ETAT):
+        champ.attrs = {
+            'type': 'hidden', 'name': nom, 'id': nom,
+            'value': MARQUE_VIEWSTATE if nom == '__VIEWSTATE' else ''
+        }
+    generateur = champs.find_next_sibling('input')
+    if generateur is not None:
+        generateur.attrs = {
+            'type': 'hidden', 'name': '__VIEWSTATEGENERATOR', 'id': '__VIEWSTATEGENERATOR', 'value': 'CA0B0334'
+        }
+    form.insert_before(BeautifulSoup(SCRIPT_ASPNET, 'html.parser'))
+
+    bandeau = soup.find('div', string=lambda texte: texte and texte.startswith('TéléRecours - '))
+    if bandeau is not None:
+        bandeau.string = MARQUE_TRIBUNAL
+
+    onglet = soup.find('td', attrs={'title': 'Messages'})
+    if onglet is not None:
+        onglet['onclick'] = 'ouvrirMessage()'
+
+    # Accusés : liens à postback hplGenFichier, dans l'en-tête du message
+    accuses = soup.find_all('a', string=lambda texte: texte and texte.strip().startswith("Voir l'accusé"))
+    for numero, lien in enumerate(accuses, 1):
+        lien.attrs = {
+            'id': f"ctl00_ContentPlaceHolder1_hplGenFichier{numero}",
+            'class': 'hplGenFichier',
+            'href': f"javascript:__doPostBack('{CIBLE_ACCUSE}{numero}','')"
+        }
+    if accuses:
+        accuses[0].parent['id'] = 'divEnteteMsg'
+
+    for numero, lien in enumerate(soup.select("a[href^='/telecharger/']")):
+        lien['href'] = f"/telecharger/{MARQUE_PDF.format(numero)}/{lien['href'].rsplit('/', 1)[-1]}"
+
+    ligne_retour = soup.find('tr', attrs={'height': '30'})
+    bouton = ligne_retour.find('input') if ligne_retour is not None else None
+    if bouton is not None:
+        bouton.attrs = {
+            'type': 'button', 'id': 'btRetour', 'value': 'Retour',
+            'onclick': f"__doPostBack('{CIBLE_RETOUR}','')"
+        }
+
+    return soup
+
+
+def mise_en_page(soup: BeautifulSoup) -> str:
+    """Page capturée réduite à sa mise en page : le contenu du message devient MARQUE_CONTENU
+
+    Le tableau de mise en page a pour lignes l'en-tête du site (height=160), le
+    contenu du message, puis le pied de page.
+    """
+    soup = BeautifulSoup(str(soup), 'lxml')
+    entete = soup.find('tr', attrs={'height': '160'})
+    lignes = entete.parent.find_all('tr', recursive=False)
+    for ligne in lignes[1:-1]:
+        ligne.decompose()
+    entete.insert_after(BeautifulSoup(f'<tr><td>{MARQUE_CONTENU}</td></tr>', 'html.parser'))
+
+    for element in soup.find_all(id=['divEnteteMsg', 'btRetour']):
+        element.decompose()
+    return str(soup)
+
+
+def _texte(element) -> str:
+    return ' '.join(element.get_text(' ').split()) if element is not None else ''
+
+
+def _valeur_ligne(soup: BeautifulSoup, libelle: str):
+    """Cellule de valeur de la ligne dont le libellé est libelle (après le séparateur ':')"""
+    cellule = soup.find(lambda tag: tag.name == 'td' and _texte(tag) == libelle)
+    if cellule is None:
+        return None
+    return next((td for td in cellule.find_next_siblings('td') if _texte(td) != ':'), None)
+
+
+def charger_modeles(pages: str, captures: str) -> List[ModeleMessage]:
+    """Construit les modèles de messages à partir des pages de détail capturées
+
+    Args:
+        pages: Motif des pages capturées (extractions/*/message_*.html)
+        captures: Motif des extractions sauvegardées (contenus des PDFs, expéditeurs, rapporteurs)
+    """
+    infos = []
+    contenus = []
+    contenus_accuses = []
+
+    for fichier in sorted(glob.glob(captures)):
+        try:
+            messages = list(lire_messages(Path(fichier)))
+        except (OSError, ValueError):
+            continue
+
+        # PDFs stockés à part : extractions/blobs/ à côté des dossiers de juridiction
+        magasin = MagasinBlobs(Path(fichier).parent.parent / "blobs")
+
+        for msg in messages:
+            infos.append(msg)
+            for fichier_pdf in msg.get('fichiers_telecharges', []):
+                contenu = lire_pdf_capture(fichier_pdf, magasin)
+                if contenu:
+                    (contenus if fichier_pdf['type'] != 'onclick' else contenus_accuses).append(contenu)
+
+    contenus = cycle(contenus or [PDF_MINIMAL])
+    contenus_accuses = cycle(contenus_accuses or [PDF_MINIMAL])
+    infos = cycle(infos or [{}])
+
+    modeles = []
+    for fichier in sorted(glob.glob(pages)):
+        soup = reecrire_page_capturee(Path(fichier).read_text(encoding='utf-8'))
+        info = next(infos)
+
+        # Objet de la grille : type du courrier envoyé (ex: "Notification de jugement")
+        courrier = _valeur_ligne(soup, 'Courrier envoyé')
+        objet = _texte(courrier.find('span')) if courrier is not None else ''
+
+        modeles.append(ModeleMessage(
+            page=str(soup),
+            msg_type=info.get('msg_type') or 'DIDO',
+            expediteur=info.get('expediteur', ''),
+            dossier=_texte(_valeur_ligne(soup, 'Numéro de Dossier')),
+            objet=objet or info.get('objet_original') or "Notification d'envoi de document",
+            rapporteur=info.get('rapporteur', ''),
+            pdfs=[
+                (lien['href'].rsplit('/', 1)[-1], next(contenus))
+                for lien in soup.select("a[href^='/telecharger/']")
+            ],
+            accuses=[next(contenus_accuses) for _ in soup.select('a.hplGenFichier')]
+        ))
+
+    if not modeles:
+        raise FileNotFoundError(f"Aucune page de message capturée ({pages})")
+
+    return modeles
+
+
+class ServeurTelerecoursSimule:
+    """Serveur local imitant Télérecours pour N juridictions x M messages"""
+
+    def __init__(
+        self,
+        nb_juridictions: int = 3,
+        messages_par_juridiction: int = 20,
+        latence_ms: int = 0,
+        latence_pdf_ms: int = 0,
+        taille_page: int = 20,
+        pages: str = "extractions/*/message_*.html",
+        captures: str = "extractions/*/messages_*.*json"
+    ):
+        self.latence_ms = latence_ms
+        self.latence_pdf_ms = latence_pdf_ms
+        self.taille_page = max(1, taille_page)
+
+        self.jetons_auth = set()
+        self.sessions: Dict[str, SessionSimulee] = {}
+        self.requetes = Counter()  # Requêtes reçues par étape
+
+        modeles = charger_modeles(pages, captures)
+        self.mise_en_page = mise_en_page(BeautifulSoup(modeles[0].page, 'lxml'))
+        self.juridictions = self._generer_juridictions(nb_juridictions, messages_par_juridiction, modeles)
+        self.pdfs = {
+            cle: pdf
+            for messages in self.juridictions.values()
+            for msg in messages
+            for cle, pdf in msg.pdfs.items()
+        }
+
+        self._runner: Optional[web.AppRunner] = None
+
+    @staticmethod
+    def _generer_juridictions(nb: int, nb_messages: int, modeles: List[ModeleMessage]) -> Dict[str, List[MessageSimule]]:
+        """Juridictions (codes réels d'abord) et messages tous non lus, du plus récent au plus ancien"""
+        codes = list(NOMS_JURIDICTIONS)[:nb]
+        codes += [f"TA{numero:02d}" for numero in range(1, nb + 1) if f"TA{numero:02d}" not in codes][:nb - len(codes)]
+
+        depart = datetime(2025, 11, 20, 16, 0)
+        juridictions = {}
+
+        for j, code in enumerate(codes):
+            messages = []
+            for i in range(nb_messages):
+                modele = modeles[(j * nb_messages + i) % len(modeles)]
+                msg = MessageSimule(
+                    msg_id=str(8600000 + j * 100000 + i),
+                    modele=modele,
+                    date=(depart - timedelta(hours=7 * i)).strftime('%d/%m/%Y %H:%M')
+                )
+
+                for numero, (nom, contenu) in enumerate(modele.pdfs):
+                    cle = hashlib.sha1(f"{code}/{msg.msg_id}/{numero}/{nom}".encode()).hexdigest()
+                    msg.pdfs[cle] = (nom, contenu)
+
+                messages.append(msg)
+            juridictions[code] = messages
+
+        return juridictions
+
+    # ---------------------------------------------------------------- rendu
+
+    @staticmethod
+    def _viewstate(etat: str) -> str:
+        return base64.b64encode(f"vs|{etat}|{secrets.token_hex(8)}".encode()).decode()
+
+    @staticmethod
+    def _tribunal(code: str) -> str:
+        nom = NOMS_JURIDICTIONS.get(code, code)
+        return escape(f"TéléRecours - Tribunal administratif de {nom}")
+
+    @classmethod
+    def _page(cls, titre: str, corps: str, etat: str = '') -> str:
+        """Page ASP.NET minimale (sélection de juridiction, sans capture) : formulaire form1"""
+        return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{escape(titre)}</title>{SCRIPT_ASPNET}</head>
+<body>
+<form method="post" action="" id="form1" name="form1">
+<input type="hidden" name="__EVENTTARGET" id="__EVENTTARGET" value="">
+<input type="hidden" name="__EVENTARGUMENT" id="__EVENTARGUMENT" value="">
+<input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" value="{cls._viewstate(etat)}">
+<input type="hidden" name="__VIEWSTATEGENERATOR" id="__VIEWSTATEGENERATOR" value="CA0B0334">
+{corps}
+</form>
+</body></html>"""
+
+    def _page_capturee(self, page: str, code: str, etat: str, contenu: str = '') -> str:
+        """Page capturée avec l'état de la réponse (viewstate, tribunal, contenu)"""
+        return (
+            page
+            .replace(MARQUE_VIEWSTATE, self._viewstate(etat))
+            .replace(MARQUE_TRIBUNAL, self._tribunal(code))
+            .replace(MARQUE_CONTENU, contenu)
+        )
+
+    def _page_login(self) -> str:
+        return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Connexion</title></head>
+<body>
+<form method="post" action="{URL_LOGIN}">
+<input type="text" id="Username" name="Username">
+<input type="password" id="password-field" name="Password">
+<button type="submit" id="login-submit">Se connecter</button>
+</form>
+</body></html>"""
+
+    def _page_selection(self) -> str:
+        items = []
+        for code, messages in self.juridictions.items():
+            nb_non_lus = sum(1 for msg in messages if not msg.lu)
+            notif = (
+                f'<span class="page-choixJuridiction-mail"><span>{nb_non_lus}</span></span>'
+                if nb_non_lus else ''
+            )
+            nom = NOMS_JURIDICTIONS.get(code, f"Juridiction {code}")
+            items.append(
+                f'<li name="{code}"><a href="javascript:__doPostBack(\'{CIBLE_JURIDICTION}\',\'{code}\')">'
+                f'{escape(nom)}{notif}</a></li>'
+            )
+        return self._page("Sélection de la juridiction", f"<ul>{''.join(items)}</ul>")
+
+    def _page_accueil(self, code: str) -> str:
+        return self._page_capturee(self.mise_en_page, code, etat=code)
+
+    def _page_liste(self, code: str, page: int) -> str:
+        """Grille des messages (pas de capture de la liste) dans la mise en page capturée"""
+        messages = self.juridictions[code]
+        nb_pages = max(1, -(-len(messages) // self.taille_page))
+        page = min(max(1, page), nb_pages)
+        debut = (page - 1) * self.taille_page
+
+        lignes = ['<tr class="tableListeEntete"><th></th><th>Expéditeur</th><th>Dossier</th>'
+                  '<th>Objet</th><th>Rapporteur</th><th>Date</th></tr>']
+        for i, msg in enumerate(messages[debut:debut + self.taille_page]):
+            classe = 'tableListeTrR1' if i % 2 == 0 else 'tableListeTrR2'
+            if not msg.lu:
+                classe += ' messageNonLu'
+            lignes.append(
+                f'<tr class="{classe}"><td><img src="../images/mail.png"></td>'
+                f'<td>{escape(msg.modele.expediteur)}</td><td>{escape(msg.modele.dossier)}</td>'
+                f'<td><a href="#" class="numMessage" onclick="lireMessage(\'{msg.msg_id}\', '
+                f'\'{msg.modele.msg_type}\'); return false;">{escape(msg.modele.objet)}</a></td>'
+                f'<td>{escape(msg.modele.rapporteur)}</td><td>{msg.date}</td></tr>'
+            )
+
+        if nb_pages > 1:
+            liens = [
+                f'<span>{numero}</span>' if numero == page else
+                f'<a href="javascript:__doPostBack(&#39;{CIBLE_GRILLE}&#39;,&#39;Page${numero}&#39;)">{numero}</a>'
+                for numero in range(1, nb_pages + 1)
+            ]
+            lignes.append(f'<tr class="pager"><td colspan="6">{" ".join(liens)}</td></tr>')
+
+        return self._page_capturee(
+            self.mise_en_page, code, etat=f"{code}|{page}",
+            contenu=f'<table class="tableListe" id="gvMessages">{"".join(lignes)}</table>'
+        )
+
+    def _page_detail(self, code: str, msg: MessageSimule) -> str:
+        """Page de détail capturée, liens /telecharger/ propres à ce message"""
+        page = msg.modele.page
+        for numero, cle in enumerate(msg.pdfs):
+            page = page.replace(MARQUE_PDF.format(numero), cle)
+        return self._page_capturee(page, code, etat=f"{code}|{msg.msg_id}")
+
+    # ------------------------------------------------------------ handlers
+
+    def _session(self, request: web.Request) -> tuple:
+        """Session ASP.NET de la requête (créée si absente) et authentification"""
+        session_id = request.cookies.get(COOKIE_SESSION)
+        nouvelle = session_id not in self.sessions
+        if nouvelle:
+            session_id = secrets.token_hex(12)
+            self.sessions[session_id] = SessionSimulee()
+        authentifie = request.cookies.get(COOKIE_AUTH) in self.jetons_auth
+        return session_id, self.sessions[session_id], authentifie, nouvelle
+
+    @staticmethod
+    def _reponse(html: str, session_id: str, nouvelle: bool) -> web.Response:
+        response = web.Response(text=html, content_type='text/html')
+        if nouvelle:
+            response.set_cookie(COOKIE_SESSION, session_id, path='/', httponly=True)
+        return response
+
+    @staticmethod
+    def _redirection(url: str, session_id: str, nouvelle: bool) -> web.Response:
+        response = web.HTTPFound(url)
+        if nouvelle:
+            response.set_cookie(COOKIE_SESSION, session_id, path='/', httponly=True)
+        return response
+
+    async def login(self, request: web.Request) -> web.StreamResponse:
+        session_id, _, _, nouvelle = self._session(request)
+
+        if request.method == 'GET':
+            self.requetes['login (page)'] += 1
+            return self._reponse(self._page_login(), session_id, nouvelle)
+
+        self.requetes['login (envoi)'] += 1
+        formulaire = await request.post()
+        if not formulaire.get('Username') or not formulaire.get('Password'):
+            return self._reponse(self._page_login(), session_id, nouvelle)
+
+        jeton = secrets.token_hex(16)
+        self.jetons_auth.add(jeton)
+        response = self._redirection(URL_SELECTION, session_id, nouvelle)
+        response.set_cookie(COOKIE_AUTH, jeton, path='/', httponly=True)
+        raise response
+
+    async def selection(self, request: web.Request) -> web.StreamResponse:
+        session_id, session, authentifie, nouvelle = self._session(request)
+        if not authentifie:
+            raise self._redirection(URL_LOGIN, session_id, nouvelle)
+
+        if request.method == 'POST':
+            self.requetes['sélection juridiction'] += 1
+            formulaire = await request.post()
+            code = formulaire.get('__EVENTARGUMENT')
+            if formulaire.get('__EVENTTARGET') == CIBLE_JURIDICTION and code in self.juridictions:
+                session.juridiction = code
+                session.page = 1
+                raise self._redirection(URL_ACCUEIL, session_id, nouvelle)
+
+        self.requetes['page sélection'] += 1
+        return self._reponse(self._page_selection(), session_id, nouvelle)
+
+    async def accueil(self, request: web.Request) -> web.StreamResponse:
+        session_id, session, authentifie, nouvelle = self._session(request)
+        if not authentifie:
+            raise self._redirection(URL_LOGIN, session_id, nouvelle)
+        if session.juridiction is None:
+            raise self._redirection(URL_SELECTION, session_id, nouvelle)
+
+        code = session.juridiction
+
+        if request.method == 'GET':
+            self.requetes['accueil juridiction'] += 1
+            return self._reponse(self._page_accueil(code), session_id, nouvelle)
+
+        formulaire = await request.post()
+        cible = formulaire.get('__EVENTTARGET', '')
+        argument = formulaire.get('__EVENTARGUMENT', '')
+
+        if cible == CIBLE_GRILLE and argument.startswith('Page$'):
+            self.requetes['page de la grille'] += 1
+            numero = argument[len('Page$'):]
+            session.page = session.page + 1 if numero == 'Next' else int(numero)
+            return self._reponse(self._page_liste(code, session.page), session_id, nouvelle)
+
+        if cible == CIBLE_LIRE:
+            self.requetes['détail message'] += 1
+            msg_id = argument.split('|')[0]
+            msg = next((m for m in self.juridictions[code] if m.msg_id == msg_id), None)
+            if msg is None:
+                raise web.HTTPNotFound()
+            msg.lu = True
+            return self._reponse(self._page_detail(code, msg), session_id, nouvelle)
+
+        if cible.startswith(CIBLE_ACCUSE):
+            self.requetes['accusé (postback)'] += 1
+            return self._accuse(formulaire, cible, code)
+
+        # Onglet Messages ou retour à la liste
+        self.requetes['liste des messages'] += 1
+        if cible == CIBLE_ONGLET:
+            session.page = 1
+        return self._reponse(self._page_liste(code, session.page), session_id, nouvelle)
+
+    def _accuse(self, formulaire, cible: str, code: str) -> web.Response:
+        """PDF d'accusé : le message est repris du __VIEWSTATE du détail (comme ASP.NET)"""
+        try:
+            etat = base64.b64decode(formulaire.get('__VIEWSTATE', '')).decode().split('|')
+            msg_id = etat[2]
+            numero = int(cible[len(CIBLE_ACCUSE):]) - 1
+        except (ValueError, IndexError):
+            raise web.HTTPBadRequest()
+
+        msg = next((m for m in self.juridictions[code] if m.msg_id == msg_id), None)
+        if msg is None or not 0 <= numero < len(msg.modele.accuses):
+            raise web.HTTPNotFound()
+
+        return web.Response(
+            body=msg.modele.accuses[numero],
+            content_type='application/pdf',
+            headers={'Content-Disposition': f'attachment; filename="accuse_{msg_id}_{numero + 1}.pdf"'}
+        )
+
+    async def telecharger(self, request: web.Request) -> web.StreamResponse:
+        self.requetes['PDF (href)'] += 1
+        session_id, _, authentifie, nouvelle = self._session(request)
+        if not authentifie:
+            raise self._redirection(URL_LOGIN, session_id, nouvelle)
+
+        pdf = self.pdfs.get(request.match_info['cle'])
+        if pdf is None:
+            raise web.HTTPNotFound()
+
+        return web.Response(body=pdf[1], content_type='application/pdf')
+
+    async def ressource(self, request: web.Request) -> web.Response:
+        """Images, CSS... : réponse vide (normalement bloquées par le navigateur)"""
+        self.requetes['ressources'] += 1
+        return web.Response(status=204)
+
+    # ------------------------------------------------------------ cycle de vie
+
+    def creer_application(self) -> web.Application:
+        """Application aiohttp du serveur simulé"""
+        @web.middleware
+        async def latence(request: web.Request, handler):
+            """Latence simulée (pages et PDFs)"""
+            delai = self.latence_pdf_ms if request.path.startswith('/telecharger/') else self.latence_ms
+            if delai:
+                await asyncio.sleep(delai / 1000)
+            return await handler(request)
+
+        app = web.Application(middlewares=[latence])
+        app.router.add_route('*', URL_LOGIN, self.login)
+        app.router.add_route('*', URL_SELECTION, self.selection)
+        app.router.add_route('*', URL_ACCUEIL, self.accueil)
+        app.router.add_get('/telecharger/{cle}/{nom}', self.telecharger)
+        app.router.add_get('/images/{nom}', self.ressource)
+        return app
+
+    async def demarrer(self, hote: str = '127.0.0.1', port: int = 0) -> str:
+        """Démarre le serveur (port 0 : port libre choisi par le système)
+
+        Returns:
+            str: URL de base du serveur (ex: 'http://127.0.0.1:8765')
+        """
+        self._runner = web.AppRunner(self.creer_application(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, hote, port)
+        await site.start()
+
+        port_effectif = site._server.sockets[0].getsockname()[1]
+        return f"http://{hote}:{port_effectif}"
+
+    async def arreter(self):
+        """Arrête le serveur"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def servir(args):
+    serveur = ServeurTelerecoursSimule(
+        nb_juridictions=args.juridictions,
+        messages_par_juridiction=args.messages,
+        latence_ms=args.latence,
+        latence_pdf_ms=args.latence_pdf,
+        taille_page=args.taille_page
+    )
+    url = await serveur.demarrer(port=args.port)
+
+    print(f"🧪 Télérecours simulé sur {url}")
+    print(f"   {args.juridictions} juridiction(s) x {args.messages} message(s), latence {args.latence} ms")
+    print(f"   Login : {url}{URL_LOGIN}")
+
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        await serveur.arreter()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur Télérecours simulé (tests et benchmarks hors ligne)")
+    parser.add_argument('--port', type=int, default=8765, help="Port d'écoute")
+    parser.add_argument('--juridictions', type=int, default=3, help="Nombre de juridictions")
+    parser.add_argument('--messages', type=int, default=20, help="Messages non lus par juridiction")
+    parser.add_argument('--latence', type=int, default=0, help="Latence ajoutée à chaque page (ms)")
+    parser.add_argument('--latence-pdf', type=int, default=0, help="Latence ajoutée à chaque PDF (ms)")
+    parser.add_argument('--taille-page', type=int, default=20, help="Lignes par page de la grille des messages")
+
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(servir(args))
+    except KeyboardInterrupt:
+        print("\n👋 Serveur arrêté")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Configuration du navigateur et accès direct à la page Playwright d'une session crawl4ai
+(attente des téléchargements sur événement plutôt que par délai fixe)
+"""
+
+import asyncio
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+from urllib.parse import urlparse
+from crawl4ai import AsyncWebCrawler, BrowserConfig
+
+from config import TelecoursConfig
+
+
+def dossier_telechargements(config: TelecoursConfig) -> Path:
+    """Dossier de téléchargement du navigateur d'une session (pdfs/.telechargements/<session_id>)
+
+    Avec accept_downloads, crawl4ai enregistre lui-même chaque événement download
+    sous son nom suggéré : ces copies restent hors de pdfs/ et des dossiers de
+    juridiction, un dossier par session pour que les workers ne se mélangent pas.
+    """
+    return config.pdfs_dir / ".telechargements" / config.session_id
+
+
+def vider_dossier_telechargements(config: TelecoursConfig) -> Path:
+    """Vide (et crée) le dossier de téléchargement du navigateur de la session"""
+    dossier = dossier_telechargements(config)
+    shutil.rmtree(dossier, ignore_errors=True)
+    dossier.mkdir(parents=True, exist_ok=True)
+    return dossier
+
+
+def creer_browser_config(
+    config: TelecoursConfig,
+    storage_state: Optional[Union[str, Dict]] = None,
+    utiliser_fichier: bool = True
+) -> BrowserConfig:
+    """Configuration du navigateur commune à tous les modes
+
+    Args:
+        config: Configuration Télérecours
+        storage_state: État de session Playwright (cookies + localStorage) à restaurer ;
+            par défaut, la session sauvegardée par une exécution précédente
+        utiliser_fichier: False pour ne jamais restaurer la session sauvegardée
+            (worker : son fichier contient le cookie ASP.NET de la session principale)
+    """
+    if storage_state is None and utiliser_fichier and config.reutiliser_session and config.fichier_session.exists():
+        storage_state = str(config.fichier_session.absolute())
+
+    return BrowserConfig(
+        headless=config.headless,
+        verbose=False,
+        viewport_width=1920,
+        viewport_height=1080,
+        accept_downloads=True,
+        downloads_path=str(vider_dossier_telechargements(config).absolute()),
+        storage_state=storage_state
+    )
+
+
+def domaine_bloque(url: str, domaines: Iterable[str]) -> bool:
+    """Vrai si l'hôte de l'URL est l'un des domaines ou l'un de leurs sous-domaines
+
+    Ex: 'www.google-analytics.com' est bloqué par 'google-analytics.com', mais pas
+    'https://site.fr/?ref=google-analytics.com' ni 'evil-google-analytics.com'.
+    """
+    hote = (urlparse(url).hostname or '').rstrip('.')
+    return any(hote == domaine or hote.endswith('.' + domaine) for domaine in domaines)
+
+
+async def installer_blocage_ressources(crawler: AsyncWebCrawler, config: TelecoursConfig):
+    """Bloque au niveau du routage navigateur les ressources inutiles au scraping
+
+    Types bloqués : config.bloquer_ressources (images, polices, CSS...) et toute requête
+    vers config.bloquer_domaines ou leurs sous-domaines (analytics). Les scripts du site sont conservés :
+    lireMessage et __doPostBack en dépendent.
+    """
+    if not config.bloquer_ressources and not config.bloquer_domaines:
+        return
+
+    async def bloquer(route):
+        request = route.request
+        if request.resource_type in config.bloquer_ressources or \
+                domaine_bloque(request.url, config.bloquer_domaines):
+            await route.abort()
+        else:
+            await route.fallback()
+
+    async def hook_context_cree(page, context, **kwargs):
+        """Installe la règle de routage une seule fois par contexte"""
+        if not getattr(context, '_blocage_ressources', False):
+            context._blocage_ressources = True
+            await context.route('**/*', bloquer)
+        return page
+
+    crawler.crawler_strategy.set_hook("on_page_context_created", hook_context_cree)
+
+
+def obtenir_page_session(crawler: AsyncWebCrawler, session_id: str):
+    """Retourne la page Playwright associée à une session crawl4ai
+
+    Args:
+        crawler: Instance du crawler
+        session_id: Identifiant de session (config.session_id)
+
+    Returns:
+        Page Playwright, ou None si la session n'existe pas (encore)
+    """
+    browser_manager = getattr(crawler.crawler_strategy, 'browser_manager', None)
+    sessions = getattr(browser_manager, 'sessions', None) or {}
+    session = sessions.get(session_id)
+
+    if not session:
+        return None
+
+    # crawl4ai stocke chaque session sous la forme (context, page, dernière utilisation)
+    try:
+        _, page, _ = session
+    except (TypeError, ValueError):
+        return None
+
+    if page.is_closed():
+        return None
+
+    return page
+
+
+def _est_reponse_pdf(response) -> bool:
+    """Vrai si la réponse réseau contient un PDF"""
+    return 'application/pdf' in response.headers.get('content-type', '').lower()
+
+
+async def attendre_telechargement_clic(
+    page,
+    selecteur: str,
+    chemin_final: Path,
+    timeout_ms: int
+) -> Optional[Path]:
+    """Clique sur un lien et attend le PDF qu'il produit (événement download ou réponse PDF)
+
+    Le fichier obtenu est rattaché au lien cliqué : pas de recherche par date de modification.
+    La copie enregistrée en parallèle par crawl4ai reste dans dossier_telechargements.
+
+    Args:
+        page: Page Playwright de la session
+        selecteur: Sélecteur CSS du lien (ex: '#ctl00_hplGenFichier1')
+        chemin_final: Chemin de destination du PDF
+        timeout_ms: Délai maximal d'attente en millisecondes
+
+    Returns:
+        Path: chemin_final si le PDF a été reçu, None sinon
+    """
+    attente_download = asyncio.ensure_future(
+        page.wait_for_event('download', timeout=timeout_ms)
+    )
+    attente_reponse = asyncio.ensure_future(
+        page.wait_for_event('response', predicate=_est_reponse_pdf, timeout=timeout_ms)
+    )
+    attentes = {attente_download, attente_reponse}
+
+    try:
+        # Même clic JS que la méthode originale (fonctionne aussi sur un lien masqué)
+        lien_trouve = await page.evaluate(
+            """(sel) => {
+                const link = document.querySelector(sel);
+                if (link) link.click();
+                return !!link;
+            }""",
+            selecteur
+        )
+        if not lien_trouve:
+            return None
+
+        done, _ = await asyncio.wait(attentes, return_when=asyncio.FIRST_COMPLETED)
+
+        if attente_reponse in done and not attente_reponse.exception():
+            response = attente_reponse.result()
+            disposition = response.headers.get('content-disposition', '').lower()
+
+            # PDF affiché dans la page : le corps de la réponse suffit
+            if 'attachment' not in disposition:
+                chemin_final.write_bytes(await response.body())
+                return chemin_final
+
+            # PDF en pièce jointe : le fichier arrive par l'événement download
+            await asyncio.wait({attente_download})
+
+        if attente_download.done() and not attente_download.exception():
+            download = attente_download.result()
+            await download.save_as(chemin_final)
+            await download.delete()
+            return chemin_final
+
+        return None
+
+    except Exception as e:
+        print(f"         ⚠️  Téléchargement non reçu ({selecteur}): {e}")
+        return None
+
+    finally:
+        for attente in attentes:
+            if not attente.done():
+                attente.cancel()
+            elif not attente.cancelled():
+                attente.exception()  # Évite l'avertissement "exception never retrieved"
+
+
+async def capturer_pdf_clic(page, selecteur: str, timeout_ms: int) -> Optional[bytes]:
+    """Clique sur un lien et intercepte le PDF produit directement en mémoire
+
+    La requête déclenchée par le clic est rejouée via le routage Playwright : si la
+    réponse est un PDF, son contenu est conservé et le navigateur reçoit un 204
+    (aucun téléchargement, aucun fichier sur le disque).
+
+    Args:
+        page: Page Playwright de la session
+        selecteur: Sélecteur CSS du lien
+        timeout_ms: Délai maximal d'attente en millisecondes
+
+    Returns:
+        bytes: Contenu du PDF, ou None si rien n'a été capturé
+    """
+    capture = asyncio.get_running_loop().create_future()
+
+    async def intercepter(route):
+        # Seules les navigations et requêtes XHR peuvent porter le PDF
+        if capture.done() or route.request.resource_type not in ('document', 'xhr', 'fetch'):
+            await route.fallback()
+            return
+
+        response = await route.fetch()
+        if _est_reponse_pdf(response):
+            if not capture.done():
+                capture.set_result(await response.body())
+            await route.fulfill(status=204)
+        else:
+            await route.fulfill(response=response)
+
+    await page.route('**/*', intercepter)
+
+    try:
+        lien_trouve = await page.evaluate(
+            """(sel) => {
+                const link = document.querySelector(sel);
+                if (link) link.click();
+                return !!link;
+            }""",
+            selecteur
+        )
+        if not lien_trouve:
+            return None
+
+        return await asyncio.wait_for(capture, timeout=timeout_ms / 1000)
+
+    except Exception as e:
+        print(f"         ⚠️  PDF non capturé ({selecteur}): {e}")
+        return None
+
+    finally:
+        await page.unroute('**/*', intercepter)
+
+
+async def capturer_pdf_href(page, url: str, timeout_ms: int) -> Optional[bytes]:
+    """Récupère un PDF à lien direct en mémoire via le contexte du navigateur
+
+    La requête partage les cookies du contexte Playwright (même session que la page).
+
+    Returns:
+        bytes: Contenu du PDF, ou None si échec
+    """
+    try:
+        response = await page.context.request.get(url, timeout=timeout_ms)
+        if not response.ok:
+            return None
+
+        contenu = await response.body()
+        await response.dispose()
+        return contenu if contenu.startswith(b'%PDF') else None
+
+    except Exception as e:
+        print(f"         ⚠️  PDF non capturé ({url.split('/')[-1]}): {e}")
+        return None
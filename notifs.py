@@ -4,10 +4,10 @@ Module de détection des notifications par juridiction
 
 import re
 from typing import List, Dict
-from bs4 import BeautifulSoup
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
 
 from config import TelecoursConfig
+from parseur import analyser_html
 
 
 class JuridictionNotification:
@@ -33,7 +33,8 @@ class NotificationDetector:
     async def get_juridictions_avec_notifs(
         self, 
         crawler: AsyncWebCrawler,
-        html_selection: str = None
+        html_selection: str = None,
+        inclure_sans_notif: bool = False
     ) -> List[JuridictionNotification]:
         """
         Extrait les juridictions avec notifications depuis la page de sélection
@@ -41,6 +42,7 @@ class NotificationDetector:
         Args:
             crawler: Instance du crawler
             html_selection: HTML de la page de sélection (optionnel)
+            inclure_sans_notif: Si True, inclut aussi les juridictions sans notification (reprise)
         
         Returns:
             List[JuridictionNotification]: Liste des juridictions avec notifs
@@ -68,7 +70,7 @@ class NotificationDetector:
             html_selection = result.html
         
         # Parser le HTML
-        soup = BeautifulSoup(html_selection, 'html.parser')
+        soup = analyser_html(html_selection, self.config.parseur_html)
         
         # Trouver toutes les juridictions avec notifications
         # Structure : <li name="TA75"><a href="...">Paris<span class="page-choixJuridiction-mail"><span>2</span></span></a></li>
@@ -124,7 +126,7 @@ class NotificationDetector:
                 )
                 
                 # Ajouter uniquement si notifications > 0
-                if nb_notifs > 0:
+                if nb_notifs > 0 or inclure_sans_notif:
                     juridictions_avec_notifs.append(juridiction)
         
         return juridictions_avec_notifs
@@ -170,14 +172,23 @@ class NotificationDetector:
         if self.config.verbose:
             print(f"📋 Sélection de {juridiction.code} ({juridiction.nom})...")
         
-        js_juridiction = f"__doPostBack('{juridiction.event_target}', '{juridiction.event_argument}');"
+        # L'onglet Messages de la page affichée (juridiction précédente) est marqué :
+        # on attend l'onglet non marqué de la nouvelle page d'accueil
+        js_juridiction = f"""
+        const onglet = document.querySelector("td[title='Messages']");
+        if (onglet) onglet.setAttribute('data-juridiction-precedente', '1');
+        __doPostBack('{juridiction.event_target}', '{juridiction.event_argument}');
+        """
         
         config_juridiction = CrawlerRunConfig(
             session_id=self.config.session_id,
             js_code=js_juridiction,
             js_only=True,
-            wait_for="css:body",
-            page_timeout=self.config.page_timeout,
+            wait_for="""js:() => {
+                const onglet = document.querySelector("td[title='Messages']");
+                return onglet !== null && !onglet.hasAttribute('data-juridiction-precedente');
+            }""",
+            page_timeout=self.config.timeout_selection,
             cache_mode=0,
             verbose=False
         )
@@ -0,0 +1,56 @@
+"""
+Analyse HTML : choix du backend BeautifulSoup
+
+'lxml' (C) est plusieurs fois plus rapide que 'html.parser' (Python pur) sur les
+pages Télérecours ; les sélecteurs restent ceux de BeautifulSoup, l'extraction
+est identique. Repli automatique sur 'html.parser' si lxml n'est pas installé.
+"""
+
+from functools import lru_cache
+from typing import Optional
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+
+
+PARSEUR_PAR_DEFAUT = 'html.parser'
+
+# Backends BeautifulSoup comparés par bench_parseur.py
+PARSEURS_DISPONIBLES = ('lxml', 'html.parser')
+
+
+@lru_cache(maxsize=None)
+def resoudre_parseur(nom: str) -> str:
+    """Vérifie (une seule fois) qu'un backend est installé, sinon repli sur html.parser
+
+    Args:
+        nom: Nom du backend BeautifulSoup ('lxml', 'html.parser'...)
+
+    Returns:
+        str: Backend utilisable
+    """
+    if nom == PARSEUR_PAR_DEFAUT:
+        return nom
+
+    try:
+        BeautifulSoup('', nom)
+        return nom
+    except FeatureNotFound:
+        print(f"⚠️  Parseur HTML '{nom}' indisponible, utilisation de '{PARSEUR_PAR_DEFAUT}'")
+        return PARSEUR_PAR_DEFAUT
+
+
+def analyser_html(
+    html: str,
+    parseur: str = PARSEUR_PAR_DEFAUT,
+    filtre: Optional[SoupStrainer] = None
+) -> BeautifulSoup:
+    """Parse une page HTML avec le backend configuré (TelecoursConfig.parseur_html)
+
+    Args:
+        html: HTML de la page
+        parseur: Nom du backend BeautifulSoup
+        filtre: Ne construire que les éléments retenus (et leurs enfants) au lieu de tout l'arbre
+
+    Returns:
+        BeautifulSoup: Document parsé
+    """
+    return BeautifulSoup(html, resoudre_parseur(parseur), parse_only=filtre)
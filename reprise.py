@@ -0,0 +1,145 @@
+"""
+Points de reprise : sauvegarde message par message pour reprendre une exécution interrompue
+
+Arborescence (dans output_dir/.reprise/) :
+    etat.json              juridictions de l'exécution, terminées, en cours
+    <TA>/liste.json        liste des messages à traiter (figée au premier passage)
+    <TA>/<msg_id>.json     message terminé (détail + PDFs)
+"""
+
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import List, Dict, Optional, Set
+
+from config import TelecoursConfig
+from notifs import JuridictionNotification
+
+
+def _ecrire_json_atomique(chemin: Path, data):
+    """Écrit un JSON via un fichier temporaire (jamais de fichier à moitié écrit)"""
+    chemin.parent.mkdir(parents=True, exist_ok=True)
+    chemin_tmp = chemin.with_suffix('.tmp')
+    with open(chemin_tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(chemin_tmp, chemin)
+
+
+def _lire_json(chemin: Path):
+    """Lit un JSON, None si absent ou illisible (écriture interrompue)"""
+    try:
+        with open(chemin, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class PointReprise:
+    """Sauvegarde de l'avancement d'une exécution (juridictions et messages)
+
+    L'état est relu sur le disque à chaque modification : plusieurs workers
+    peuvent partager le même dossier de reprise. Seule une exécution démarrée
+    par demarrer_execution (config.points_reprise) écrit des points de reprise :
+    une extraction --juridiction ne laisse rien derrière elle.
+    """
+
+    def __init__(self, config: TelecoursConfig):
+        self.config = config
+        self.dossier = config.output_dir / ".reprise"
+        self.fichier_etat = self.dossier / "etat.json"
+
+    def _etat(self) -> Dict:
+        return _lire_json(self.fichier_etat) or {'juridictions': [], 'terminees': [], 'en_cours': []}
+
+    @property
+    def actif(self) -> bool:
+        """Vrai si l'exécution en cours sauvegarde ses points de reprise"""
+        return self.config.points_reprise and self.fichier_etat.exists()
+
+    def existe(self) -> bool:
+        """Vrai si une exécution interrompue peut être reprise"""
+        return self.fichier_etat.exists()
+
+    def demarrer_execution(self, codes_juridictions: List[str]):
+        """Nouvelle exécution : efface les anciens points de reprise"""
+        shutil.rmtree(self.dossier, ignore_errors=True)
+        _ecrire_json_atomique(self.fichier_etat, {
+            'demarre_le': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'juridictions': codes_juridictions,
+            'terminees': [],
+            'en_cours': []
+        })
+
+    def juridictions_a_reprendre(self, juridictions: List[JuridictionNotification]) -> List[JuridictionNotification]:
+        """Juridictions non terminées, celles en cours d'abord, dans l'ordre de l'exécution initiale
+
+        Args:
+            juridictions: Toutes les juridictions disponibles (y compris sans notification)
+        """
+        etat = self._etat()
+        par_code = {j.code: j for j in juridictions}
+
+        codes = [code for code in etat['en_cours'] if code not in etat['terminees']]
+        codes += [
+            code for code in etat['juridictions']
+            if code not in etat['terminees'] and code not in codes
+        ]
+
+        return [par_code[code] for code in codes if code in par_code]
+
+    def debut_juridiction(self, code_juridiction: str):
+        """Marque une juridiction comme en cours"""
+        if not self.actif:
+            return
+        etat = self._etat()
+        if code_juridiction not in etat['en_cours']:
+            etat['en_cours'].append(code_juridiction)
+        if code_juridiction not in etat['juridictions']:
+            etat['juridictions'].append(code_juridiction)
+        _ecrire_json_atomique(self.fichier_etat, etat)
+
+    def fin_juridiction(self, code_juridiction: str):
+        """Marque une juridiction comme terminée et supprime ses messages sauvegardés"""
+        if not self.actif:
+            return
+        etat = self._etat()
+        etat['en_cours'] = [code for code in etat['en_cours'] if code != code_juridiction]
+        if code_juridiction not in etat['terminees']:
+            etat['terminees'].append(code_juridiction)
+        _ecrire_json_atomique(self.fichier_etat, etat)
+
+        shutil.rmtree(self.dossier / code_juridiction, ignore_errors=True)
+
+    def terminer_execution(self):
+        """Exécution complète : plus rien à reprendre"""
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def liste_sauvegardee(self, code_juridiction: str) -> Optional[List[Dict]]:
+        """Liste des messages figée lors du premier passage (None si absente)"""
+        return _lire_json(self.dossier / code_juridiction / "liste.json")
+
+    def sauvegarder_liste(self, code_juridiction: str, liste_messages: List[Dict]):
+        """Fige la liste des messages à traiter pour cette juridiction"""
+        if not self.actif:
+            return
+        _ecrire_json_atomique(self.dossier / code_juridiction / "liste.json", liste_messages)
+
+    def ids_messages_termines(self, code_juridiction: str) -> Set[str]:
+        """Identifiants des messages déjà terminés pour cette juridiction"""
+        dossier = self.dossier / code_juridiction
+        if not dossier.exists():
+            return set()
+
+        return {fichier.stem for fichier in dossier.glob("*.json") if fichier.name != "liste.json"}
+
+    def message_termine(self, code_juridiction: str, msg_id: str) -> Optional[Dict]:
+        """Message terminé sauvegardé (None si absent ou illisible)"""
+        return _lire_json(self.dossier / code_juridiction / f"{msg_id}.json")
+
+    def sauvegarder_message(self, code_juridiction: str, msg: Dict):
+        """Point de reprise après un message terminé (détail, PDFs, webhook)"""
+        if not self.actif:
+            return
+        _ecrire_json_atomique(self.dossier / code_juridiction / f"{msg['msg_id']}.json", msg)
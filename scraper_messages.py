@@ -4,54 +4,167 @@ Basé sur le code original fonctionnel
 """
 
 import asyncio
+from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import List, Dict
-from bs4 import BeautifulSoup
+from contextlib import nullcontext
+from typing import AsyncIterator, List, Dict, Optional, Set, Tuple, Union
+from urllib.parse import urljoin
+from bs4 import NavigableString, SoupStrainer
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
 import re
-import base64
+from html import unescape
 
 from config import TelecoursConfig
-from utils import save_json, save_html, compte_pdfs_dossier, taille_dossier_pdfs, normaliser_objet, generer_nom_fichier_courrier, send_webhook
+from utils import save_html, compte_pdfs_dossier, taille_dossier_pdfs, normaliser_objet, generer_nom_fichier_courrier, attendre_fichier, attendre_nouveau_pdf, parser_date_message
 from notifs import JuridictionNotification
+from telechargement import TelechargeurPdf
+from detail_http import LecteurMessagesHttp
+from index_messages import IndexMessages
+from parseur import analyser_html
+from reprise import PointReprise
+from blobs import MagasinBlobs
+from webhook import FileWebhook
+from sortie import EcrivainNdjson, chemin_sortie, ecrire_tableau_json, lire_messages, sans_contenu
+from navigateur import (
+    obtenir_page_session, attendre_telechargement_clic, capturer_pdf_clic, capturer_pdf_href,
+    dossier_telechargements, vider_dossier_telechargements
+)
 import time
 
 
+# Lignes de la grille des messages : seuls éléments construits lors du parsing de la liste
+FILTRE_LIGNES_NON_LUES = SoupStrainer('tr', class_=re.compile(r'\bmessageNonLu\b'))
+FILTRE_LIGNES_R2 = SoupStrainer('tr', class_=re.compile(r'\btableListeTrR2\b'))
+
+# Lien de l'objet d'un message : lireMessage('8554710', 'M')
+RE_LIRE_MESSAGE = re.compile(r"lireMessage\('([^']+)',\s*'([^']+)'\)")
+
+# Lien du pager de la grille des messages : __doPostBack('ctl00$...$gvMessages','Page$2')
+RE_PAGE_GRILLE = re.compile(r"__doPostBack\(\s*'([^']+)'\s*,\s*'Page\$(\d+|Next)'\s*\)")
+
+
+@dataclass
+class LigneMessage:
+    """Ligne de la grille des messages"""
+    
+    msg_id: str
+    msg_type: str
+    statut: str
+    expediteur: str
+    dossier: str
+    objet: str
+    objet_original: str
+    rapporteur: str
+    date: str
+    
+    @classmethod
+    def depuis_tr(cls, tr, non_lu: bool) -> Optional['LigneMessage']:
+        """Construit la ligne depuis un <tr> de la grille (None si ce n'est pas un message)"""
+        tds = tr.find_all('td')
+        
+        # Structure : [0]=icône, [1]=expéditeur, [2]=dossier, [3]=objet, [4]=rapporteur, [5]=date
+        if len(tds) < 6:
+            return None
+        
+        link_msg = tds[3].find('a', class_='numMessage')
+        if not link_msg:
+            return None
+        
+        match_msg = RE_LIRE_MESSAGE.search(link_msg.get('onclick', ''))
+        if not match_msg:
+            return None
+        
+        objet = link_msg.get_text(strip=True)
+        
+        return cls(
+            msg_id=match_msg.group(1),
+            msg_type=match_msg.group(2),
+            statut='non_lu' if non_lu else 'lu',
+            expediteur=tds[1].get_text(strip=True),
+            dossier=tds[2].get_text(strip=True),
+            # Normaliser l'objet selon les règles métier
+            objet=normaliser_objet(objet),
+            objet_original=objet,  # Conserver l'objet original pour référence
+            rapporteur=tds[4].get_text(strip=True),
+            date=tds[5].get_text(strip=True)
+        )
+    
+    def en_dict(self) -> Dict:
+        """Message au format JSON de sortie"""
+        return asdict(self)
+
+
 class MessageScraper:
     """Scraper de messages Télérecours"""
     
     def __init__(self, config: TelecoursConfig, cookies: Dict[str, str]):
         self.config = config
         self.cookies = cookies
+        self.telechargeur = TelechargeurPdf(config, cookies)
+        self.lecteur_http = LecteurMessagesHttp(config, cookies) if config.detail_http else None
+        self.index = IndexMessages(config.index_path) if config.utiliser_index else None
+        self.reprise = PointReprise(config)
+        self.blobs = MagasinBlobs(config.blobs_dir)
+        self.webhook = FileWebhook(config, self.blobs, au_succes=self._marquer_livre) if config.webhook_url else None
+        # Navigation directe de détail en détail (sans repasser par la liste)
+        self._url_detail: Optional[str] = None
+        self._lire_depuis_detail_possible: Optional[bool] = None
+        # Les actions sur la page de la session (clics, JS) ne peuvent pas être concurrentes
+        self._verrou_page = asyncio.Lock()
+        # PDFs obtenus par le téléchargement navigateur (secours, passe par le disque)
+        self.replis_telechargement = 0
+        # Messages écrits dans la sortie de la juridiction en cours
+        self.nb_messages_sortie = 0
+    
+    async def fermer(self):
+        """Libère les ressources (pools HTTP), après les dernières livraisons au webhook"""
+        if self.webhook is not None:
+            await self.webhook.vider()
+        await self.telechargeur.fermer()
+        if self.lecteur_http is not None:
+            await self.lecteur_http.fermer()
+        if self.index is not None:
+            self.index.fermer()
+            self.index = None
+        # Copies des téléchargements enregistrées par crawl4ai
+        vider_dossier_telechargements(self.config)
+    
+    def _noter_repli(self, nom: str):
+        """Compte un PDF obtenu par le téléchargement navigateur (secours)"""
+        self.replis_telechargement += 1
+        if self.config.verbose:
+            print(f"         ↩️  {nom} : téléchargement par le navigateur (secours)")
     
     async def envoyer_message_webhook(self, message: Dict, code_juridiction: str):
-        """Envoie un message individuel au webhook
+        """Place un message dans la file de livraison du webhook
+        
+        L'envoi a lieu en arrière-plan (webhook.FileWebhook) : le scraping continue
+        pendant la livraison. Le payload est conservé dans la boîte d'envoi jusqu'à
+        ce que le webhook l'accepte.
         
         Args:
             message: Données du message à envoyer
             code_juridiction: Code de la juridiction (ex: 'TA78')
         """
-        payload = {
-            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
-            'code_juridiction': code_juridiction,
-            'message': message
-        }
-        
-        print(f"      📤 Envoi du message {message['msg_id']} au webhook...")
-        success = send_webhook(self.config.webhook_url, payload)
-        
-        if success:
-            print(f"      ✅ Message {message['msg_id']} envoyé avec succès")
-        else:
-            print(f"      ⚠️  Échec d'envoi du message {message['msg_id']}")
-        
-        # Petit délai pour ne pas surcharger le webhook
-        await asyncio.sleep(0.5)
+        print(f"      📤 Message {message['msg_id']} en file pour le webhook")
+        await self.webhook.ajouter(message, code_juridiction)
+    
+    def _marquer_livre(self, code_juridiction: str, msg_id: str):
+        """Message accepté par le webhook (y compris relance d'une exécution précédente)"""
+        if self.index is not None:
+            self.index.marquer_livre(code_juridiction, msg_id)
     
     async def extraire_liens_pdf(self, html: str) -> Dict:
-        """Extrait tous les liens PDF d'une page HTML"""
+        """Extrait tous les liens PDF d'une page HTML
         
-        soup = BeautifulSoup(html, 'html.parser')
+        Un seul parcours de l'arbre, limité au formulaire ASP.NET de la page
+        (les fenêtres de session et d'historique en sont exclues). Sur les pages
+        capturées, l'en-tête du message (accusés) et le tableau du détail sont
+        dans des lignes distinctes de la mise en page : #divEnteteMsg ne les
+        contient pas tous les deux.
+        """
+        
+        soup = analyser_html(html, self.config.parseur_html)
         
         resultats = {
             'courrier_envoye': None,  # Le PDF principal du courrier envoyé
@@ -59,64 +172,260 @@ class MessageScraper:
             'onclick': []             # PDFs onclick (accusés)
         }
         
-        # Chercher la section "Courrier envoyé"
-        courrier_envoye_section = None
-        for td in soup.find_all('td'):
-            if td.get_text(strip=True) == 'Courrier envoyé':
-                # Trouver le parent <tr> puis le <td> suivant qui contient le PDF
-                tr_parent = td.find_parent('tr')
-                if tr_parent:
-                    courrier_envoye_section = tr_parent
-                break
+        racine = soup.find('form') or soup
         
-        # 1. Extraire le PDF du "Courrier envoyé" (prioritaire)
+        courrier_envoye_section = None  # <tr> de la ligne "Courrier envoyé"
+        liens_pdf = []                  # Liens href vers un PDF, dans l'ordre du document
+        
+        for element in racine.descendants:
+            # Ligne "Courrier envoyé" : première cellule dont le texte est exactement ce libellé
+            if type(element) is NavigableString:
+                if courrier_envoye_section is None and element.strip() == 'Courrier envoyé':
+                    td_libelle = None
+                    for parent in element.parents:
+                        if parent.name != 'td':
+                            continue
+                        if parent.get_text(strip=True) != 'Courrier envoyé':
+                            break
+                        td_libelle = parent
+                    
+                    if td_libelle is not None:
+                        courrier_envoye_section = td_libelle.find_parent('tr') or False
+                continue
+            
+            if element.name != 'a':
+                continue
+            
+            href = element.get('href')
+            if href and '.pdf' in href.lower():
+                liens_pdf.append((element, href))
+            
+            # PDFs avec classe hplGenFichier (accusés)
+            if 'hplGenFichier' in element.get('class', []):
+                link_text = element.get_text(strip=True)
+                
+                if 'accusé' in link_text.lower() or 'pdf' in link_text.lower():
+                    resultats['onclick'].append({
+                        'id': element.get('id', ''),
+                        'text': link_text,
+                        'nom_suggeré': f"{link_text.replace(' ', '_')}.pdf"
+                    })
+        
+        def decrire(link, href: str) -> Dict:
+            return {
+                'id': link.get('id', ''),
+                'nom': href.split('/')[-1],
+                'href': href,
+                'class': ' '.join(link.get('class', [])),
+                'text': link.get_text(strip=True)
+            }
+        
+        # 1. PDF du "Courrier envoyé" (prioritaire) : premier lien PDF de sa ligne
         if courrier_envoye_section:
-            # Chercher le lien PDF dans cette section
-            for link in courrier_envoye_section.find_all('a', href=True):
-                href = link.get('href')
-                if href and '.pdf' in href.lower():
-                    nom_fichier = href.split('/')[-1]
-                    resultats['courrier_envoye'] = {
-                        'id': link.get('id', ''),
-                        'nom': nom_fichier,
-                        'href': href,
-                        'class': ' '.join(link.get('class', [])),
-                        'text': link.get_text(strip=True)
-                    }
+            for link, href in liens_pdf:
+                if any(parent is courrier_envoye_section for parent in link.parents):
+                    resultats['courrier_envoye'] = decrire(link, href)
                     break  # Un seul PDF dans "Courrier envoyé"
         
         # 2. Autres PDFs avec href direct (hors courrier envoyé)
-        for link in soup.find_all('a', href=True):
-            href = link.get('href')
+        for link, href in liens_pdf:
+            if resultats['courrier_envoye'] and href.split('/')[-1] == resultats['courrier_envoye']['nom']:
+                continue  # Ignorer, déjà traité
             
-            if href and '.pdf' in href.lower():
-                nom_fichier = href.split('/')[-1]
+            resultats['hrefs_directs'].append(decrire(link, href))
+        
+        return resultats
+    
+    def _url_absolue(self, href: str) -> str:
+        """Construit l'URL absolue d'un lien /telecharger/..."""
+        return urljoin(self.config.base_url + '/', href)
+    
+    async def _telecharger_href(
+        self,
+        crawler: AsyncWebCrawler,
+        url_actuelle: str,
+        pdf_info: Dict,
+        chemin_final: Path
+    ) -> Optional[Union[bytes, Path]]:
+        """Télécharge un PDF à lien direct (HTTP en priorité, navigateur en secours)
+        
+        Args:
+            crawler: Instance du crawler
+            url_actuelle: URL actuelle (page du message)
+            pdf_info: Lien extrait par extraire_liens_pdf
+            chemin_final: Chemin temporaire du PDF pour le téléchargement navigateur
+        
+        Returns:
+            bytes | Path: Contenu du PDF (ou fichier si téléchargé sur le disque), None si échec
+        """
+        pdf_url = self._url_absolue(pdf_info['href'])
+        
+        # 1. HTTP direct avec les cookies de session (temps réseau uniquement)
+        if self.config.telechargement_http:
+            contenu = await self.telechargeur.telecharger(pdf_url)
+            if contenu is not None:
+                return contenu
+        
+        # 2. Capture en mémoire dans le contexte du navigateur (aucun fichier écrit)
+        page = obtenir_page_session(crawler, self.config.session_id)
+        if self.config.capture_memoire and page is not None:
+            contenu = await capturer_pdf_href(page, pdf_url, self.config.timeout_telechargement)
+            if contenu is not None:
+                return contenu
+        
+        # 3. Secours : fetch + blob dans le navigateur, puis lecture sur le disque
+        self._noter_repli(pdf_info['nom'])
+        async with self._verrou_page:
+            return await self._telecharger_via_navigateur(crawler, url_actuelle, pdf_url, pdf_info['nom'], chemin_final)
+    
+    async def _telecharger_via_navigateur(
+        self,
+        crawler: AsyncWebCrawler,
+        url_actuelle: str,
+        pdf_url: str,
+        nom_original: str,
+        chemin_final: Path
+    ) -> Optional[Union[bytes, Path]]:
+        """Télécharge un PDF via JavaScript fetch + blob (méthode originale qui fonctionne)"""
+        
+        # Le fetch est attendu : au retour de arun, le téléchargement est déclenché
+        js_download = f"""
+        await (async () => {{
+            try {{
+                const response = await fetch('{pdf_url}');
+                if (!response.ok) return;
                 
-                # Vérifier si ce n'est pas le PDF du courrier envoyé
-                if resultats['courrier_envoye'] and nom_fichier == resultats['courrier_envoye']['nom']:
-                    continue  # Ignorer, déjà traité
+                const blob = await response.blob();
+                const url = window.URL.createObjectURL(blob);
+                const a = document.createElement('a');
+                a.style.display = 'none';
+                a.href = url;
+                a.download = '{nom_original}';
                 
-                resultats['hrefs_directs'].append({
-                    'id': link.get('id', ''),
-                    'nom': nom_fichier,
-                    'href': href,
-                    'class': ' '.join(link.get('class', [])),
-                    'text': link.get_text(strip=True)
-                })
-        
-        # 3. PDFs avec classe hplGenFichier (accusés)
-        for link in soup.find_all('a', class_='hplGenFichier'):
-            link_id = link.get('id', '')
-            link_text = link.get_text(strip=True)
-            
-            if 'accusé' in link_text.lower() or 'pdf' in link_text.lower():
-                resultats['onclick'].append({
-                    'id': link_id,
-                    'text': link_text,
-                    'nom_suggeré': f"{link_text.replace(' ', '_')}.pdf"
-                })
+                document.body.appendChild(a);
+                a.click();
+                
+                // Nettoyage différé, sans bloquer le retour
+                setTimeout(() => {{
+                    window.URL.revokeObjectURL(url);
+                    document.body.removeChild(a);
+                }}, 1000);
+            }} catch (error) {{
+                console.error('Erreur téléchargement:', error);
+            }}
+        }})();
+        """
         
-        return resultats
+        config_download = CrawlerRunConfig(
+            session_id=self.config.session_id,
+            js_code=js_download,
+            js_only=True,
+            page_timeout=self.config.timeout_telechargement,
+            cache_mode=0,
+            verbose=False
+        )
+        
+        try:
+            await crawler.arun(url=url_actuelle, config=config_download)
+            
+            # Les PDFs sont téléchargés dans le dossier de téléchargement du navigateur
+            # Il faut les chercher là et les déplacer vers pdfs/TA78/
+            chemin_telecharge = dossier_telechargements(self.config) / nom_original
+            
+            if not await attendre_fichier(chemin_telecharge, self.config.timeout_telechargement / 1000):
+                return None
+            
+            # Déplacé ensuite dans le magasin des blobs, sans lecture en mémoire
+            chemin_telecharge.rename(chemin_final)
+            return chemin_final
+            
+        except Exception as e:
+            return None
+    
+    async def _telecharger_onclick(
+        self,
+        crawler: AsyncWebCrawler,
+        url_actuelle: str,
+        pdf_info: Dict,
+        chemin_final: Path,
+        html_http: Optional[str] = None
+    ) -> Optional[Union[bytes, Path]]:
+        """Télécharge un PDF onclick (accusé hplGenFichier)
+        
+        Message lu en HTTP (html_http fourni) : le postback du lien est rejoué en HTTP.
+        En mode capture mémoire, la réponse PDF est interceptée sans passer par le disque.
+        Sinon (ou si la capture échoue), attend l'événement de téléchargement Playwright
+        déclenché par le clic ; la surveillance du dossier de téléchargement ne sert qu'en secours.
+        """
+        if html_http is not None:
+            return await self.lecteur_http.telecharger_postback(html_http, url_actuelle, pdf_info['id'])
+        
+        page = obtenir_page_session(crawler, self.config.session_id)
+        
+        # Un seul clic à la fois sur la page de la session
+        async with self._verrou_page:
+            if self.config.capture_memoire and page is not None:
+                contenu = await capturer_pdf_clic(page, f"#{pdf_info['id']}", self.config.timeout_telechargement)
+                if contenu is not None:
+                    return contenu
+            
+                self._noter_repli(pdf_info['id'])
+            
+            if page is not None:
+                pdf_path = await attendre_telechargement_clic(
+                    page,
+                    f"#{pdf_info['id']}",
+                    chemin_final,
+                    self.config.timeout_telechargement
+                )
+            else:
+                pdf_path = await self._telecharger_onclick_via_dossier(crawler, url_actuelle, pdf_info, chemin_final)
+        
+        # Fichier sur le disque : déplacé ensuite dans le magasin des blobs
+        return pdf_path or None
+    
+    async def _telecharger_onclick_via_dossier(
+        self,
+        crawler: AsyncWebCrawler,
+        url_actuelle: str,
+        pdf_info: Dict,
+        chemin_final: Path
+    ) -> Optional[Path]:
+        """Secours : clic JS puis attente du premier PDF apparu dans le dossier de téléchargement"""
+        
+        js_click = f"""
+        const link = document.querySelector('#{pdf_info['id']}');
+        if (link) link.click();
+        """
+        
+        config_click = CrawlerRunConfig(
+            session_id=self.config.session_id,
+            js_code=js_click,
+            js_only=True,
+            page_timeout=self.config.timeout_telechargement,
+            cache_mode=0,
+            verbose=False
+        )
+        
+        try:
+            debut_clic = time.time()
+            await crawler.arun(url=url_actuelle, config=config_click)
+            
+            # PDF apparu dans le dossier de téléchargement depuis le clic
+            pdf_path = await attendre_nouveau_pdf(
+                dossier_telechargements(self.config),
+                depuis=debut_clic - 1,
+                timeout=self.config.timeout_telechargement / 1000
+            )
+            
+            if not pdf_path:
+                return None
+            
+            pdf_path.rename(chemin_final)
+            return chemin_final
+            
+        except Exception as e:
+            return None
     
     async def telecharger_pdfs_message(
         self, 
@@ -127,8 +436,9 @@ class MessageScraper:
         url_actuelle: str,
         objet_normalise: str = None,
         dossier_complet: str = None,
-        date_message: str = None
-    ) -> List[Dict]:
+        date_message: str = None,
+        via_http: bool = False
+    ) -> Tuple[List[Dict], int]:
         """Télécharge tous les PDFs d'un message
         
         Args:
@@ -140,6 +450,10 @@ class MessageScraper:
             objet_normalise: Objet normalisé du message (pour nomenclature)
             dossier_complet: Champ dossier complet (pour extraire nom client)
             date_message: Date du message (pour nomenclature)
+            via_http: Message lu en HTTP (le navigateur n'affiche pas ce message)
+        
+        Returns:
+            Tuple[List[Dict], int]: (fichiers téléchargés, nombre de pièces en échec)
         """
         
         pdfs = await self.extraire_liens_pdf(html_message)
@@ -148,24 +462,17 @@ class MessageScraper:
         nb_total = nb_courrier + len(pdfs['hrefs_directs']) + len(pdfs['onclick'])
         
         if nb_total == 0:
-            return []
+            return [], 0
         
         print(f"      {nb_total} PDF(s) trouvé(s)")
         if pdfs['courrier_envoye']:
             print(f"         - 1 Courrier envoyé (sera renommé selon nomenclature)")
         
-        fichiers_telecharges = []
+        # Liste ordonnée des pièces : courrier envoyé, puis liens directs, puis accusés
+        pieces = []
         
-        # Télécharger le PDF du "Courrier envoyé" en premier (avec nomenclature)
         if pdfs['courrier_envoye']:
-            print(f"      Téléchargement du Courrier envoyé...")
-            
             pdf_info = pdfs['courrier_envoye']
-            href = pdf_info['href']
-            if href.startswith('/'):
-                pdf_url = f"https://www.telerecours.juradm.fr{href}"
-            else:
-                pdf_url = href
             
             # Générer le nom selon la nomenclature
             if objet_normalise and dossier_complet and date_message:
@@ -179,228 +486,401 @@ class MessageScraper:
                 # Fallback si les infos manquent
                 nom_fichier_final = f"{msg_id}_{pdf_info['nom']}"
             
-            # JavaScript fetch + blob
-            js_download = f"""
-            (async () => {{
-                try {{
-                    const response = await fetch('{pdf_url}');
-                    if (!response.ok) return;
-                    
-                    const blob = await response.blob();
-                    const url = window.URL.createObjectURL(blob);
-                    const a = document.createElement('a');
-                    a.style.display = 'none';
-                    a.href = url;
-                    a.download = '{pdf_info['nom']}';
-                    
-                    document.body.appendChild(a);
-                    a.click();
-                    
-                    await new Promise(resolve => setTimeout(resolve, 1000));
-                    
-                    window.URL.revokeObjectURL(url);
-                    document.body.removeChild(a);
-                }} catch (error) {{
-                    console.error('Erreur téléchargement:', error);
-                }}
-            }})();
-            """
-            
-            config_download = CrawlerRunConfig(
-                session_id=self.config.session_id,
-                js_code=js_download,
-                js_only=True,
-                page_timeout=15000,
-                cache_mode=0,
-                verbose=False
-            )
+            pieces.append(('courrier_envoye', pdf_info, pdf_info['nom'], nom_fichier_final))
+        
+        for pdf_info in pdfs['hrefs_directs']:
+            pieces.append(('href_direct', pdf_info, pdf_info['nom'], f"{msg_id}_{pdf_info['nom']}"))
+        
+        for pdf_info in pdfs['onclick']:
+            pieces.append(('onclick', pdf_info, pdf_info['text'], f"{msg_id}_{pdf_info['nom_suggeré']}"))
+        
+        semaphore = asyncio.Semaphore(self.config.max_telechargements_par_message)
+        
+        async def telecharger_piece(type_piece: str, pdf_info: Dict, nom_original: str, nom_fichier: str) -> Optional[Dict]:
+            chemin_final = Path(dossier_pdfs) / nom_fichier
             
-            try:
-                await crawler.arun(url=url_actuelle, config=config_download)
-                await asyncio.sleep(3)
-                
-                # Chercher le PDF téléchargé
-                dossier_racine = Path(dossier_pdfs).parent
-                chemin_racine = dossier_racine / pdf_info['nom']
-                chemin_final = Path(dossier_pdfs) / nom_fichier_final
-                
-                pdf_path = None
-                if chemin_racine.exists():
-                    chemin_racine.rename(chemin_final)
-                    pdf_path = chemin_final
-                elif chemin_final.exists():
-                    pdf_path = chemin_final
-                
-                # Convertir en base64
-                if pdf_path and pdf_path.exists():
-                    with open(pdf_path, 'rb') as pdf_file:
-                        pdf_base64 = base64.b64encode(pdf_file.read()).decode('utf-8')
-                    
-                    fichiers_telecharges.append({
-                        'type': 'courrier_envoye',
-                        'nom_original': pdf_info['nom'],
-                        'nom_fichier': nom_fichier_final,
-                        'contenu_base64': pdf_base64
-                    })
-                    print(f"         ✓ {nom_fichier_final} (nomenclature appliquée)")
-                    
-                    # Supprimer le fichier après conversion
-                    pdf_path.unlink()
-                
-            except Exception as e:
-                print(f"         ✗ Erreur: {pdf_info['nom']}")
+            async with semaphore:
+                if type_piece == 'onclick':
+                    contenu = await self._telecharger_onclick(
+                        crawler, url_actuelle, pdf_info, chemin_final,
+                        html_http=html_message if via_http else None
+                    )
+                else:
+                    contenu = await self._telecharger_href(crawler, url_actuelle, pdf_info, chemin_final)
             
-            await asyncio.sleep(1)
+            if contenu is None:
+                print(f"         ✗ Erreur: {nom_original}")
+                return None
+            
+            print(f"         ✓ {nom_fichier}")
+            
+            # Le message ne garde que l'empreinte et la taille : le contenu base64
+            # (webhook, --pdfs-inline) est encodé par blocs à l'écriture
+            if isinstance(contenu, Path):
+                blob = self.blobs.importer(contenu)
+            else:
+                blob = self.blobs.stocker(contenu)
+            
+            return {
+                'type': type_piece,
+                'nom_original': nom_original,
+                'nom_fichier': nom_fichier,
+                **blob
+            }
+        
+        # Téléchargement concurrent ; gather conserve l'ordre des pièces
+        print(f"      Téléchargement de {len(pieces)} PDF(s)...")
+        resultats = await asyncio.gather(*(telecharger_piece(*piece) for piece in pieces))
+        fichiers_telecharges = [fichier for fichier in resultats if fichier]
         
-        # Télécharger les autres PDFs avec href direct
-        if pdfs['hrefs_directs']:
-            print(f"      Téléchargement de {len(pdfs['hrefs_directs'])} PDF(s)...")
+        return fichiers_telecharges, len(resultats) - len(fichiers_telecharges)
+    
+    async def _lire_message_navigateur(
+        self,
+        crawler: AsyncWebCrawler,
+        url_liste: str,
+        msg: Dict
+    ) -> Optional[Tuple[str, str]]:
+        """Ouvre un message dans le navigateur via lireMessage(msg_id, msg_type)
+        
+        Si le message précédent est encore affiché, lireMessage est appelé directement
+        depuis son détail (navigation directe) ; le retour à la liste n'a lieu qu'en secours.
+        
+        Returns:
+            Tuple[str, str]: (HTML du détail, URL), ou None si échec
+        """
+        page = obtenir_page_session(crawler, self.config.session_id)
+        
+        # Pendant l'apprentissage du postback, les deux requêtes doivent partir de la liste
+        apprentissage_en_cours = (
+            self.lecteur_http is not None
+            and not self.lecteur_http.pret
+            and not self.lecteur_http.desactive
+        )
+        
+        if self._url_detail is not None:
+            url_detail_precedent, self._url_detail = self._url_detail, None
             
-            for pdf_info in pdfs['hrefs_directs']:
-                href = pdf_info['href']
-                if href.startswith('/'):
-                    pdf_url = f"https://www.telerecours.juradm.fr{href}"
-                else:
-                    pdf_url = href
-                
-                nom_fichier = f"{msg_id}_{pdf_info['nom']}"
-                
-                # JavaScript fetch + blob (méthode originale qui fonctionne)
-                js_download = f"""
-                (async () => {{
-                    try {{
-                        const response = await fetch('{pdf_url}');
-                        if (!response.ok) return;
-                        
-                        const blob = await response.blob();
-                        const url = window.URL.createObjectURL(blob);
-                        const a = document.createElement('a');
-                        a.style.display = 'none';
-                        a.href = url;
-                        a.download = '{pdf_info['nom']}';
-                        
-                        document.body.appendChild(a);
-                        a.click();
-                        
-                        await new Promise(resolve => setTimeout(resolve, 1000));
-                        
-                        window.URL.revokeObjectURL(url);
-                        document.body.removeChild(a);
-                    }} catch (error) {{
-                        console.error('Erreur téléchargement:', error);
-                    }}
-                }})();
-                """
-                
-                config_download = CrawlerRunConfig(
-                    session_id=self.config.session_id,
-                    js_code=js_download,
-                    js_only=True,
-                    page_timeout=15000,
-                    cache_mode=0,
-                    verbose=False
-                )
-                
-                try:
-                    await crawler.arun(url=url_actuelle, config=config_download)
-                    await asyncio.sleep(3)
-                    
-                    # Les PDFs sont téléchargés dans le dossier racine pdfs/
-                    # Il faut les chercher là et les déplacer vers pdfs/TA78/
-                    dossier_racine = Path(dossier_pdfs).parent  # pdfs/ au lieu de pdfs/TA78/
-                    chemin_racine = dossier_racine / pdf_info['nom']
-                    chemin_final = Path(dossier_pdfs) / nom_fichier
-                    
-                    # Chercher dans le dossier racine et déplacer
-                    pdf_path = None
-                    if chemin_racine.exists():
-                        chemin_racine.rename(chemin_final)
-                        pdf_path = chemin_final
-                    elif chemin_final.exists():
-                        pdf_path = chemin_final
-                    
-                    # Convertir le PDF en base64
-                    if pdf_path and pdf_path.exists():
-                        with open(pdf_path, 'rb') as pdf_file:
-                            pdf_base64 = base64.b64encode(pdf_file.read()).decode('utf-8')
-                        
-                        fichiers_telecharges.append({
-                            'type': 'href_direct',
-                            'nom_original': pdf_info['nom'],
-                            'nom_fichier': nom_fichier,
-                            'contenu_base64': pdf_base64
-                        })
-                        print(f"         ✓ {pdf_info['nom']} (converti en base64)")
-                        
-                        # Supprimer le fichier PDF après conversion
-                        pdf_path.unlink()
-                    
-                except Exception as e:
-                    print(f"         ✗ Erreur: {pdf_info['nom']}")
-                
-                await asyncio.sleep(1)
-        
-        # Cliquer sur les PDFs onclick (accusés)
-        if pdfs['onclick']:
-            print(f"      Téléchargement de {len(pdfs['onclick'])} PDF(s) onclick...")
-            
-            for pdf_info in pdfs['onclick']:
-                js_click = f"""
-                await new Promise(resolve => setTimeout(resolve, 300));
-                const link = document.querySelector('#{pdf_info['id']}');
-                if (link) link.click();
-                """
-                
-                config_click = CrawlerRunConfig(
-                    session_id=self.config.session_id,
-                    js_code=js_click,
-                    js_only=True,
-                    page_timeout=5000,
-                    cache_mode=0,
-                    verbose=False
-                )
-                
-                try:
-                    await crawler.arun(url=url_actuelle, config=config_click)
-                    await asyncio.sleep(3)
-                    
-                    # Chercher le PDF téléchargé
-                    dossier_racine = Path(dossier_pdfs).parent
-                    chemin_final = Path(dossier_pdfs) / f"{msg_id}_{pdf_info['nom_suggeré']}"
-                    
-                    # Chercher tous les PDFs récemment téléchargés
-                    import time
-                    pdfs_recents = []
-                    for pdf_file in dossier_racine.glob("*.pdf"):
-                        if time.time() - pdf_file.stat().st_mtime < 10:  # Modifié il y a moins de 10s
-                            pdfs_recents.append(pdf_file)
-                    
-                    if pdfs_recents:
-                        # Prendre le plus récent
-                        pdf_path = max(pdfs_recents, key=lambda p: p.stat().st_mtime)
-                        pdf_path.rename(chemin_final)
-                        
-                        # Convertir en base64
-                        with open(chemin_final, 'rb') as pdf_file:
-                            pdf_base64 = base64.b64encode(pdf_file.read()).decode('utf-8')
-                        
-                        fichiers_telecharges.append({
-                            'type': 'onclick',
-                            'nom_original': pdf_info['text'],
-                            'nom_fichier': f"{msg_id}_{pdf_info['nom_suggeré']}",
-                            'contenu_base64': pdf_base64
-                        })
-                        print(f"         ✓ {pdf_info['text']} (converti en base64)")
-                        
-                        # Supprimer le fichier
-                        chemin_final.unlink()
-                    
-                except Exception as e:
-                    print(f"         ✗ Erreur onclick: {pdf_info['text']}")
-                
-                await asyncio.sleep(1)
+            if self.config.navigation_directe and not apprentissage_en_cours:
+                lu = await self._lire_message_depuis_detail(crawler, page, url_detail_precedent, msg)
+                if lu is not None:
+                    self._url_detail = lu[1]
+                    return lu
+            
+            await self._retour_liste(crawler, url_detail_precedent)
+        
+        js_lire = f"""
+        if (typeof lireMessage === 'function') {{
+            lireMessage('{msg['msg_id']}', '{msg['msg_type']}');
+        }}
+        """
         
-        return fichiers_telecharges
+        config_lire = CrawlerRunConfig(
+            session_id=self.config.session_id,
+            js_code=js_lire,
+            js_only=True,
+            wait_for="css:#divEnteteMsg",
+            page_timeout=self.config.timeout_lecture,
+            cache_mode=0,
+            verbose=False
+        )
+        
+        # Enregistrer le postback émis pour pouvoir le rejouer en HTTP
+        if apprentissage_en_cours and page is not None:
+            apprentissage = self.lecteur_http.apprendre(page, msg['msg_id'], msg['msg_type'])
+        else:
+            apprentissage = nullcontext()
+        
+        async with apprentissage:
+            result_detail = await crawler.arun(url=url_liste, config=config_lire)
+        
+        if not result_detail.success:
+            return None
+        
+        self._url_detail = result_detail.url
+        return result_detail.html, result_detail.url
+    
+    async def _lire_message_depuis_detail(
+        self,
+        crawler: AsyncWebCrawler,
+        page,
+        url_detail: str,
+        msg: Dict
+    ) -> Optional[Tuple[str, str]]:
+        """Ouvre un message directement depuis le détail du message précédent
+        
+        Returns:
+            Tuple[str, str]: (HTML du détail, URL), ou None si la navigation directe est impossible
+        """
+        # lireMessage doit exister sur la vue détail (vérifié une fois par juridiction)
+        if self._lire_depuis_detail_possible is None:
+            if page is None:
+                return None
+            self._lire_depuis_detail_possible = await page.evaluate("typeof lireMessage === 'function'")
+        
+        if not self._lire_depuis_detail_possible:
+            return None
+        
+        # L'en-tête du message affiché est marqué : on attend un en-tête non marqué
+        js_lire = f"""
+        const entete = document.querySelector('#divEnteteMsg');
+        if (entete) entete.setAttribute('data-message-precedent', '1');
+        lireMessage('{msg['msg_id']}', '{msg['msg_type']}');
+        """
+        
+        config_lire = CrawlerRunConfig(
+            session_id=self.config.session_id,
+            js_code=js_lire,
+            js_only=True,
+            wait_for="""js:() => {
+                const entete = document.querySelector('#divEnteteMsg');
+                return entete !== null && !entete.hasAttribute('data-message-precedent');
+            }""",
+            page_timeout=self.config.timeout_lecture,
+            cache_mode=0,
+            verbose=False
+        )
+        
+        result_detail = await crawler.arun(url=url_detail, config=config_lire)
+        
+        if not result_detail.success:
+            self._lire_depuis_detail_possible = False
+            return None
+        
+        return result_detail.html, result_detail.url
+    
+    async def _retour_liste(self, crawler: AsyncWebCrawler, url_detail: str):
+        """Revient à la liste des messages via #btRetour"""
+        
+        js_retour = """
+        const btnRetour = document.querySelector('#btRetour');
+        if (btnRetour) btnRetour.click();
+        """
+        
+        # Liste affichée : plus d'en-tête de message et lignes de la grille présentes
+        config_retour = CrawlerRunConfig(
+            session_id=self.config.session_id,
+            js_code=js_retour,
+            js_only=True,
+            wait_for="""js:() => document.querySelector('#divEnteteMsg') === null
+                && document.querySelector('tr.tableListeTrR1, tr.tableListeTrR2') !== null""",
+            page_timeout=self.config.timeout_retour,
+            cache_mode=0,
+            verbose=False
+        )
+        
+        await crawler.arun(url=url_detail, config=config_retour)
+    
+    def _parser_page_messages(self, html_liste: str, messages_non_lus_seulement: bool) -> List[LigneMessage]:
+        """
+        Parse les lignes d'une page de la grille des messages
+        
+        Seules les lignes de la grille sont construites (SoupStrainer) : le reste de
+        l'onglet Messages (menus, en-tête, scripts) n'est jamais transformé en arbre.
+        
+        Args:
+            html_liste: HTML de l'onglet Messages (page courante de la grille)
+            messages_non_lus_seulement: Si True, seulement les non lus
+        
+        Returns:
+            List[LigneMessage]: Messages de la page, dans l'ordre de la grille
+        """
+        filtre = FILTRE_LIGNES_NON_LUES if messages_non_lus_seulement else FILTRE_LIGNES_R2
+        lignes = analyser_html(html_liste, self.config.parseur_html, filtre)
+        
+        liste_messages = []
+        
+        for tr in lignes.find_all('tr', recursive=False):
+            # Messages non lus ont la classe 'messageNonLu'
+            # Mode test : scraper UNIQUEMENT les messages lus (tableListeTrR2 sans messageNonLu)
+            non_lu = 'messageNonLu' in tr.get('class', [])
+            if non_lu != messages_non_lus_seulement:
+                continue
+            
+            ligne = LigneMessage.depuis_tr(tr, non_lu)
+            if ligne is not None:
+                liste_messages.append(ligne)
+        
+        return liste_messages
+    
+    @staticmethod
+    def _postback_page_suivante(html_liste: str, page_courante: int) -> Optional[Tuple[str, str]]:
+        """
+        Trouve le lien du pager ASP.NET vers la page suivante de la grille
+        
+        Les liens du pager sont de la forme __doPostBack('ctl00$...$gvMessages','Page$3').
+        Les pagers tronqués ("...") mènent à la première page non affichée : on prend
+        la plus petite page supérieure à la page courante.
+        
+        Returns:
+            Tuple[str, str]: (__EVENTTARGET, __EVENTARGUMENT), ou None si dernière page
+        """
+        pages = {}
+        # Les apostrophes des attributs href peuvent être encodées (&#39;)
+        for event_target, cible in RE_PAGE_GRILLE.findall(unescape(html_liste)):
+            pages.setdefault(cible, event_target)
+        
+        suivantes = [int(cible) for cible in pages if cible.isdigit() and int(cible) > page_courante]
+        if suivantes:
+            cible = str(min(suivantes))
+            return pages[cible], f"Page${cible}"
+        
+        if 'Next' in pages:
+            return pages['Next'], "Page$Next"
+        
+        return None
+    
+    async def _aller_page_grille(
+        self,
+        crawler: AsyncWebCrawler,
+        url_liste: str,
+        postback: Tuple[str, str]
+    ):
+        """Affiche une autre page de la grille des messages (postback du pager)"""
+        event_target, event_argument = postback
+        
+        # La première ligne de la page affichée est marquée : on attend une grille non marquée
+        js_page = f"""
+        const ligne = document.querySelector('tr.tableListeTrR1, tr.tableListeTrR2');
+        if (ligne) ligne.setAttribute('data-page-precedente', '1');
+        __doPostBack('{event_target}', '{event_argument}');
+        """
+        
+        config_page = CrawlerRunConfig(
+            session_id=self.config.session_id,
+            js_code=js_page,
+            js_only=True,
+            wait_for="""js:() => {
+                const ligne = document.querySelector('tr.tableListeTrR1, tr.tableListeTrR2');
+                return ligne !== null && !ligne.hasAttribute('data-page-precedente');
+            }""",
+            page_timeout=self.config.timeout_pagination,
+            cache_mode=0,
+            verbose=False
+        )
+        
+        return await crawler.arun(url=url_liste, config=config_page)
+    
+    async def iterer_messages_grille(
+        self,
+        crawler: AsyncWebCrawler,
+        result_liste,
+        messages_non_lus_seulement: bool = True
+    ) -> AsyncIterator[Dict]:
+        """
+        Parcourt paresseusement toutes les pages de la grille des messages
+        
+        Une seule page de HTML est gardée en mémoire : la page suivante n'est demandée
+        que lorsque l'appelant a consommé les messages de la page courante. L'appelant
+        arrête le parcours en sortant de la boucle (limite atteinte, date limite...).
+        
+        Args:
+            crawler: Instance du crawler (onglet Messages ouvert)
+            result_liste: Résultat crawl4ai de l'ouverture de l'onglet Messages
+            messages_non_lus_seulement: Si True, seulement les non lus
+        
+        Yields:
+            Dict: Messages dans l'ordre de la grille, page après page
+        """
+        html_liste, url_liste = result_liste.html, result_liste.url
+        page_courante = 1
+        
+        while True:
+            for ligne in self._parser_page_messages(html_liste, messages_non_lus_seulement):
+                msg = ligne.en_dict()
+                msg['page'] = page_courante
+                yield msg
+            
+            postback = self._postback_page_suivante(html_liste, page_courante)
+            if postback is None:
+                return
+            
+            if page_courante >= self.config.max_pages_liste:
+                print(f"   ⚠️  Limite de {self.config.max_pages_liste} page(s) atteinte, pages suivantes ignorées")
+                return
+            
+            result_page = await self._aller_page_grille(crawler, url_liste, postback)
+            if not result_page.success:
+                print(f"   ⚠️  Page {page_courante + 1} de la grille inaccessible, arrêt de la pagination")
+                return
+            
+            page_courante += 1
+            html_liste, url_liste = result_page.html, result_page.url
+            
+            if self.config.verbose:
+                print(f"   📄 Page {page_courante} de la grille des messages")
+    
+    async def _lister_messages(
+        self,
+        crawler: AsyncWebCrawler,
+        result_liste,
+        code_juridiction: str,
+        messages_non_lus_seulement: bool,
+        max_messages: Optional[int]
+    ) -> List[Dict]:
+        """
+        Liste les messages à traiter en parcourant les pages de la grille de l'onglet Messages
+        
+        Le parcours s'arrête dès que max_messages nouveaux messages sont trouvés ou qu'un
+        message antérieur à config.depuis est atteint (grille triée par date décroissante).
+        
+        La liste est complète avant l'ouverture du premier message : ouvrir un message
+        quitte la grille (le postback du pager n'est plus disponible depuis le détail) et
+        le marque comme lu, ce qui décale les pages de non lus ; la reprise fige aussi
+        cette liste (sauvegarder_liste) avant toute ouverture. Seules les lignes de la
+        grille sont conservées, pas le HTML des pages.
+        
+        Args:
+            crawler: Instance du crawler
+            result_liste: Résultat crawl4ai de l'ouverture de l'onglet Messages
+            code_juridiction: Code de la juridiction
+            messages_non_lus_seulement: Si True, seulement les non lus
+            max_messages: Nombre maximum de messages (None : pas de limite)
+        
+        Returns:
+            List[Dict]: Messages à traiter (hors messages déjà présents dans l'index)
+        """
+        
+        # Ignorer les messages déjà extraits (et livrés) lors d'une exécution précédente
+        deja_traites = set()
+        if self.index is not None:
+            deja_traites = self.index.messages_traites(
+                code_juridiction,
+                livraison_requise=bool(self.config.webhook_url)
+            )
+        
+        date_limite = parser_date_message(self.config.depuis) if self.config.depuis else None
+        
+        liste_messages = []
+        nb_trouves = 0
+        nb_ignores = 0
+        
+        async for msg in self.iterer_messages_grille(crawler, result_liste, messages_non_lus_seulement):
+            date_message = parser_date_message(msg['date'])
+            if date_limite is not None and date_message is not None and date_message < date_limite:
+                print(f"   🗓️  Date limite {self.config.depuis} atteinte (message du {msg['date']})")
+                break
+            
+            nb_trouves += 1
+            if msg['msg_id'] in deja_traites:
+                nb_ignores += 1
+                continue
+            
+            msg['index'] = len(liste_messages) + 1
+            liste_messages.append(msg)
+            
+            if max_messages is not None and len(liste_messages) >= max_messages:
+                break
+        
+        if messages_non_lus_seulement:
+            print(f"   📬 {nb_trouves} message(s) NON LU(S) trouvé(s)")
+        else:
+            print(f"   📖 {nb_trouves} message(s) LUS trouvé(s) (mode test)")
+        
+        if nb_ignores:
+            print(f"   ⏭️  {nb_ignores} message(s) déjà traité(s) ignoré(s)")
+        
+        return liste_messages
     
     async def scraper_tous_messages(
         self,
@@ -408,10 +888,13 @@ class MessageScraper:
         code_juridiction: str,
         messages_non_lus_seulement: bool = True,
         max_messages: int = 100
-    ) -> List[Dict]:
+    ) -> int:
         """
         Scrape tous les messages d'une juridiction
         
+        Les messages sont dans le fichier de sortie (chemin_sortie) : en NDJSON, aucun
+        n'est gardé en mémoire, seul leur nombre est compté.
+        
         Args:
             crawler: Instance du crawler
             code_juridiction: Code de la juridiction
@@ -419,14 +902,17 @@ class MessageScraper:
             max_messages: Nombre maximum de messages
         
         Returns:
-            List[Dict]: Liste des messages extraits
+            int: Nombre de messages extraits
         """
         
+        # Relance, pendant le scraping, des envois restés en attente d'une exécution précédente
+        if self.webhook is not None:
+            self.webhook.demarrer()
+        
         print(f"\n Ouverture de l'onglet Messages...")
         
         # Clic sur onglet Messages
         js_messages = """
-        await new Promise(resolve => setTimeout(resolve, 1000));
         const ongletMessages = document.querySelector('td[title="Messages"]');
         if (ongletMessages) {
             if (typeof ouvrirMessage === 'function') {
@@ -442,7 +928,7 @@ class MessageScraper:
             js_code=js_messages,
             js_only=True,
             wait_for="css:tr.tableListeTrR1,tr.tableListeTrR2",
-            page_timeout=self.config.page_timeout,
+            page_timeout=self.config.timeout_messages,
             cache_mode=0,
             verbose=False
         )
@@ -454,120 +940,166 @@ class MessageScraper:
         
         if not result_messages.success:
             print(f" Erreur ouverture Messages")
-            return []
+            return 0
         
         print(f" Onglet Messages ouvert")
         
-        # Extraire les messages
-        soup_messages = BeautifulSoup(result_messages.html, 'html.parser')
+        # Reprise : la liste figée au premier passage fait foi (les messages déjà ouverts ne sont plus "non lus")
+        liste_messages = self.reprise.liste_sauvegardee(code_juridiction) if self.config.reprendre else None
         
-        # Messages non lus ont la classe 'messageNonLu'
-        if messages_non_lus_seulement:
-            messages_tr = soup_messages.find_all('tr', class_='messageNonLu')
-            print(f"   📬 {len(messages_tr)} message(s) NON LU(S) trouvé(s)")
+        if liste_messages is not None:
+            print(f"   ♻️  Reprise : liste de {len(liste_messages)} message(s) sauvegardée lors de l'exécution interrompue")
         else:
-            # Mode test : scraper UNIQUEMENT les messages lus
-            all_messages = soup_messages.find_all('tr', class_='tableListeTrR2')
-            messages_lus = [tr for tr in all_messages if 'messageNonLu' not in tr.get('class', [])]
-            messages_tr = messages_lus
-            print(f"   📖 {len(messages_lus)} message(s) LUS trouvé(s) (mode test)")
+            liste_messages = await self._lister_messages(
+                crawler,
+                result_messages,
+                code_juridiction,
+                messages_non_lus_seulement,
+                max_messages
+            )
+            self.reprise.sauvegarder_liste(code_juridiction, liste_messages)
         
-        if not messages_tr:
-            print(" Aucun message")
-            return []
+        if not liste_messages:
+            print(" Aucun nouveau message")
+            self.reprise.fin_juridiction(code_juridiction)
+            return 0
         
-        messages_tr = messages_tr[:max_messages]
-        print(f"   Traitement de {len(messages_tr)} message(s)")
+        print(f"   Traitement de {len(liste_messages)} message(s)")
         
-        # Parser les messages
-        liste_messages = []
-        
-        for i, tr in enumerate(messages_tr, 1):
-            tds = tr.find_all('td')
-            
-            # Structure : [0]=icône, [1]=expéditeur, [2]=dossier, [3]=objet, [4]=rapporteur, [5]=date
-            if len(tds) >= 6:
-                statut = 'non_lu' if 'messageNonLu' in tr.get('class', []) else 'lu'
-                expediteur = tds[1].get_text(strip=True)
-                dossier = tds[2].get_text(strip=True)
-                
-                link_msg = tds[3].find('a', class_='numMessage')
-                if link_msg:
-                    objet = link_msg.get_text(strip=True)
-                    onclick = link_msg.get('onclick', '')
-                    
-                    match_msg = re.search(r"lireMessage\('([^']+)',\s*'([^']+)'\)", onclick)
-                    
-                    if match_msg:
-                        msg_id = match_msg.group(1)
-                        msg_type = match_msg.group(2)
-                    else:
-                        continue
-                else:
-                    continue
-                
-                rapporteur = tds[4].get_text(strip=True)
-                date = tds[5].get_text(strip=True)
-                
-                # Normaliser l'objet selon les règles métier
-                objet_normalise = normaliser_objet(objet)
-                
-                liste_messages.append({
-                    'index': i,
-                    'msg_id': msg_id,
-                    'msg_type': msg_type,
-                    'statut': statut,
-                    'expediteur': expediteur,
-                    'dossier': dossier,
-                    'objet': objet_normalise,
-                    'objet_original': objet,  # Conserver l'objet original pour référence
-                    'rapporteur': rapporteur,
-                    'date': date
-                })
+        self.reprise.debut_juridiction(code_juridiction)
+        termines = self.reprise.ids_messages_termines(code_juridiction) if self.config.reprendre else set()
+        if termines:
+            print(f"   ♻️  {len(termines)} message(s) déjà terminé(s) avant l'interruption")
         
         # Lire chaque message et télécharger les PDFs
-        messages_details = []
         dossier_pdfs = str(self.config.get_pdfs_dir(code_juridiction).absolute())
+        self._url_detail = None  # Détail actuellement affiché dans le navigateur
+        # Un échec de navigation directe ne vaut que pour la juridiction où il s'est produit
+        self._lire_depuis_detail_possible = None
+        self.replis_telechargement = 0
+        self.nb_messages_sortie = 0
+        
+        # NDJSON : chaque message est écrit dès qu'il est terminé
+        fichier_sortie = chemin_sortie(self.config, code_juridiction)
+        # --pdfs-inline : contenu base64 encodé par blocs depuis les blobs à l'écriture
+        magasin_sortie = self.blobs if self.config.pdfs_inline else None
+        ecrivain = EcrivainNdjson(fichier_sortie, magasin_sortie) if self.config.format_sortie == 'ndjson' else None
+        # JSON : messages gardés (sans contenu) jusqu'à l'écriture du tableau
+        messages_details = [] if ecrivain is None else None
+        
+        try:
+            await self._traiter_messages(
+                crawler, code_juridiction, liste_messages, termines,
+                result_messages.url, dossier_pdfs, messages_details, ecrivain
+            )
+        finally:
+            if ecrivain is not None:
+                ecrivain.fermer()
+        
+        # Revenir à la liste une seule fois, après le dernier message
+        if self._url_detail is not None:
+            await self._retour_liste(crawler, self._url_detail)
+            self._url_detail = None
+        
+        # Sauvegarde
+        juridiction_dir = self.config.get_juridiction_dir(code_juridiction)
+        
+        # JSON (format historique : tableau complet écrit en fin de juridiction)
+        if ecrivain is None:
+            ecrire_tableau_json(messages_details, fichier_sortie, magasin_sortie)
+        self.reprise.fin_juridiction(code_juridiction)
+        
+        # HTML individuels (désactivé car non nécessaire)
+        # for msg in messages_details:
+        #     save_html(
+        #         msg['html_complet'],
+        #         juridiction_dir / f"message_{msg['msg_id']}.html"
+        #     )
+        
+        # Résumé
+        nb_pdfs = compte_pdfs_dossier(self.config.get_pdfs_dir(code_juridiction))
+        taille_pdfs = taille_dossier_pdfs(self.config.get_pdfs_dir(code_juridiction))
+        
+        print(f"\n Résultats sauvegardés:")
+        print(f"   Fichier: {fichier_sortie}")
+        print(f"   Messages: {self.nb_messages_sortie}")
+        print(f"   PDFs: {nb_pdfs} ({taille_pdfs:.1f} Mo)")
+        if self.replis_telechargement:
+            print(f"   Téléchargements de secours (navigateur): {self.replis_telechargement}")
+        
+        return self.nb_messages_sortie
+    
+    def _conserver_message(
+        self,
+        msg: Dict,
+        messages_details: Optional[List[Dict]],
+        ecrivain: Optional[EcrivainNdjson]
+    ):
+        """Enregistre un message terminé dans la sortie
+        
+        NDJSON : le message est écrit sur le disque immédiatement et seul le compteur
+        nb_messages_sortie avance. JSON : il est conservé jusqu'à l'écriture du tableau
+        en fin de juridiction, avec les seules empreintes des PDFs (sans_contenu écarte
+        le base64 des messages repris d'une ancienne exécution).
+        """
+        self.nb_messages_sortie += 1
+        if ecrivain is not None:
+            ecrivain.ecrire(msg)
+        else:
+            messages_details.append(sans_contenu(msg))
+    
+    async def _traiter_messages(
+        self,
+        crawler: AsyncWebCrawler,
+        code_juridiction: str,
+        liste_messages: List[Dict],
+        termines: Set[str],
+        url_liste: str,
+        dossier_pdfs: str,
+        messages_details: Optional[List[Dict]],
+        ecrivain: Optional[EcrivainNdjson]
+    ):
+        """Lit chaque message, télécharge ses PDFs, l'enregistre et l'envoie au webhook"""
         
         for msg in liste_messages:
+            if msg['msg_id'] in termines:
+                msg_termine = self.reprise.message_termine(code_juridiction, msg['msg_id'])
+                if msg_termine is not None:
+                    self._conserver_message(msg_termine, messages_details, ecrivain)
+                    continue
+            
             print(f"\n Message {msg['index']}/{len(liste_messages)}: {msg['objet'][:50]}...")
             
-            # Lire le message
-            js_lire = f"""
-            await new Promise(resolve => setTimeout(resolve, 500));
-            if (typeof lireMessage === 'function') {{
-                lireMessage('{msg['msg_id']}', '{msg['msg_type']}');
-            }}
-            """
-            
-            config_lire = CrawlerRunConfig(
-                session_id=self.config.session_id,
-                js_code=js_lire,
-                js_only=True,
-                wait_for="css:#divEnteteMsg",
-                page_timeout=self.config.page_timeout,
-                cache_mode=0,
-                verbose=False
-            )
+            # Lire le message : HTTP direct si le postback est appris, sinon navigateur
+            lu = None
+            if self.lecteur_http is not None:
+                lu = await self.lecteur_http.lire_message(msg['msg_id'], msg['msg_type'], msg['dossier'])
+            via_http = lu is not None
             
-            result_detail = await crawler.arun(url=result_messages.url, config=config_lire)
+            if not via_http:
+                lu = await self._lire_message_navigateur(crawler, url_liste, msg)
             
-            if not result_detail.success:
+            if lu is None:
                 continue
             
+            html_detail, url_detail = lu
+            
             # Télécharger les PDFs
-            fichiers = await self.telecharger_pdfs_message(
+            fichiers, nb_echecs = await self.telecharger_pdfs_message(
                 crawler=crawler,
-                html_message=result_detail.html,
+                html_message=html_detail,
                 msg_id=msg['msg_id'],
                 dossier_pdfs=dossier_pdfs,
-                url_actuelle=result_detail.url,
+                url_actuelle=url_detail,
                 objet_normalise=msg['objet'],
                 dossier_complet=msg['dossier'],
-                date_message=msg['date']
+                date_message=msg['date'],
+                via_http=via_http
             )
             
             msg['fichiers_telecharges'] = fichiers
+            if nb_echecs:
+                msg['pdfs_en_echec'] = nb_echecs
             
             # Vérifier s'il y a des PDFs supplémentaires (autres que courrier envoyé et accusés)
             pdfs_supplementaires = [f for f in fichiers if f['type'] == 'href_direct']
@@ -576,56 +1108,22 @@ class MessageScraper:
             # Ne pas inclure le HTML complet dans le JSON (trop volumineux)
             # msg['html_complet'] = result_detail.cleaned_html
             
-            messages_details.append(msg)
+            self._conserver_message(msg, messages_details, ecrivain)
             
-            # Envoyer immédiatement ce message au webhook si configuré
-            if self.config.webhook_url:
-                await self.envoyer_message_webhook(msg, code_juridiction)
+            # Pièce manquante : le message reste à extraire à la prochaine exécution
+            # (ni indexé, ni livré : la clé d'idempotence écarterait la version complète)
+            if nb_echecs:
+                print(f"      ⚠️  {nb_echecs} PDF(s) en échec : message à reprendre à la prochaine exécution")
+                continue
             
-            # Retour à la liste
-            js_retour = """
-            await new Promise(resolve => setTimeout(resolve, 500));
-            const btnRetour = document.querySelector('#btRetour');
-            if (btnRetour) btnRetour.click();
-            await new Promise(resolve => setTimeout(resolve, 1000));
-            """
-            
-            config_retour = CrawlerRunConfig(
-                session_id=self.config.session_id,
-                js_code=js_retour,
-                js_only=True,
-                wait_for="js:() => document.querySelector('#divEnteteMsg') === null",
-                page_timeout=15000,
-                cache_mode=0,
-                verbose=False
-            )
+            if self.index is not None:
+                self.index.marquer_extrait(code_juridiction, msg['msg_id'], msg['objet_original'], msg['date'])
             
-            await crawler.arun(url=result_detail.url, config=config_retour)
-            await asyncio.sleep(1)
-        
-        # Sauvegarde
-        juridiction_dir = self.config.get_juridiction_dir(code_juridiction)
-        
-        # JSON
-        save_json(messages_details, juridiction_dir / f"messages_{code_juridiction}.json")
-        
-        # HTML individuels (désactivé car non nécessaire)
-        # for msg in messages_details:
-        #     save_html(
-        #         msg['html_complet'],
-        #         juridiction_dir / f"message_{msg['msg_id']}.html"
-        #     )
-        
-        # Résumé
-        nb_pdfs = compte_pdfs_dossier(self.config.get_pdfs_dir(code_juridiction))
-        taille_pdfs = taille_dossier_pdfs(self.config.get_pdfs_dir(code_juridiction))
-        
-        print(f"\n Résultats sauvegardés:")
-        print(f"   Dossier: {juridiction_dir}")
-        print(f"   Messages: {len(messages_details)}")
-        print(f"   PDFs: {nb_pdfs} ({taille_pdfs:.1f} Mo)")
-        
-        return messages_details
+            # Livrer ce message au webhook en arrière-plan si configuré
+            if self.webhook is not None:
+                await self.envoyer_message_webhook(msg, code_juridiction)
+            
+            self.reprise.sauvegarder_message(code_juridiction, msg)
 
 
 async def scrape_juridiction(
@@ -660,19 +1158,23 @@ async def scrape_juridiction(
     scraper = MessageScraper(config, {})
     
     # Scraper les messages
-    messages = await scraper.scraper_tous_messages(
-        crawler=crawler,
-        code_juridiction=juridiction.code,
-        messages_non_lus_seulement=True,
-        max_messages=100
-    )
+    try:
+        nb_messages = await scraper.scraper_tous_messages(
+            crawler=crawler,
+            code_juridiction=juridiction.code,
+            messages_non_lus_seulement=True,
+            max_messages=100
+        )
+    finally:
+        await scraper.fermer()
     
-    # Chemin du fichier JSON de sortie
-    output_file = config.get_juridiction_dir(juridiction.code) / f"messages_{juridiction.code}.json"
+    # Chemin du fichier de sortie (NDJSON ou JSON selon config.format_sortie)
+    output_file = chemin_sortie(config, juridiction.code)
     
+    # Messages relus depuis la sortie : seul ce wrapper a besoin de la liste complète
     return {
         'success': True,
-        'messages': messages,
+        'messages': [sans_contenu(msg) for msg in lire_messages(output_file)] if nb_messages and output_file.exists() else [],
         'output_file': str(output_file) if output_file.exists() else None,
-        'nb_messages': len(messages) if messages else 0
+        'nb_messages': nb_messages
     }
\ No newline at end of file
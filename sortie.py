@@ -0,0 +1,110 @@
+"""
+Fichiers de sortie des messages extraits
+
+Format par défaut : NDJSON (un message JSON par ligne), écrit au fil de l'eau.
+Chaque message est disponible dès qu'il est terminé et la mémoire utilisée ne
+dépend pas du nombre de messages. Le format historique (tableau JSON indenté,
+écrit en fin de juridiction) reste disponible avec format_sortie='json'.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from blobs import MagasinBlobs
+from config import TelecoursConfig
+from utils import save_json
+
+
+FORMATS_SORTIE = ('ndjson', 'json')
+
+
+def chemin_sortie(config: TelecoursConfig, code_juridiction: str) -> Path:
+    """Fichier de sortie d'une juridiction (extractions/<TA>/messages_<TA>.ndjson ou .json)"""
+    extension = 'ndjson' if config.format_sortie == 'ndjson' else 'json'
+    return config.get_juridiction_dir(code_juridiction) / f"messages_{code_juridiction}.{extension}"
+
+
+def lire_messages(chemin: Path) -> Iterator[Dict]:
+    """Relit un fichier de sortie, NDJSON ou tableau JSON selon l'extension
+
+    En NDJSON, une dernière ligne incomplète (exécution en cours ou interrompue) est ignorée.
+    """
+    if chemin.suffix == '.ndjson':
+        with open(chemin, 'r', encoding='utf-8') as f:
+            for ligne in f:
+                if not ligne.endswith('\n'):
+                    break
+                if ligne.strip():
+                    yield json.loads(ligne)
+        return
+
+    with open(chemin, 'r', encoding='utf-8') as f:
+        yield from json.load(f)
+
+
+class EcrivainNdjson:
+    """Écriture en ajout d'un message par ligne, vidée sur le disque après chaque message
+
+    Avec un magasin (--pdfs-inline), le contenu base64 des PDFs est encodé par
+    blocs depuis les blobs pendant l'écriture de la ligne.
+    """
+
+    def __init__(self, chemin: Path, magasin: Optional[MagasinBlobs] = None):
+        self.chemin = chemin
+        self.magasin = magasin
+        self.nb_messages = 0
+        self._fichier = open(chemin, 'w', encoding='utf-8')
+
+    def ecrire(self, message: Dict):
+        """Ajoute un message terminé au fichier"""
+        if self.magasin is None:
+            self._fichier.write(json.dumps(message, ensure_ascii=False))
+        else:
+            for bloc in self.magasin.json_par_blocs(message):
+                self._fichier.write(bloc)
+        self._fichier.write('\n')
+        self._fichier.flush()
+        self.nb_messages += 1
+
+    def fermer(self):
+        """Ferme le fichier"""
+        if not self._fichier.closed:
+            self._fichier.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+
+def ecrire_tableau_json(messages: List[Dict], chemin: Path, magasin: Optional[MagasinBlobs] = None):
+    """Format historique : tableau JSON de tous les messages, écrit en fin de juridiction
+
+    Avec un magasin (--pdfs-inline), chaque message est écrit à la suite avec le
+    contenu base64 de ses PDFs encodé par blocs.
+    """
+    if magasin is None:
+        save_json(messages, chemin)
+        return
+
+    with open(chemin, 'w', encoding='utf-8') as f:
+        f.write('[\n')
+        for i, message in enumerate(messages):
+            if i:
+                f.write(',\n')
+            for bloc in magasin.json_par_blocs(message):
+                f.write(bloc)
+        f.write('\n]')
+
+
+def sans_contenu(message: Dict) -> Dict:
+    """Copie d'un message sans le contenu base64 des PDFs (résumé gardé en mémoire)"""
+    return {
+        **message,
+        'fichiers_telecharges': [
+            {cle: valeur for cle, valeur in fichier.items() if cle != 'contenu_base64'}
+            for fichier in message.get('fichiers_telecharges', [])
+        ]
+    }
@@ -0,0 +1,94 @@
+"""
+Module de téléchargement HTTP direct des PDFs
+Réutilise les cookies de session capturés par TelecoursAuth (sans passer par le navigateur)
+"""
+
+import asyncio
+from typing import Dict, Optional
+import aiohttp
+
+from config import TelecoursConfig
+
+
+class TelechargeurPdf:
+    """Téléchargeur HTTP asynchrone (pool keep-alive, concurrence bornée)"""
+
+    def __init__(self, config: TelecoursConfig, cookies: Dict[str, str]):
+        self.config = config
+        self.cookies = cookies  # Même dict que TelecoursAuth.cookies (mis à jour par le hook)
+        self.session_rejetee = False
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore = asyncio.Semaphore(config.http_max_connexions)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Crée (une seule fois) la session HTTP partagée"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.config.http_max_connexions,
+                limit_per_host=self.config.http_max_connexions_par_hote,
+                keepalive_timeout=30
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                # Les cookies sont envoyés à chaque requête depuis self.cookies
+                cookie_jar=aiohttp.DummyCookieJar(),
+                timeout=aiohttp.ClientTimeout(total=self.config.http_timeout)
+            )
+        return self._session
+
+    def _get_headers(self) -> Dict[str, str]:
+        """En-têtes de la requête (cookies de session à jour)"""
+        return {
+            'Cookie': '; '.join(f"{nom}={valeur}" for nom, valeur in self.cookies.items()),
+            'Referer': self.config.base_url
+        }
+
+    async def telecharger(self, url: str) -> Optional[bytes]:
+        """Télécharge un PDF
+
+        Args:
+            url: URL absolue du PDF (ex: https://.../telecharger/<id>/fichier.pdf)
+
+        Returns:
+            bytes: Contenu du PDF, ou None si échec (le navigateur prend alors le relais)
+        """
+        if self.session_rejetee or not self.cookies:
+            return None
+
+        async with self._semaphore:
+            try:
+                session = self._get_session()
+                async with session.get(url, headers=self._get_headers(), allow_redirects=False) as response:
+                    # Redirection vers la page de login ou accès refusé : session expirée
+                    if response.status in (301, 302, 303, 307, 401, 403):
+                        self._rejeter_session(response.status)
+                        return None
+
+                    if response.status != 200:
+                        print(f"         ⚠️  HTTP {response.status} pour {url.split('/')[-1]}")
+                        return None
+
+                    contenu = await response.read()
+
+                # Une page HTML à la place du PDF signifie que la session n'est plus valide
+                if not contenu.startswith(b'%PDF'):
+                    self._rejeter_session(response.status)
+                    return None
+
+                return contenu
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"         ⚠️  Erreur HTTP {url.split('/')[-1]}: {e}")
+                return None
+
+    def _rejeter_session(self, status: int):
+        """Désactive le téléchargement HTTP pour le reste de l'exécution"""
+        if not self.session_rejetee and self.config.verbose:
+            print(f"         ⚠️  Session refusée en HTTP ({status}), bascule sur le navigateur")
+        self.session_rejetee = True
+
+    async def fermer(self):
+        """Ferme le pool de connexions"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,23 @@
+"""
+Configuration pytest : les modules du scraper sont à la racine du dépôt
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import TelecoursConfig  # noqa: E402
+
+
+@pytest.fixture
+def config(tmp_path) -> TelecoursConfig:
+    """Configuration dont tous les dossiers sont dans un répertoire temporaire"""
+    return TelecoursConfig(
+        output_dir=tmp_path / "extractions",
+        pdfs_dir=tmp_path / "pdfs",
+        blobs_dir=tmp_path / "extractions" / "blobs",
+        webhook_boite_envoi=tmp_path / "extractions" / "boite_envoi.sqlite"
+    )
@@ -0,0 +1,88 @@
+"""
+Tests du magasin des PDFs adressé par contenu (blobs.py)
+"""
+
+import base64
+import hashlib
+import json
+
+from blobs import TAILLE_BLOC, MagasinBlobs
+
+
+def test_stocker_sans_doublon(tmp_path):
+    magasin = MagasinBlobs(tmp_path)
+    contenu = b"%PDF-1.4 courrier"
+
+    blob = magasin.stocker(contenu)
+    assert blob == {'sha256': hashlib.sha256(contenu).hexdigest(), 'taille': len(contenu)}
+    assert magasin.stocker(contenu) == blob
+    assert magasin.lire(blob['sha256']) == contenu
+    assert magasin.chemin(blob['sha256']).parent.name == blob['sha256'][:2]
+    assert len(list(tmp_path.rglob('*.pdf'))) == 1
+
+
+def test_importer_deplace_le_fichier(tmp_path):
+    magasin = MagasinBlobs(tmp_path / "blobs")
+    source = tmp_path / "telechargement.pdf"
+    source.write_bytes(b"%PDF-1.4 accuse")
+
+    blob = magasin.importer(source)
+
+    assert not source.exists()
+    assert magasin.lire(blob['sha256']) == b"%PDF-1.4 accuse"
+
+    # Déjà présent : le fichier téléchargé est simplement supprimé
+    source.write_bytes(b"%PDF-1.4 accuse")
+    assert magasin.importer(source) == blob
+    assert not source.exists()
+
+
+def test_base64_par_blocs_concatenables(tmp_path):
+    magasin = MagasinBlobs(tmp_path)
+    # Plusieurs blocs, dernier bloc incomplet (taille non multiple de 3)
+    contenu = bytes(range(256)) * (TAILLE_BLOC * 2 // 256) + b"fin"
+    blob = magasin.stocker(contenu)
+
+    blocs = list(magasin.base64_par_blocs(blob['sha256']))
+
+    assert len(blocs) == 3
+    assert all('=' not in bloc for bloc in blocs[:-1])
+    assert base64.b64decode(''.join(blocs)) == contenu
+
+
+def test_json_par_blocs(tmp_path):
+    magasin = MagasinBlobs(tmp_path)
+    contenu = b"x" * (TAILLE_BLOC + 1)
+    blob = magasin.stocker(contenu)
+    message = {
+        'msg_id': '1',
+        'objet': "Avis d'audience",
+        'fichiers_telecharges': [
+            {'nom_fichier': 'a.pdf', **blob},
+            {'nom_fichier': 'b.pdf', 'contenu_base64': 'JVBE'},
+        ]
+    }
+
+    resultat = json.loads(''.join(magasin.json_par_blocs(message)))
+
+    avec_blob, deja_inline = resultat['fichiers_telecharges']
+    assert base64.b64decode(avec_blob['contenu_base64']) == contenu
+    assert deja_inline['contenu_base64'] == 'JVBE'
+    assert resultat['objet'] == "Avis d'audience"
+
+    # Sans empreinte, même JSON que json.dumps
+    sans_pdf = {'msg_id': '2', 'liste': [1, None, True], 'objet': 'Décision'}
+    assert json.loads(''.join(magasin.json_par_blocs(sans_pdf))) == sans_pdf
+
+
+def test_corps_json(tmp_path):
+    magasin = MagasinBlobs(tmp_path)
+    blob = magasin.stocker(b"y" * (TAILLE_BLOC * 2))
+    payload = {'message': {'fichiers_telecharges': [blob]}}
+
+    morceaux = list(magasin.corps_json(payload))
+
+    assert len(morceaux) > 1
+    assert all(isinstance(morceau, bytes) for morceau in morceaux)
+    fichier, = json.loads(b''.join(morceaux))['message']['fichiers_telecharges']
+    assert base64.b64decode(fichier['contenu_base64']) == b"y" * (TAILLE_BLOC * 2)
@@ -0,0 +1,104 @@
+"""
+Tests de la boîte d'envoi persistante du webhook (boite_envoi.py)
+"""
+
+import time
+
+from boite_envoi import BoiteEnvoi, cle_idempotence, cle_lot
+
+
+def boite(tmp_path, **kwargs) -> BoiteEnvoi:
+    return BoiteEnvoi(tmp_path / "boite_envoi.sqlite", **kwargs)
+
+
+def test_cles_stables():
+    assert cle_idempotence('TA75', '1') == cle_idempotence('TA75', '1')
+    assert cle_idempotence('TA75', '1') != cle_idempotence('TA78', '1')
+    assert cle_lot(['a', 'b']) == cle_lot(['b', 'a'])
+    assert cle_lot(['a', 'b']) != cle_lot(['a'])
+
+
+def test_reservation(tmp_path):
+    envois = boite(tmp_path)
+    maintenant = time.time()
+    envois.deposer('a', 'TA75', '1', {'message': {'msg_id': '1'}}, reserve_jusqua=maintenant - 1)
+    envois.deposer('b', 'TA75', '2', {'message': {'msg_id': '2'}}, reserve_jusqua=maintenant + 60)
+
+    # Seul l'envoi échu est réservé, une seule fois
+    assert envois.reserver_echus(maintenant + 60, limite=10) == ['a']
+    assert envois.reserver_echus(maintenant + 60, limite=10) == []
+    assert envois.lire('a') == {
+        'code_juridiction': 'TA75', 'msg_id': '1', 'payload': {'message': {'msg_id': '1'}}, 'tentatives': 0
+    }
+    envois.fermer()
+
+
+def test_reservation_partagee_entre_workers(tmp_path):
+    premier, second = boite(tmp_path), boite(tmp_path)
+    premier.deposer('a', 'TA75', '1', {}, reserve_jusqua=time.time() - 1)
+
+    assert premier.reserver_echus(time.time() + 60, limite=10) == ['a']
+    assert second.reserver_echus(time.time() + 60, limite=10) == []
+    premier.fermer()
+    second.fermer()
+
+
+def test_acquitter(tmp_path):
+    envois = boite(tmp_path)
+    envois.deposer('a', 'TA75', '1', {}, reserve_jusqua=time.time())
+    envois.acquitter('a')
+
+    assert envois.lire('a') is None
+    assert envois.nb_en_attente() == 0
+    assert envois.prochaine_relance() is None
+    envois.fermer()
+
+
+def test_backoff_exponentiel_plafonne(tmp_path):
+    envois = boite(tmp_path, backoff_initial=2.0, backoff_max=10.0)
+    envois.deposer('a', 'TA75', '1', {}, reserve_jusqua=time.time())
+
+    delais = [envois.reprogrammer('a', 'HTTP 503') for _ in range(5)]
+
+    # 2, 4, 8, puis plafond 10 (à ±20 % d'aléa près)
+    for delai, attendu in zip(delais, (2, 4, 8, 10, 10)):
+        assert attendu * 0.8 <= delai <= attendu * 1.2
+    assert envois.lire('a')['tentatives'] == 5
+    assert envois.prochaine_relance() > time.time()
+    envois.fermer()
+
+
+def test_rejeter(tmp_path):
+    envois = boite(tmp_path)
+    envois.deposer('a', 'TA75', '1', {'message': {}}, reserve_jusqua=time.time() - 1)
+    envois.rejeter('a', 'HTTP 400')
+
+    # Conservé pour diagnostic, mais plus jamais relancé
+    assert envois.lire('a') is not None
+    assert envois.nb_en_attente() == 0
+    assert envois.prochaine_relance() is None
+    assert envois.reserver_echus(time.time() + 60, limite=10) == []
+    envois.fermer()
+
+
+def test_redepot_remet_a_livrer(tmp_path):
+    envois = boite(tmp_path)
+    envois.deposer('a', 'TA75', '1', {'version': 1}, reserve_jusqua=time.time())
+    envois.rejeter('a', 'HTTP 400')
+    envois.deposer('a', 'TA75', '1', {'version': 2}, reserve_jusqua=time.time() - 1)
+
+    assert envois.lire('a')['payload'] == {'version': 2}
+    assert envois.lire('a')['tentatives'] == 0
+    assert envois.nb_en_attente() == 1
+    envois.fermer()
+
+
+def test_persistance(tmp_path):
+    envois = boite(tmp_path)
+    envois.deposer('a', 'TA75', '1', {}, reserve_jusqua=time.time() - 1)
+    envois.fermer()
+
+    # Exécution suivante : l'envoi non acquitté est relancé
+    envois = boite(tmp_path)
+    assert envois.reserver_echus(time.time() + 60, limite=10) == ['a']
+    envois.fermer()
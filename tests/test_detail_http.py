@@ -0,0 +1,153 @@
+"""
+Tests de la lecture HTTP des messages (detail_http.py) contre le serveur simulé
+"""
+
+import asyncio
+from pathlib import Path
+from urllib.parse import urlencode
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+from detail_http import LecteurMessagesHttp
+from mock_telerecours import (
+    CIBLE_JURIDICTION, CIBLE_LIRE, CIBLE_ONGLET, URL_ACCUEIL, URL_LOGIN, URL_SELECTION, ServeurTelerecoursSimule
+)
+
+RACINE = Path(__file__).resolve().parent.parent
+
+
+class RequeteCapturee:
+    """Requête POST telle que Playwright la remet au listener 'request'"""
+
+    def __init__(self, url: str, post_data: str):
+        self.method = 'POST'
+        self.resource_type = 'document'
+        self.url = url
+        self.post_data = post_data
+        self.headers = {'content-type': 'application/x-www-form-urlencoded', 'cookie': 'ignoré'}
+
+
+class PageSimulee:
+    """Page réduite aux listeners utilisés par LecteurMessagesHttp.apprendre"""
+
+    def __init__(self):
+        self.listeners = []
+
+    def on(self, evenement, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, evenement, listener):
+        self.listeners.remove(listener)
+
+    def emettre(self, requete):
+        for listener in self.listeners:
+            listener(requete)
+
+
+def champs_formulaire(html: str) -> list:
+    soup = BeautifulSoup(html, 'lxml')
+    return [(champ['name'], champ.get('value', '')) for champ in soup.select('form#form1 input[type=hidden]')]
+
+
+async def ouvrir_liste(session: aiohttp.ClientSession, url: str, code: str) -> str:
+    """Login, sélection de la juridiction et onglet Messages : HTML de la liste"""
+    await session.post(url + URL_LOGIN, data={'Username': 'avocat', 'Password': 'secret'})
+    await session.post(url + URL_SELECTION, data={'__EVENTTARGET': CIBLE_JURIDICTION, '__EVENTARGUMENT': code})
+    async with session.get(url + URL_ACCUEIL) as response:
+        accueil = await response.text()
+    champs = dict(champs_formulaire(accueil), __EVENTTARGET=CIBLE_ONGLET, __EVENTARGUMENT='Messages')
+    async with session.post(url + URL_ACCUEIL, data=champs) as response:
+        return await response.text()
+
+
+async def apprendre_deux_messages(config, serveur, nb_lus: int = 2):
+    """Lecteur ayant appris le postback sur les deux premiers messages de TA44"""
+    url = await serveur.demarrer()
+    session = aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar(unsafe=True))
+    liste = await ouvrir_liste(session, url, 'TA44')
+
+    cookies = {morsel.key: morsel.value for morsel in session.cookie_jar}
+    lecteur = LecteurMessagesHttp(config, cookies)
+    page = PageSimulee()
+
+    for msg in serveur.juridictions['TA44'][:nb_lus]:
+        champs = dict(
+            champs_formulaire(liste),
+            __EVENTTARGET=CIBLE_LIRE, __EVENTARGUMENT=f"{msg.msg_id}|{msg.modele.msg_type}"
+        )
+        async with lecteur.apprendre(page, msg.msg_id, msg.modele.msg_type):
+            page.emettre(RequeteCapturee(url + URL_ACCUEIL, urlencode(list(champs.items()))))
+
+    await session.close()
+    return lecteur
+
+
+def serveur_simule() -> ServeurTelerecoursSimule:
+    return ServeurTelerecoursSimule(
+        nb_juridictions=1, messages_par_juridiction=4,
+        pages=str(RACINE / "extractions/*/message_*.html"),
+        captures=str(RACINE / "extractions/*/messages_*.*json")
+    )
+
+
+def test_apprentissage_puis_rejeu(config):
+    async def scenario():
+        serveur = serveur_simule()
+        try:
+            lecteur = await apprendre_deux_messages(config, serveur)
+            assert lecteur.pret
+
+            msg = serveur.juridictions['TA44'][2]
+            lu = await lecteur.lire_message(msg.msg_id, msg.modele.msg_type, msg.modele.dossier)
+            await lecteur.fermer()
+            return serveur, msg, lu, lecteur
+        finally:
+            await serveur.arreter()
+
+    serveur, msg, lu, lecteur = asyncio.run(scenario())
+
+    assert lu is not None
+    html, _ = lu
+    assert 'divEnteteMsg' in html
+    assert msg.modele.dossier.split()[0] in html
+    assert msg.lu
+    assert not lecteur.desactive
+
+
+def test_un_seul_echantillon_ne_suffit_pas(config):
+    async def scenario():
+        serveur = serveur_simule()
+        try:
+            lecteur = await apprendre_deux_messages(config, serveur, nb_lus=1)
+            msg = serveur.juridictions['TA44'][2]
+            return lecteur, await lecteur.lire_message(msg.msg_id, msg.modele.msg_type, msg.modele.dossier)
+        finally:
+            await serveur.arreter()
+
+    lecteur, lu = asyncio.run(scenario())
+
+    assert not lecteur.pret
+    assert lu is None
+
+
+def test_detail_d_un_autre_message_desactive_le_rejeu(config):
+    async def scenario():
+        serveur = serveur_simule()
+        try:
+            lecteur = await apprendre_deux_messages(config, serveur)
+            msg = serveur.juridictions['TA44'][2]
+            lu = await lecteur.lire_message(msg.msg_id, msg.modele.msg_type, "9999999 - Madame Y")
+            suivant = serveur.juridictions['TA44'][3]
+            lu_suivant = await lecteur.lire_message(suivant.msg_id, suivant.modele.msg_type, suivant.modele.dossier)
+            await lecteur.fermer()
+            return lecteur, lu, lu_suivant
+        finally:
+            await serveur.arreter()
+
+    lecteur, lu, lu_suivant = asyncio.run(scenario())
+
+    # Repli sur le navigateur pour ce message et pour le reste de l'exécution
+    assert lu is None
+    assert lu_suivant is None
+    assert lecteur.desactive
@@ -0,0 +1,57 @@
+"""
+Tests de l'index persistant des messages traités (index_messages.py)
+"""
+
+from index_messages import IndexMessages
+
+
+def test_message_extrait_non_retraite(tmp_path):
+    index = IndexMessages(tmp_path / "index.sqlite")
+    index.marquer_extrait('TA75', '8554710', "Avis d'audience", '03/11/2025 16:28')
+
+    assert index.messages_traites('TA75', livraison_requise=False) == {'8554710'}
+    assert index.messages_traites('TA78', livraison_requise=False) == set()
+    index.fermer()
+
+
+def test_livraison_requise(tmp_path):
+    index = IndexMessages(tmp_path / "index.sqlite")
+    index.marquer_extrait('TA75', '1')
+    index.marquer_extrait('TA75', '2')
+    index.marquer_livre('TA75', '2')
+
+    # Avec un webhook, un message extrait mais non livré est retraité
+    assert index.messages_traites('TA75', livraison_requise=True) == {'2'}
+    assert index.messages_traites('TA75', livraison_requise=False) == {'1', '2'}
+    index.fermer()
+
+
+def test_livraison_sans_extraction_ignoree(tmp_path):
+    index = IndexMessages(tmp_path / "index.sqlite")
+    index.marquer_livre('TA75', '1')
+
+    assert index.messages_traites('TA75', livraison_requise=True) == set()
+    index.fermer()
+
+
+def test_index_persistant(tmp_path):
+    chemin = tmp_path / "sous_dossier" / "index.sqlite"
+    index = IndexMessages(chemin)
+    index.marquer_extrait('TA93', '42')
+    index.marquer_livre('TA93', '42')
+    index.fermer()
+
+    # Exécution suivante : même fichier, messages toujours connus
+    index = IndexMessages(chemin)
+    assert index.messages_traites('TA93', livraison_requise=True) == {'42'}
+    index.fermer()
+
+
+def test_reextraction_conserve_livraison(tmp_path):
+    index = IndexMessages(tmp_path / "index.sqlite")
+    index.marquer_extrait('TA75', '1', 'Ancien objet')
+    index.marquer_livre('TA75', '1')
+    index.marquer_extrait('TA75', '1', 'Nouvel objet')
+
+    assert index.messages_traites('TA75', livraison_requise=True) == {'1'}
+    index.fermer()
@@ -0,0 +1,94 @@
+"""
+Tests du navigateur (navigateur.py) : téléchargements hors de la racine pdfs/, blocage des domaines
+"""
+
+import asyncio
+from pathlib import Path
+
+from crawl4ai.async_crawler_strategy import AsyncPlaywrightCrawlerStrategy
+
+from navigateur import attendre_telechargement_clic, creer_browser_config, dossier_telechargements, domaine_bloque
+
+PDF = b"%PDF-1.4\n%%EOF\n"
+
+
+class TelechargementSimule:
+    """Download Playwright : fichier temporaire copié par save_as"""
+
+    def __init__(self, nom: str):
+        self.suggested_filename = nom
+
+    async def save_as(self, chemin):
+        Path(chemin).write_bytes(PDF)
+
+    async def delete(self):
+        pass
+
+
+class PageSimulee:
+    """Page dont le clic émet un download, reçu par crawl4ai (page.on) et par l'attente"""
+
+    def __init__(self, strategie: AsyncPlaywrightCrawlerStrategy, nom: str):
+        self.strategie = strategie
+        self.nom = nom
+        self.attentes = []
+
+    async def wait_for_event(self, evenement, predicate=None, timeout=None):
+        attente = asyncio.get_running_loop().create_future()
+        if evenement == 'download':
+            self.attentes.append(attente)
+        return await asyncio.wait_for(attente, timeout / 1000)
+
+    async def evaluate(self, script, selecteur):
+        await asyncio.sleep(0)  # Attentes d'événements armées avant le clic
+        download = TelechargementSimule(self.nom)
+        # Handler installé par crawl4ai quand accept_downloads est actif
+        asyncio.ensure_future(self.strategie._handle_download(download))
+        for attente in self.attentes:
+            attente.set_result(download)
+        return True
+
+
+def test_telechargement_clic_sans_copie_dans_pdfs(config):
+    async def scenario():
+        browser_config = creer_browser_config(config, utiliser_fichier=False)
+        strategie = AsyncPlaywrightCrawlerStrategy(browser_config=browser_config)
+        chemin_final = config.get_pdfs_dir('TA75') / 'accuse.pdf'
+
+        resultat = await attendre_telechargement_clic(
+            PageSimulee(strategie, 'AR_8554710.pdf'), '#ctl00_hplGenFichier1', chemin_final, 1000
+        )
+        await asyncio.sleep(0.05)  # Fin de l'enregistrement crawl4ai
+        return browser_config, resultat, chemin_final
+
+    browser_config, resultat, chemin_final = asyncio.run(scenario())
+
+    assert resultat == chemin_final
+    assert chemin_final.read_bytes() == PDF
+    assert Path(browser_config.downloads_path) == dossier_telechargements(config).absolute()
+    assert list(config.pdfs_dir.glob('*.pdf')) == []
+    # Copie de crawl4ai : dans le dossier de téléchargement de la session
+    assert (dossier_telechargements(config) / 'AR_8554710.pdf').exists()
+
+
+def test_dossier_telechargements_vide_a_la_creation(config):
+    dossier = dossier_telechargements(config)
+    dossier.mkdir(parents=True)
+    (dossier / 'ancien.pdf').write_bytes(PDF)
+
+    creer_browser_config(config, utiliser_fichier=False)
+
+    assert list(dossier.iterdir()) == []
+
+
+def test_domaine_bloque_par_nom_d_hote():
+    domaines = ("google-analytics.com", "xiti.com")
+
+    assert domaine_bloque("https://google-analytics.com/collect", domaines)
+    assert domaine_bloque("https://www.google-analytics.com/g/collect?v=2", domaines)
+    assert domaine_bloque("https://logs1.xiti.com:443/hit.xiti", domaines)
+    # Le domaine n'apparaît que dans le chemin, la requête ou un autre nom d'hôte
+    assert not domaine_bloque("https://www.telerecours.fr/?ref=google-analytics.com", domaines)
+    assert not domaine_bloque("https://www.telerecours.fr/scripts/xiti.com.js", domaines)
+    assert not domaine_bloque("https://evil-google-analytics.com/", domaines)
+    assert not domaine_bloque("data:text/plain,xiti.com", domaines)
@@ -0,0 +1,60 @@
+"""
+Tests de la normalisation des objets de messages (utils.normaliser_objet)
+"""
+
+import pytest
+
+from utils import cle_objet, normaliser_objet
+
+
+@pytest.mark.parametrize("objet, attendu", [
+    ("Avis d'audience", "Avis d'audience"),
+    ("AVIS D’AUDIENCE", "Avis d'audience"),
+    ("Notification de jugement", "Décision"),
+    ("Notification ordonnance L. 522-3 rejet référé d’urgence", "Décision"),
+    ("Communication d'un mémoire en défense", "Mémoire en défense"),
+    ("Notification d'un arrêt", "Demande de régularisation"),
+    ("Accusé de réception de la requête (DALO)", "Dossiers DALO"),
+    ("Avis de radiation", "Avis de radiation"),
+])
+def test_objets_connus(objet, attendu):
+    assert normaliser_objet(objet) == attendu
+
+
+@pytest.mark.parametrize("objet, attendu", [
+    ("Avis d'audience du 12/03/2025", "Avis d'audience"),
+    ("Avis d'audience - 12/03", "Avis d'audience"),
+    ("Notification de jugement n° 2401234", "Décision"),
+    ("Avis de radiation (dossier 2401234)", "Avis de radiation"),
+    # Le plus long objet connu l'emporte
+    ("Avis d'audience (requête en référé) du 03/11/2025", "Avis d'audience"),
+    ("Communication d'un mémoire en défense (référé) 2", "Mémoire en défense"),
+])
+def test_qualificatifs_neutres(objet, attendu):
+    assert normaliser_objet(objet) == attendu
+
+
+def test_faute_de_frappe():
+    assert normaliser_objet("Avis d'audiance") == "Avis d'audience"
+    assert normaliser_objet("Notification de jugemant") == "Décision"
+
+
+@pytest.mark.parametrize("objet", [
+    "Avis d'audience annulé",
+    "Avis de radiation (annulation)",
+    "Avis d'audience (report)",
+    "Communication d'un mémoire en réplique",
+    "Notification d'un arrêt de la cour",
+    "Notification d'un arrêté",
+    "Exe - classement sans suite",
+    "Lettre du greffier en chef",
+    "Notification de jugements",
+    "Objet totalement nouveau",
+    "",
+])
+def test_objets_inconnus(objet):
+    assert normaliser_objet(objet) == "Objet inconnu"
+
+
+def test_cle_objet():
+    assert cle_objet("  Référé   d’urgence ") == "refere d'urgence"
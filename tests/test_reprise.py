@@ -0,0 +1,99 @@
+"""
+Tests des points de reprise d'une exécution interrompue (reprise.py)
+"""
+
+from notifs import JuridictionNotification
+from reprise import PointReprise
+
+
+def juridiction(code: str) -> JuridictionNotification:
+    return JuridictionNotification(code, code, 0, 'ctl00$lvJuridictions', code)
+
+
+def demarrer(config, codes):
+    reprise = PointReprise(config)
+    reprise.demarrer_execution(codes)
+    config.points_reprise = True
+    return reprise
+
+
+def test_sans_execution_demarree_rien_n_est_ecrit(config):
+    # Extraction --juridiction : aucun point de reprise
+    reprise = PointReprise(config)
+    reprise.debut_juridiction('TA93')
+    reprise.sauvegarder_liste('TA93', [{'msg_id': '1'}])
+    reprise.sauvegarder_message('TA93', {'msg_id': '1'})
+    reprise.fin_juridiction('TA93')
+
+    assert not reprise.existe()
+    assert not reprise.dossier.exists()
+
+
+def test_execution_non_demarree_par_ce_processus(config):
+    # Exécution interrompue sur le disque, mais ce mode ne l'a pas reprise
+    demarrer(config, ['TA75', 'TA93'])
+    config.points_reprise = False
+
+    reprise = PointReprise(config)
+    reprise.fin_juridiction('TA93')
+
+    assert reprise._etat()['terminees'] == []
+
+
+def test_juridictions_a_reprendre(config):
+    reprise = demarrer(config, ['TA75', 'TA78', 'TA93'])
+    reprise.debut_juridiction('TA75')
+    reprise.fin_juridiction('TA75')
+    reprise.debut_juridiction('TA93')
+
+    disponibles = [juridiction(code) for code in ('TA75', 'TA78', 'TA93', 'TA95')]
+
+    # En cours d'abord, puis l'ordre initial ; les terminées et les nouvelles sont écartées
+    assert [j.code for j in reprise.juridictions_a_reprendre(disponibles)] == ['TA93', 'TA78']
+
+
+def test_messages_termines(config):
+    reprise = demarrer(config, ['TA75'])
+    reprise.debut_juridiction('TA75')
+    reprise.sauvegarder_liste('TA75', [{'msg_id': '1'}, {'msg_id': '2'}])
+    reprise.sauvegarder_message('TA75', {'msg_id': '1', 'objet': "Avis d'audience"})
+
+    assert reprise.liste_sauvegardee('TA75') == [{'msg_id': '1'}, {'msg_id': '2'}]
+    assert reprise.ids_messages_termines('TA75') == {'1'}
+    assert reprise.message_termine('TA75', '1')['objet'] == "Avis d'audience"
+    assert reprise.message_termine('TA75', '2') is None
+
+
+def test_fin_juridiction_supprime_ses_messages(config):
+    reprise = demarrer(config, ['TA75'])
+    reprise.sauvegarder_message('TA75', {'msg_id': '1'})
+    reprise.fin_juridiction('TA75')
+
+    assert reprise.ids_messages_termines('TA75') == set()
+    assert reprise.liste_sauvegardee('TA75') is None
+    assert reprise._etat()['terminees'] == ['TA75']
+
+
+def test_message_illisible_ignore(config):
+    reprise = demarrer(config, ['TA75'])
+    (reprise.dossier / 'TA75').mkdir(parents=True)
+    (reprise.dossier / 'TA75' / '1.json').write_text('{"msg_id": ', encoding='utf-8')
+
+    assert reprise.message_termine('TA75', '1') is None
+
+
+def test_nouvelle_execution_efface_la_precedente(config):
+    reprise = demarrer(config, ['TA75'])
+    reprise.sauvegarder_message('TA75', {'msg_id': '1'})
+    reprise.demarrer_execution(['TA78'])
+
+    assert reprise.ids_messages_termines('TA75') == set()
+    assert reprise._etat()['juridictions'] == ['TA78']
+
+
+def test_terminer_execution(config):
+    reprise = demarrer(config, ['TA75'])
+    reprise.terminer_execution()
+
+    assert not reprise.existe()
+    assert not reprise.actif
@@ -0,0 +1,102 @@
+"""
+Tests des fichiers de sortie NDJSON et JSON (sortie.py, MessageScraper._conserver_message)
+"""
+
+import json
+
+from blobs import MagasinBlobs
+from scraper_messages import MessageScraper
+from sortie import EcrivainNdjson, chemin_sortie, ecrire_tableau_json, lire_messages, sans_contenu
+
+
+MESSAGES = [
+    {'msg_id': '1', 'objet': "Avis d'audience", 'fichiers_telecharges': []},
+    {'msg_id': '2', 'objet': 'Décision', 'fichiers_telecharges': []},
+]
+
+
+def test_ndjson_un_message_par_ligne(tmp_path):
+    chemin = tmp_path / "messages_TA75.ndjson"
+    with EcrivainNdjson(chemin) as ecrivain:
+        for message in MESSAGES:
+            ecrivain.ecrire(message)
+
+    lignes = chemin.read_text(encoding='utf-8').splitlines()
+    assert [json.loads(ligne) for ligne in lignes] == MESSAGES
+    assert ecrivain.nb_messages == 2
+    assert list(lire_messages(chemin)) == MESSAGES
+
+
+def test_ndjson_lisible_pendant_l_ecriture(tmp_path):
+    chemin = tmp_path / "messages_TA75.ndjson"
+    ecrivain = EcrivainNdjson(chemin)
+    ecrivain.ecrire(MESSAGES[0])
+
+    # Chaque message est vidé sur le disque dès son écriture
+    assert list(lire_messages(chemin)) == MESSAGES[:1]
+    ecrivain.fermer()
+
+
+def test_ndjson_derniere_ligne_incomplete_ignoree(tmp_path):
+    chemin = tmp_path / "messages_TA75.ndjson"
+    chemin.write_text(json.dumps(MESSAGES[0]) + '\n\n{"msg_id": "2", "obj', encoding='utf-8')
+
+    assert list(lire_messages(chemin)) == MESSAGES[:1]
+
+
+def test_tableau_json(tmp_path):
+    chemin = tmp_path / "messages_TA75.json"
+    ecrire_tableau_json(MESSAGES, chemin)
+
+    assert list(lire_messages(chemin)) == MESSAGES
+
+
+def test_pdfs_inline(tmp_path):
+    magasin = MagasinBlobs(tmp_path / "blobs")
+    blob = magasin.stocker(b"%PDF-1.4 contenu")
+    message = {'msg_id': '1', 'fichiers_telecharges': [{'nom_fichier': 'a.pdf', **blob}]}
+
+    chemin_ndjson = tmp_path / "messages_TA75.ndjson"
+    with EcrivainNdjson(chemin_ndjson, magasin) as ecrivain:
+        ecrivain.ecrire(message)
+    chemin_json = tmp_path / "messages_TA75.json"
+    ecrire_tableau_json([message], chemin_json, magasin)
+
+    for chemin in (chemin_ndjson, chemin_json):
+        fichier, = next(lire_messages(chemin))['fichiers_telecharges']
+        assert fichier['contenu_base64'] == 'JVBERi0xLjQgY29udGVudQ=='
+        assert fichier['sha256'] == blob['sha256']
+
+
+def test_chemin_sortie(config):
+    assert chemin_sortie(config, 'TA75').name == 'messages_TA75.ndjson'
+    config.format_sortie = 'json'
+    assert chemin_sortie(config, 'TA75').name == 'messages_TA75.json'
+
+
+def test_sans_contenu():
+    message = {'msg_id': '1', 'fichiers_telecharges': [{'sha256': 'ab', 'contenu_base64': 'JVBE'}]}
+
+    assert sans_contenu(message)['fichiers_telecharges'] == [{'sha256': 'ab'}]
+    assert message['fichiers_telecharges'][0]['contenu_base64'] == 'JVBE'
+
+
+def test_messages_ndjson_comptes_sans_liste(config):
+    scraper = MessageScraper(config, {})
+    chemin = chemin_sortie(config, 'TA75')
+    with EcrivainNdjson(chemin) as ecrivain:
+        for message in MESSAGES:
+            scraper._conserver_message(message, None, ecrivain)
+
+    assert scraper.nb_messages_sortie == 2
+    assert list(lire_messages(chemin)) == MESSAGES
+
+
+def test_messages_json_gardes_pour_le_tableau(config):
+    scraper = MessageScraper(config, {})
+    messages_details = []
+    for message in MESSAGES:
+        scraper._conserver_message(message, messages_details, None)
+
+    assert scraper.nb_messages_sortie == 2
+    assert messages_details == MESSAGES
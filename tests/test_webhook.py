@@ -0,0 +1,240 @@
+"""
+Tests de la livraison au webhook (webhook.py) : lots, compression, format multipart
+"""
+
+import asyncio
+import gzip
+import json
+
+import aiohttp
+from aiohttp import web
+
+from blobs import MagasinBlobs
+from webhook import (
+    FileWebhook, _corps_flux, decouper_lots, pdfs_manquants, poster_multipart, refus_definitif, taille_estimee
+)
+
+
+def message(msg_id: str, taille_pdf: int = 0) -> dict:
+    fichiers = [{'type': 'href_direct', 'nom_fichier': f'{msg_id}.pdf', 'taille': taille_pdf}] if taille_pdf else []
+    return {'msg_id': msg_id, 'objet': 'Décision', 'fichiers_telecharges': fichiers}
+
+
+async def demarrer_serveur(gestionnaire):
+    """Webhook local sur un port libre : (runner, url)"""
+    app = web.Application()
+    app.router.add_post('/', gestionnaire)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/"
+
+
+def configurer(config, url: str, **reglages):
+    config.webhook_url = url
+    config.webhook_envoyeurs = 1
+    config.webhook_delai_vidage = 1
+    for nom, valeur in reglages.items():
+        setattr(config, nom, valeur)
+    return config
+
+
+def test_taille_estimee_compte_le_base64():
+    sans_pdf = taille_estimee(message('1'))
+    assert taille_estimee(message('1', taille_pdf=3000)) >= sans_pdf + 4000
+
+
+def test_decouper_lots_par_nombre():
+    messages = [message(str(i)) for i in range(5)]
+
+    lots = list(decouper_lots(messages, max_messages=2, max_octets=10 ** 9))
+
+    assert [[m['msg_id'] for m in lot] for lot in lots] == [['0', '1'], ['2', '3'], ['4']]
+
+
+def test_decouper_lots_par_taille():
+    messages = [message(str(i), taille_pdf=3000) for i in range(4)]
+    taille = taille_estimee(messages[0])
+
+    lots = list(decouper_lots(messages, max_messages=None, max_octets=taille * 2))
+
+    assert [len(lot) for lot in lots] == [2, 2]
+    assert all(sum(taille_estimee(m) for m in lot) <= taille * 2 for lot in lots)
+
+
+def test_decouper_lots_message_trop_gros():
+    messages = [message('petit'), message('gros', taille_pdf=10 ** 6), message('petit2')]
+
+    lots = list(decouper_lots(messages, max_messages=None, max_octets=10 ** 5))
+
+    assert [[m['msg_id'] for m in lot] for lot in lots] == [['petit'], ['gros'], ['petit2']]
+
+
+def test_refus_definitif():
+    assert refus_definitif(400) and refus_definitif(413)
+    assert not any(refus_definitif(statut) for statut in (0, 200, 408, 425, 429, 500, 503))
+
+
+def test_corps_gzip(tmp_path):
+    magasin = MagasinBlobs(tmp_path)
+    blob = magasin.stocker(b"%PDF-1.4 " * 50000)
+    payload = {'message': {'msg_id': '1', 'fichiers_telecharges': [blob]}}
+
+    async def lire(compresser: bool) -> bytes:
+        return b''.join([bloc async for bloc in _corps_flux(magasin, payload, compresser)])
+
+    brut = asyncio.run(lire(False))
+    compresse = asyncio.run(lire(True))
+
+    assert gzip.decompress(compresse) == brut
+    assert len(compresse) < len(brut) // 10
+    assert json.loads(brut)['message']['fichiers_telecharges'][0]['sha256'] == blob['sha256']
+
+
+def test_lots_bornes_en_octets(config):
+    lots = []
+
+    async def gestionnaire(request):
+        lots.append([m['msg_id'] for m in (await request.json())['messages']])
+        return web.Response(status=200)
+
+    async def scenario():
+        runner, url = await demarrer_serveur(gestionnaire)
+        taille = taille_estimee(message('0', taille_pdf=1000))
+        configurer(
+            config, url, webhook_lot_messages=10,
+            webhook_lot_octets=int(taille * 2.5), webhook_lot_delai=0.3
+        )
+        file = FileWebhook(config, MagasinBlobs(config.blobs_dir))
+        for i in range(5):
+            await file.ajouter(message(str(i), taille_pdf=1000), 'TA75')
+        await file.vider()
+        await runner.cleanup()
+        return file
+
+    file = asyncio.run(scenario())
+
+    # 2,5 messages par lot au plus : le troisième part dans le lot suivant
+    assert lots == [['0', '1'], ['2', '3'], ['4']]
+    assert file.nb_envoyes == 5
+
+
+def test_lot_refuse_renvoye_message_par_message(config):
+    recus = []
+
+    async def gestionnaire(request):
+        corps = await request.json()
+        if corps['nb_messages'] > 1:
+            return web.Response(status=413)
+        msg_id = corps['messages'][0]['msg_id']
+        recus.append((msg_id, request.headers['Idempotency-Key']))
+        return web.Response(status=400 if msg_id == 'invalide' else 200)
+
+    async def scenario():
+        runner, url = await demarrer_serveur(gestionnaire)
+        configurer(config, url, webhook_lot_messages=5, webhook_lot_delai=0.3)
+        livres = []
+        file = FileWebhook(config, MagasinBlobs(config.blobs_dir), au_succes=lambda code, msg_id: livres.append(msg_id))
+        for msg_id in ('1', 'invalide', '2'):
+            await file.ajouter(message(msg_id), 'TA75')
+        await file.vider()
+        await runner.cleanup()
+        return file, livres
+
+    file, livres = asyncio.run(scenario())
+
+    assert sorted(msg_id for msg_id, _ in recus) == ['1', '2', 'invalide']
+    assert sorted(livres) == ['1', '2']
+    assert (file.nb_envoyes, file.nb_rejetes, file.nb_echecs) == (2, 1, 0)
+
+
+def test_corps_multipart(tmp_path):
+    magasin = MagasinBlobs(tmp_path)
+    courrier = magasin.stocker(b"%PDF-1.4 courrier")
+    piece = magasin.stocker(b"%PDF-1.4 piece")
+    payload = {
+        'nb_messages': 2,
+        'messages': [
+            {'msg_id': '1', 'fichiers_telecharges': [
+                {'nom_fichier': 'aviaud_1_DUPONT-Jean.pdf', **courrier},
+                {'nom_fichier': '1_piece.pdf', **piece},
+            ]},
+            # Même courrier dans un autre message : une seule partie
+            {'msg_id': '2', 'fichiers_telecharges': [{'nom_fichier': 'copie.pdf', **courrier}]},
+        ]
+    }
+    parties = []
+
+    async def gestionnaire(request):
+        lecteur = await request.multipart()
+        async for partie in lecteur:
+            parties.append((partie.name, partie.filename, partie.headers.get('Content-Type'), await partie.read()))
+        return web.Response(status=200)
+
+    async def scenario():
+        runner, url = await demarrer_serveur(gestionnaire)
+        async with aiohttp.ClientSession() as session:
+            statut = await poster_multipart(session, url, payload, magasin)
+        await runner.cleanup()
+        return statut
+
+    assert asyncio.run(scenario()) == 200
+
+    nom, _, type_contenu, contenu = parties[0]
+    assert nom == 'payload' and type_contenu.startswith('application/json')
+    assert 'contenu_base64' not in contenu.decode('utf-8')
+    assert json.loads(contenu) == payload
+
+    assert parties[1:] == [
+        (courrier['sha256'], 'aviaud_1_DUPONT-Jean.pdf', 'application/pdf', b"%PDF-1.4 courrier"),
+        (piece['sha256'], '1_piece.pdf', 'application/pdf', b"%PDF-1.4 piece"),
+    ]
+
+
+def test_pdfs_manquants(tmp_path):
+    magasin = MagasinBlobs(tmp_path)
+    present = magasin.stocker(b"%PDF-1.4 present")
+    absent = {'sha256': 'ab' * 32, 'taille': 10}
+
+    assert pdfs_manquants({'message': {'fichiers_telecharges': [present]}}, magasin) == []
+    assert pdfs_manquants({'messages': [{'fichiers_telecharges': [present, absent]}]}, magasin) == [absent['sha256']]
+
+
+def test_pdf_manquant_rejete_sans_envoi(config):
+    recus = []
+
+    async def gestionnaire(request):
+        if request.content_type == 'multipart/form-data':
+            corps = await (await (await request.multipart()).next()).json()
+        else:
+            corps = await request.json()
+        recus.append(corps['messages'][0]['msg_id'])
+        return web.Response(status=200)
+
+    async def scenario(format_webhook: str):
+        runner, url = await demarrer_serveur(gestionnaire)
+        configurer(
+            config, url, webhook_format=format_webhook, webhook_lot_messages=5, webhook_lot_delai=0.3,
+            webhook_boite_envoi=config.output_dir / f"boite_{format_webhook}.sqlite"
+        )
+        magasin = MagasinBlobs(config.blobs_dir)
+        complet = message('complet')
+        complet['fichiers_telecharges'] = [{'nom_fichier': 'a.pdf', **magasin.stocker(b"%PDF-1.4 a")}]
+        incomplet = message('incomplet')
+        incomplet['fichiers_telecharges'] = [{'nom_fichier': 'b.pdf', 'sha256': 'cd' * 32, 'taille': 10}]
+
+        file = FileWebhook(config, magasin)
+        await file.ajouter(complet, 'TA75')
+        await file.ajouter(incomplet, 'TA75')
+        await file.vider()
+        await runner.cleanup()
+        return file
+
+    for format_webhook in ('json', 'multipart'):
+        recus.clear()
+        file = asyncio.run(scenario(format_webhook))
+
+        # Écarté sans relance, le reste du lot est livré
+        assert recus == ['complet']
+        assert (file.nb_envoyes, file.nb_rejetes, file.nb_echecs) == (1, 1, 0)
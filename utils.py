@@ -2,11 +2,15 @@
 Fonctions utilitaires pour le scraper Télérecours
 """
 
+import asyncio
 import json
+import re
+import time
+import unicodedata
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime
-import requests
 
 
 def save_json(data: dict, filepath: Path):
@@ -72,6 +76,55 @@ def taille_dossier_pdfs(dossier: Path) -> float:
     return total / (1024 * 1024)  # Convertir en Mo
 
 
+async def attendre_fichier(chemin: Path, timeout: float, intervalle: float = 0.05) -> bool:
+    """Attend qu'un fichier téléchargé soit complet (présent et de taille stable)
+    
+    Args:
+        chemin: Fichier attendu
+        timeout: Délai maximal en secondes
+        intervalle: Période de vérification en secondes
+    
+    Returns:
+        bool: True si le fichier est prêt avant le délai
+    """
+    echeance = time.monotonic() + timeout
+    taille_precedente = -1
+    
+    while time.monotonic() < echeance:
+        if chemin.exists():
+            taille = chemin.stat().st_size
+            if taille > 0 and taille == taille_precedente:
+                return True
+            taille_precedente = taille
+        await asyncio.sleep(intervalle)
+    
+    return False
+
+
+async def attendre_nouveau_pdf(dossier: Path, depuis: float, timeout: float, intervalle: float = 0.05) -> Optional[Path]:
+    """Attend qu'un PDF modifié après `depuis` apparaisse (complet) dans un dossier
+    
+    Args:
+        dossier: Dossier de téléchargement du navigateur
+        depuis: Timestamp (time.time()) du clic ayant déclenché le téléchargement
+        timeout: Délai maximal en secondes
+    
+    Returns:
+        Path: Le PDF le plus récent, ou None si rien n'est arrivé avant le délai
+    """
+    echeance = time.monotonic() + timeout
+    
+    while time.monotonic() < echeance:
+        pdfs_recents = [p for p in dossier.glob("*.pdf") if p.stat().st_mtime >= depuis]
+        if pdfs_recents:
+            pdf_path = max(pdfs_recents, key=lambda p: p.stat().st_mtime)
+            if await attendre_fichier(pdf_path, echeance - time.monotonic(), intervalle):
+                return pdf_path
+        await asyncio.sleep(intervalle)
+    
+    return None
+
+
 def extraire_nom_client(dossier: str) -> str:
     """Extrait le nom du client depuis le champ dossier
     
@@ -120,6 +173,23 @@ def formater_date_fichier(date_str: str) -> str:
         return "00-0000"
 
 
+def parser_date_message(date_str: str) -> Optional[datetime]:
+    """Convertit la date d'un message de la grille
+    
+    Args:
+        date_str: Date au format 'DD/MM/YYYY HH:MM' ou 'DD/MM/YYYY' (ex: '10/11/2025 13:21')
+    
+    Returns:
+        datetime: Date du message, ou None si le format n'est pas reconnu
+    """
+    for format_date in ('%d/%m/%Y %H:%M', '%d/%m/%Y'):
+        try:
+            return datetime.strptime(date_str.strip(), format_date)
+        except (ValueError, AttributeError):
+            continue
+    return None
+
+
 def generer_nom_fichier_courrier(objet_normalise: str, dossier: str, date: str, nom_fichier_original: str = "") -> str:
     """Génère le nom du fichier pour le courrier envoyé selon les règles métier
     
@@ -161,161 +231,123 @@ def generer_nom_fichier_courrier(objet_normalise: str, dossier: str, date: str,
         return f"{titre_initial}_{nom_client}.pdf"
 
 
-def normaliser_objet(objet: str) -> str:
-    """Normalise l'objet d'un message selon les règles métier
+# Règles de normalisation des objets : catégorie -> objets reconnus (ordre = priorité)
+FICHIER_REGLES_OBJETS = Path(__file__).parent / "regles_objets.json"
+
+# Suite d'un objet connu qui n'en change pas le sens : date, numéro, note entre parenthèses, séparateur
+RE_QUALIFICATIF_OBJET = re.compile(
+    r"(?:\s*(?:"
+    r"(?:(?:du|le|en date du)\s+)?\d{1,2}/\d{1,2}(?:/\d{2,4})?"
+    r"|(?:n°|no|n\.)?\s*\d[\d./-]*"
+    r"|\([^()]*\)"
+    r"|[-:,]"
+    r"))+\s*"
+)
+
+# Mots qui inversent ou modifient le sens d'un objet, même entre parenthèses
+RE_MOTS_MODIFICATEURS = re.compile(r"annul|rectif|errat|retir|retrait|report|supprim|suppression|modif|sans suite")
+
+APOSTROPHES = str.maketrans({'’': "'", '‘': "'", 'ʼ': "'", '`': "'", '´': "'"})
+
+
+def cle_objet(objet: str) -> str:
+    """Clé de comparaison d'un objet : minuscules, sans accents, apostrophes et espaces uniformisés
     
     Args:
-        objet: Objet original du message
+        objet: Objet du message (ex: "Notification ordonnance L. 522-3 rejet référé d’urgence")
     
     Returns:
-        str: Objet normalisé
+        str: Clé normalisée (ex: "notification ordonnance l. 522-3 rejet refere d'urgence")
     """
-    objet_lower = objet.lower()
-    
-    # Règle 1: Dossiers DALO
-    if objet_lower == "accusé de réception de la requête (dalo)":
-        return "Dossiers DALO"
-    
-    # Règle 2: Accusé de réception (AR)
-    ar_patterns = [
-        "accusé de réception d'une requête en référé",
-        "accusé de réception de la requête",
-        "accusé de réception d'une requête",
-        "accusé de réception requête et demande de régularisation",
-        "exe - accusé réception demande exécution décision",
-        "1 - exe - accuse reception demande execution decision"
-    ]
-    if objet_lower in ar_patterns:
-        return "Accusé de réception (AR)"
+    sans_accents = ''.join(
+        c for c in unicodedata.normalize('NFKD', objet)
+        if not unicodedata.combining(c)
+    )
+    return ' '.join(sans_accents.translate(APOSTROPHES).lower().split())
+
+
+@lru_cache(maxsize=1)
+def charger_regles_objets() -> Dict[str, str]:
+    """Compile les règles du fichier regles_objets.json en table clé -> catégorie (une seule fois)
     
-    # Règle 3: Ordonnance de renvoi
-    ordonnance_patterns = [
-        "notification ordonnance de renvoi"
-    ]
-    if objet_lower in ordonnance_patterns:
-        return "Ordonnance de renvoi"
+    Returns:
+        Dict[str, str]: Clé normalisée de l'objet -> objet normalisé
+    """
+    with open(FICHIER_REGLES_OBJETS, 'r', encoding='utf-8') as f:
+        regles = json.load(f)
+    
+    table = {}
+    for categorie, objets in regles.items():
+        for objet in objets:
+            # En cas de doublon, la première règle du fichier l'emporte
+            table.setdefault(cle_objet(objet), categorie)
+    return table
+
+
+def _qualificatif_neutre(suite: str) -> bool:
+    """Vrai si la suite d'un objet connu n'est qu'une date, un numéro ou une note neutre
     
-    # Règle 3bis: Ordonnance Autre
-    ordonnance_autre_patterns = [
-        "notification d'ordonnance",
-        "notification d'une ordonnance"
-    ]
-    if objet_lower in ordonnance_autre_patterns:
-        return "Ordonnance Autre"
-    
-    # Règle 4: Avis d'audience
-    audience_patterns = [
-        "avis de renvoi à une autre audience",
-        "Avis d'audience (requête en référé)",
-        "accusé de réception référé et avis d'audience (urgence)",
-        "accusé de réception requête en référé et avis d'audience",
-        "avis d'audience",
-        "Avis d'audience (éloignement)"
-    ]
-    if objet_lower in audience_patterns:
-        return "Avis d'audience"
-    
-    # Règle 5: Mémoire en défense
-    memoire_patterns = [
-        "communication d'un mémoire et invitation à se désister (dnl)",
-        "communication de pièces et invitation à se désister (dnl)",
-        "communication d'un mémoire en défense (référé)",
-        "communication d'un mémoire en défense",
-        "communication d'un mémoire"
-    ]
-    if objet_lower in memoire_patterns:
-        return "Mémoire en défense"
-    
-    # Règle 6: Ordonnance de clôture d'instruction (OCI)
-    oci_patterns = [
-        "notification d'ordonnance d'instruction",
-        "notification d'ordonnance de clôture d'instruction",
-        "notification d'ordonnance de report de cloture d'instruction",
-        "notification ordonnance de ci (dès l'enregistrement)"
-    ]
-    if objet_lower in oci_patterns:
-        return "Ordonnance de clôture d'instruction (OCI)"
+    Ex: " du 12/03/2025", " n° 2401234", " (requête en référé)" ; mais pas " annulé",
+    " (annulation)" ni " de la cour", qui changent l'objet.
+    """
+    return RE_QUALIFICATIF_OBJET.fullmatch(suite) is not None and not RE_MOTS_MODIFICATEURS.search(suite)
+
+
+def _faute_de_frappe(mots: List[str], connus: List[str]) -> bool:
+    """Vrai si les deux objets ne diffèrent que par une lettre d'un seul mot (même longueur)
     
-    # Règle 7: Moyen d'ordre Public
-    mop_patterns = [
-        "communication réponse à un(des) moyen(s) d'ordre public",
-        "communication moyen(s) d'ordre public"
-    ]
-    if objet_lower in mop_patterns:
-        return "Moyen d'ordre Public"
-    
-    # Règle 8: Décision
-    decision_patterns = [
-        "notification d'une ordonnance de référé",
-        "notification de jugement",
-        "Notification ordonnance L. 522-3 rejet référé d’urgence"
-    ]
-    if objet_lower in decision_patterns:
-        return "Décision"
+    Un mot ajouté, retiré ou raccourci change le sens ("arrêt" / "arrêté") : ce n'est pas le même objet.
+    """
+    if len(mots) != len(connus):
+        return False
     
-    # Règle 9: Encombrement du rôle
-    encombrement_patterns = [
-        "encombrement du rôle",
-        "enrôlement vraisemblable d'une affaire"
-    ]
-    if objet_lower in encombrement_patterns:
-        return "Encombrement du rôle"
-    
-    # Règle 10: Demande de régularisation
-    regularisation_patterns = [
-        "notification d'un arrêt",
-        "demande de régularisation (après ar de la requête)",
-        "communication de pièces complémentaires",
-        "demande de maintien de la requête",
-        "communication pour production de la réplique",
-        "exe - classement",
-        "lettre du greffier",
-        "demande de pièces pour complèter l'instruction",
-        "lettre de demande de désistement explicite",
-        "lettre d'information r.611-11-1 cja"
-    ]
-    if objet_lower in regularisation_patterns:
-        return "Demande de régularisation"
+    differents = [(mot, connu) for mot, connu in zip(mots, connus) if mot != connu]
+    if len(differents) > 1:
+        return False
     
-    # Règle 11: Avis de radiation
-    radiation_patterns = [
-        "avis de radiation"
+    return all(
+        len(mot) == len(connu) and len(mot) > 3 and sum(a != b for a, b in zip(mot, connu)) == 1
+        for mot, connu in differents
+    )
+
+
+@lru_cache(maxsize=4096)
+def _objet_approchant(cle: str) -> Optional[str]:
+    """Catégorie d'un objet inconnu proche d'un objet connu, None si le rapprochement n'est pas sûr
+    
+    1. Objet connu suivi d'un qualificatif neutre (ex: "avis d'audience du 12/03") :
+       le plus long objet connu l'emporte
+    2. Sinon, un seul objet connu à une faute de frappe près (ex: "avis d'audiance")
+    """
+    table = charger_regles_objets()
+    
+    prefixes = [
+        connu for connu in table
+        if cle.startswith(connu) and _qualificatif_neutre(cle[len(connu):])
     ]
-    if objet_lower in radiation_patterns:
-        return "Avis de radiation"
+    if prefixes:
+        return table[max(prefixes, key=len)]
     
-    # Si aucune règle ne correspond, retourner "Objet inconnu"
-    return "Objet inconnu"
+    mots = cle.split()
+    candidats = [connu for connu in table if _faute_de_frappe(mots, connu.split())]
+    if len(candidats) == 1:
+        return table[candidats[0]]
+    
+    return None
 
 
-def send_webhook(webhook_url: str, data: dict) -> bool:
-    """Envoie les données JSON vers un webhook
+def normaliser_objet(objet: str) -> str:
+    """Normalise l'objet d'un message selon les règles métier (regles_objets.json)
     
     Args:
-        webhook_url: URL du webhook
-        data: Données à envoyer (dict ou list)
+        objet: Objet original du message
     
     Returns:
-        bool: True si succès, False sinon
+        str: Objet normalisé, "Objet inconnu" si aucune règle ne correspond
     """
-    try:
-        response = requests.post(
-            webhook_url,
-            json=data,
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
-        
-        if response.status_code in [200, 201, 202, 204]:
-            print(f"\n✅ Webhook envoyé avec succès ({response.status_code})")
-            return True
-        else:
-            print(f"\n⚠️  Webhook erreur: {response.status_code} - {response.text[:100]}")
-            return False
-            
-    except requests.exceptions.Timeout:
-        print("\n❌ Webhook timeout (>30s)")
-        return False
-    except Exception as e:
-        print(f"\n❌ Erreur webhook: {str(e)}")
-        return False
\ No newline at end of file
+    cle = cle_objet(objet)
+    
+    categorie = charger_regles_objets().get(cle) or _objet_approchant(cle)
+    
+    # Si aucune règle ne correspond, retourner "Objet inconnu"
+    return categorie or "Objet inconnu"
@@ -0,0 +1,492 @@
+"""
+Livraison asynchrone des messages au webhook
+
+Les messages terminés sont placés dans une file bornée ; des tâches d'envoi en
+arrière-plan les postent avec un client HTTP aiohttp partagé (keep-alive).
+Le scraping continue pendant les envois ; la file n'est bloquante que si elle
+est pleine (webhook plus lent que l'extraction). vider() attend les derniers
+envois avant la fin de l'exécution ; ce qui n'a pas pu être livré reste dans la
+boîte d'envoi persistante et sera relancé à l'exécution suivante.
+
+Les messages peuvent être regroupés par lots (nombre, octets, fenêtre de temps)
+et le corps compressé en gzip (Content-Encoding), toujours envoyé en flux. En
+format 'multipart', les PDFs partent en binaire brut à côté du JSON au lieu
+d'être encodés en base64.
+"""
+
+import asyncio
+import json
+import time
+import zlib
+from collections import deque
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+import aiohttp
+
+from blobs import MagasinBlobs
+from boite_envoi import BoiteEnvoi, cle_idempotence, cle_lot
+from config import TelecoursConfig
+
+
+async def _corps_flux(magasin: MagasinBlobs, payload: Dict, compresser: bool = False):
+    """Corps JSON envoyé par morceaux (contenu base64 des PDFs encodé au fil de l'envoi)
+
+    Avec compresser, chaque morceau passe par un compresseur gzip incrémental.
+    """
+    compresseur = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compresser else None
+
+    for bloc in magasin.corps_json(payload):
+        if compresseur is not None:
+            bloc = compresseur.compress(bloc)
+            if not bloc:
+                continue
+        yield bloc
+
+    if compresseur is not None:
+        yield compresseur.flush()
+
+
+def taille_estimee(message: Dict) -> int:
+    """Taille approximative d'un message dans le corps JSON (base64 des PDFs compris), en octets"""
+    taille = len(json.dumps(message, ensure_ascii=False).encode('utf-8'))
+    for fichier in message.get('fichiers_telecharges', []):
+        if 'contenu_base64' not in fichier:
+            taille += (fichier.get('taille') or 0) * 4 // 3 + 20
+    return taille
+
+
+def decouper_lots(
+    messages: List[Dict],
+    max_messages: Optional[int],
+    max_octets: int
+) -> Iterator[List[Dict]]:
+    """Découpe une liste de messages en lots bornés en nombre et en taille estimée
+
+    Un message plus gros que max_octets forme un lot à lui seul.
+    """
+    lot = []
+    octets = 0
+    for message in messages:
+        taille = taille_estimee(message)
+        if lot and ((max_messages and len(lot) >= max_messages) or octets + taille > max_octets):
+            yield lot
+            lot = []
+            octets = 0
+        lot.append(message)
+        octets += taille
+    if lot:
+        yield lot
+
+
+def reponse_acceptee(statut: int) -> bool:
+    """Le webhook a accepté le payload (2xx)"""
+    return 200 <= statut < 300
+
+
+def refus_definitif(statut: int) -> bool:
+    """Erreur client (4xx) que renvoyer le même payload ne corrigera pas"""
+    return 400 <= statut < 500 and statut not in (408, 425, 429)
+
+
+async def _poster(
+    session: aiohttp.ClientSession,
+    url: str,
+    corps,
+    en_tetes: Dict[str, str]
+) -> int:
+    """POST au webhook
+
+    Returns:
+        int: Statut HTTP de la réponse, 0 si le webhook n'a pas répondu (timeout, erreur réseau)
+    """
+    try:
+        async with session.post(url, data=corps, headers=en_tetes) as response:
+            if not reponse_acceptee(response.status):
+                texte = await response.text()
+                print(f"      ⚠️  Webhook erreur: {response.status} - {texte[:100]}")
+            return response.status
+
+    except asyncio.TimeoutError:
+        print("      ❌ Webhook timeout")
+        return 0
+    except aiohttp.ClientError as e:
+        print(f"      ❌ Erreur webhook: {e}")
+        return 0
+
+
+async def poster_json(
+    session: aiohttp.ClientSession,
+    url: str,
+    payload: Dict,
+    magasin: MagasinBlobs,
+    en_tetes: Optional[Dict[str, str]] = None,
+    compresser: bool = False
+) -> int:
+    """POST d'un payload JSON au webhook, contenu des PDFs en base64
+
+    Args:
+        compresser: Corps compressé en gzip (en-tête Content-Encoding: gzip)
+
+    Returns:
+        int: Statut HTTP de la réponse, 0 si le webhook n'a pas répondu
+    """
+    en_tetes = {'Content-Type': 'application/json', **(en_tetes or {})}
+    if compresser:
+        en_tetes['Content-Encoding'] = 'gzip'
+
+    return await _poster(session, url, _corps_flux(magasin, payload, compresser), en_tetes)
+
+
+def _fichiers_du_payload(payload: Dict) -> Dict[str, str]:
+    """PDFs stockés référencés par un payload (message seul ou lot) : empreinte -> nom de fichier"""
+    messages = payload['messages'] if 'messages' in payload else [payload.get('message', {})]
+
+    fichiers = {}
+    for message in messages:
+        for fichier in message.get('fichiers_telecharges', []):
+            if fichier.get('sha256'):
+                fichiers.setdefault(fichier['sha256'], fichier.get('nom_fichier') or f"{fichier['sha256']}.pdf")
+    return fichiers
+
+
+def pdfs_manquants(payload: Dict, magasin: MagasinBlobs) -> List[str]:
+    """Empreintes des PDFs référencés par un payload mais absents du magasin (blob supprimé)"""
+    return [empreinte for empreinte in _fichiers_du_payload(payload) if not magasin.chemin(empreinte).exists()]
+
+
+async def poster_multipart(
+    session: aiohttp.ClientSession,
+    url: str,
+    payload: Dict,
+    magasin: MagasinBlobs,
+    en_tetes: Optional[Dict[str, str]] = None
+) -> int:
+    """POST multipart/form-data : le payload JSON, puis chaque PDF en binaire brut
+
+    La partie 'payload' contient le JSON sans base64 ; chaque PDF est une partie
+    nommée par son empreinte (le 'sha256' des fichiers_telecharges), avec pour
+    nom de fichier le nom_fichier du message (generer_nom_fichier_courrier pour
+    le courrier envoyé). Un même PDF n'est envoyé qu'une fois par requête. Les
+    fichiers sont lus au fil de l'envoi.
+
+    Returns:
+        int: Statut HTTP de la réponse, 0 si le webhook n'a pas répondu
+    """
+    ouverts = []
+    try:
+        with aiohttp.MultipartWriter('form-data') as corps:
+            partie = corps.append_json(payload)
+            partie.set_content_disposition('form-data', name='payload')
+
+            for empreinte, nom_fichier in _fichiers_du_payload(payload).items():
+                fichier = open(magasin.chemin(empreinte), 'rb')
+                ouverts.append(fichier)
+                partie = corps.append(fichier, {'Content-Type': 'application/pdf'})
+                partie.set_content_disposition('form-data', name=empreinte, filename=nom_fichier)
+
+        return await _poster(session, url, corps, dict(en_tetes or {}))
+
+    finally:
+        for fichier in ouverts:
+            fichier.close()
+
+
+async def poster(
+    session: aiohttp.ClientSession,
+    config: TelecoursConfig,
+    payload: Dict,
+    magasin: MagasinBlobs,
+    en_tetes: Optional[Dict[str, str]] = None
+) -> int:
+    """Envoie un payload au webhook dans le format configuré (webhook_format)
+
+    Returns:
+        int: Statut HTTP de la réponse, 0 si le webhook n'a pas répondu
+    """
+    if config.webhook_format == 'multipart':
+        return await poster_multipart(session, config.webhook_url, payload, magasin, en_tetes)
+
+    return await poster_json(
+        session, config.webhook_url, payload, magasin, en_tetes,
+        compresser=config.webhook_gzip
+    )
+
+
+FORMATS_WEBHOOK = ('json', 'multipart')
+
+
+class FileWebhook:
+    """File bornée de messages à livrer, vidée par des tâches d'envoi en arrière-plan
+
+    Chaque payload passe par la boîte d'envoi persistante (boite_envoi.py) : il
+    n'en sort qu'une fois accepté par le webhook, les échecs sont relancés avec
+    un délai exponentiel, et l'en-tête Idempotency-Key permet au destinataire
+    d'écarter les doublons.
+    """
+
+    def __init__(
+        self,
+        config: TelecoursConfig,
+        magasin: MagasinBlobs,
+        au_succes: Optional[Callable[[str, str], None]] = None
+    ):
+        """
+        Args:
+            config: Configuration Télérecours
+            magasin: Magasin des PDFs (contenu base64 encodé à l'envoi)
+            au_succes: Appelé avec (code_juridiction, msg_id) quand le webhook accepte un message
+        """
+        self.config = config
+        self.magasin = magasin
+        self.au_succes = au_succes
+        self.nb_envoyes = 0
+        self.nb_echecs = 0
+        self.nb_rejetes = 0
+        self.boite: Optional[BoiteEnvoi] = None
+        self._file: Optional[asyncio.Queue] = None
+        self._en_cours: Set[str] = set()  # Clés en file ou en cours d'envoi dans ce processus
+        self._reportees = deque()  # Clés retirées de la file mais laissées pour le lot suivant
+        self._taches = []
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def demarrer(self):
+        """Crée (une seule fois) la boîte d'envoi, le client HTTP, la file et les tâches
+
+        Les envois restés en attente lors d'une exécution précédente sont relancés.
+        """
+        if self._file is not None:
+            return
+
+        self.boite = BoiteEnvoi(
+            self.config.webhook_boite_envoi,
+            backoff_initial=self.config.webhook_backoff_initial,
+            backoff_max=self.config.webhook_backoff_max
+        )
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.config.webhook_max_connexions, keepalive_timeout=30),
+            timeout=aiohttp.ClientTimeout(total=self.config.webhook_timeout)
+        )
+        self._file = asyncio.Queue(maxsize=self.config.webhook_taille_file)
+        self._taches = [
+            asyncio.create_task(self._envoyeur())
+            for _ in range(max(1, self.config.webhook_envoyeurs))
+        ]
+        self._taches.append(asyncio.create_task(self._relanceur()))
+
+        en_attente = self.boite.nb_en_attente()
+        if en_attente:
+            print(f"📤 {en_attente} envoi(s) webhook en attente d'une exécution précédente")
+
+    def _reservation(self) -> float:
+        """Fin de réservation d'un envoi pris en charge par ce processus (les autres workers l'ignorent)"""
+        return time.time() + self.config.webhook_timeout * 4
+
+    async def ajouter(self, message: Dict, code_juridiction: str):
+        """Enregistre un message dans la boîte d'envoi et le place dans la file
+
+        N'attend que si la file est pleine (webhook plus lent que l'extraction).
+
+        Args:
+            message: Données du message à envoyer
+            code_juridiction: Code de la juridiction (ex: 'TA78')
+        """
+        self.demarrer()
+
+        cle = cle_idempotence(code_juridiction, message['msg_id'])
+        payload = {
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'code_juridiction': code_juridiction,
+            'message': message
+        }
+        self.boite.deposer(cle, code_juridiction, message['msg_id'], payload, self._reservation())
+        await self._enfiler(cle)
+
+    async def _enfiler(self, cle: str):
+        self._en_cours.add(cle)
+        await self._file.put(cle)
+
+    async def _relanceur(self):
+        """Tâche de relance : remet en file les envois dont le délai est écoulé"""
+        while True:
+            place = self._file.maxsize - self._file.qsize()
+            if place > 0:
+                for cle in self.boite.reserver_echus(self._reservation(), place):
+                    if cle not in self._en_cours:
+                        await self._enfiler(cle)
+            await asyncio.sleep(1)
+
+    async def _envoyeur(self):
+        """Tâche d'envoi : livre les messages de la file, un par un ou par lots"""
+        while True:
+            cles = [self._reportees.popleft() if self._reportees else await self._file.get()]
+            try:
+                lot = await self._composer_lot(cles)
+                if lot:
+                    await self._livrer(lot)
+            except Exception as e:
+                self.nb_echecs += len(cles)
+                for cle in cles:
+                    delai = self.boite.reprogrammer(cle, str(e))
+                print(f"      ❌ Erreur d'envoi ({e}), nouvelle tentative dans {delai:.0f}s")
+            finally:
+                for cle in cles:
+                    self._en_cours.discard(cle)
+                    self._file.task_done()
+
+    async def _composer_lot(self, cles: List[str]) -> List[Tuple[str, Dict]]:
+        """Complète le lot à partir de la file jusqu'à webhook_lot_messages messages,
+        webhook_lot_octets octets estimés ou webhook_lot_delai secondes
+
+        Les clés retirées de la file sont ajoutées à cles (acquittées par l'appelant).
+        Un message qui ferait dépasser webhook_lot_octets est reporté au lot suivant.
+
+        Returns:
+            List[Tuple[str, Dict]]: (clé, envoi) encore en attente dans la boîte d'envoi
+        """
+        lot = []
+        octets = 0
+
+        def ajouter(cle: str) -> bool:
+            """Ajoute l'envoi au lot, sauf s'il ferait dépasser la taille maximale"""
+            nonlocal octets
+            envoi = self.boite.lire(cle)
+            if envoi is None:  # Déjà acquitté (par un autre worker)
+                return True
+            taille = taille_estimee(envoi['payload']['message'])
+            if lot and octets + taille > self.config.webhook_lot_octets:
+                return False
+            lot.append((cle, envoi))
+            octets += taille
+            return True
+
+        ajouter(cles[0])
+        echeance = time.monotonic() + self.config.webhook_lot_delai
+
+        while len(cles) < self.config.webhook_lot_messages and octets < self.config.webhook_lot_octets:
+            restant = echeance - time.monotonic()
+            if restant <= 0:
+                break
+            try:
+                cle = await asyncio.wait_for(self._file.get(), restant)
+            except asyncio.TimeoutError:
+                break
+            if not ajouter(cle):
+                # Reste en file pour ce processus (_en_cours) : premier message du lot suivant
+                self._reportees.append(cle)
+                break
+            cles.append(cle)
+
+        return lot
+
+    def _payload(self, lot: List[Tuple[str, Dict]]) -> Dict:
+        """Payload d'un envoi : message seul (format historique) ou lot de messages"""
+        if self.config.webhook_lot_messages <= 1:
+            return lot[0][1]['payload']
+
+        return {
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'nb_messages': len(lot),
+            'messages': [
+                {
+                    **envoi['payload']['message'],
+                    'code_juridiction': envoi['code_juridiction'],
+                    'cle_idempotence': cle
+                }
+                for cle, envoi in lot
+            ]
+        }
+
+    async def _livrer(self, lot: List[Tuple[str, Dict]]):
+        """Envoie un message ou un lot de la boîte d'envoi et enregistre le résultat
+
+        Un lot refusé (4xx, 413 trop volumineux par exemple) est renvoyé message
+        par message : seuls les messages refusés seuls sont écartés. Un message
+        dont un PDF manque dans le magasin est écarté sans être envoyé.
+        """
+        cles = [cle for cle, _ in lot]
+        libelle = f"Message {lot[0][1]['msg_id']}" if len(lot) == 1 else f"Lot de {len(lot)} messages"
+        payload = self._payload(lot)
+
+        manquants = pdfs_manquants(payload, self.magasin)
+        if manquants and len(lot) > 1:
+            print(f"      ⚠️  {libelle} : PDF(s) absent(s) du magasin, envoi message par message")
+            for envoi in lot:
+                await self._livrer([envoi])
+            return
+        if manquants:
+            self.boite.rejeter(cles[0], f"PDF absent du magasin : {', '.join(manquants)}")
+            self.nb_rejetes += 1
+            print(f"      ⚠️  {libelle} : {len(manquants)} PDF(s) absent(s) du magasin, conservé sans relance")
+            return
+
+        statut = await poster(
+            self._session, self.config, payload, self.magasin,
+            en_tetes={'Idempotency-Key': cles[0] if len(cles) == 1 else cle_lot(cles)}
+        )
+
+        if reponse_acceptee(statut):
+            for cle, envoi in lot:
+                self.boite.acquitter(cle)
+                if self.au_succes is not None:
+                    self.au_succes(envoi['code_juridiction'], envoi['msg_id'])
+            self.nb_envoyes += len(lot)
+            print(f"      ✅ {libelle} envoyé(s) au webhook")
+
+        elif refus_definitif(statut) and len(lot) > 1:
+            print(f"      ⚠️  {libelle} refusé par le webhook ({statut}), envoi message par message")
+            for envoi in lot:
+                await self._livrer([envoi])
+
+        elif refus_definitif(statut):
+            for cle in cles:
+                self.boite.rejeter(cle, f"HTTP {statut}")
+            self.nb_rejetes += len(lot)
+            print(f"      ⚠️  {libelle} refusé(s) par le webhook ({statut}), conservé(s) sans relance")
+
+        else:
+            for cle in cles:
+                delai = self.boite.reprogrammer(cle, f"HTTP {statut}" if statut else "pas de réponse")
+            self.nb_echecs += len(lot)
+            print(f"      ⚠️  Échec d'envoi ({libelle}), nouvelle tentative dans {delai:.0f}s")
+
+    async def vider(self):
+        """Attend la livraison des messages en file et les relances proches, puis arrête les envois
+
+        Les relances prévues au-delà de webhook_delai_vidage restent dans la boîte
+        d'envoi pour l'exécution suivante.
+        """
+        if self._file is None:
+            return
+
+        if not self._file.empty():
+            print(f"\n📤 Livraison des {self._file.qsize()} dernier(s) message(s) au webhook...")
+
+        echeance = time.time() + self.config.webhook_delai_vidage
+        while True:
+            await self._file.join()
+            prochaine = self.boite.prochaine_relance()
+            if prochaine is None or prochaine > echeance:
+                break
+            # Le relanceur remet l'envoi en file dès que son délai est écoulé
+            await asyncio.sleep(max(0.0, prochaine - time.time()) + 0.5)
+
+        for tache in self._taches:
+            tache.cancel()
+        await asyncio.gather(*self._taches, return_exceptions=True)
+        await self._session.close()
+
+        en_attente = self.boite.nb_en_attente()
+        self.boite.fermer()
+
+        print(
+            f"\n📤 Webhook : {self.nb_envoyes} message(s) livré(s), {self.nb_echecs} échec(s) relancé(s), "
+            f"{self.nb_rejetes} refusé(s)"
+        )
+        if en_attente:
+            print(f"   ⏳ {en_attente} envoi(s) en attente, relancé(s) à la prochaine exécution")
+
+        self._taches = []
+        self._reportees.clear()
+        self._file = None
+        self._session = None
+        self.boite = None
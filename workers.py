@@ -0,0 +1,143 @@
+"""
+Traitement parallèle des juridictions
+Chaque worker dispose de son propre navigateur et réutilise le login de la session principale
+"""
+
+import asyncio
+from dataclasses import replace
+from typing import List, Dict, Optional
+from crawl4ai import AsyncWebCrawler
+
+from config import TelecoursConfig
+from auth import TelecoursAuth
+from notifs import NotificationDetector, JuridictionNotification
+from scraper_messages import MessageScraper
+from navigateur import creer_browser_config, installer_blocage_ressources
+from utils import compte_pdfs_dossier
+
+
+def isoler_etat_session(config: TelecoursConfig, etat_session: Optional[Dict]) -> Optional[Dict]:
+    """Retire les cookies de session serveur pour qu'un worker obtienne son propre état ASP.NET
+
+    Les cookies d'authentification sont conservés : le login reste partagé.
+    """
+    if not etat_session:
+        return None
+
+    return {
+        **etat_session,
+        'cookies': [
+            cookie for cookie in etat_session.get('cookies', [])
+            if cookie['name'] not in config.cookies_session_serveur
+        ]
+    }
+
+
+async def worker_juridictions(
+    numero: int,
+    config: TelecoursConfig,
+    file_juridictions: asyncio.Queue,
+    etat_session: Optional[Dict],
+    resultats: Dict
+):
+    """Worker : traite les juridictions de la file avec un navigateur isolé
+
+    Args:
+        numero: Numéro du worker (pour les logs et le session_id)
+        config: Configuration Télérecours
+        file_juridictions: File partagée des juridictions à traiter
+        etat_session: storage_state de la session authentifiée principale
+        resultats: Compteurs partagés (mis à jour par chaque worker)
+    """
+    config_worker = replace(config, session_id=f"{config.session_id}_w{numero}")
+    browser_config = creer_browser_config(
+        config_worker,
+        isoler_etat_session(config, etat_session),
+        utiliser_fichier=False
+    )
+
+    async with AsyncWebCrawler(config=browser_config) as crawler:
+        auth = TelecoursAuth(config_worker)
+        await auth.setup_cookie_hook(crawler)
+        await installer_blocage_ressources(crawler, config_worker)
+
+        # Session partagée refusée : ce worker se reconnecte lui-même
+        if not await auth.verifier_session(crawler):
+            print(f"   [W{numero}] Session partagée refusée, nouvelle connexion...")
+            if not await auth.login(crawler):
+                print(f"   [W{numero}] ❌ Connexion impossible, arrêt du worker")
+                return
+
+        detector = NotificationDetector(config_worker)
+        scraper = MessageScraper(config_worker, auth.cookies)
+
+        try:
+            while True:
+                try:
+                    juridiction = file_juridictions.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+
+                print(f"\n[W{numero}] 📍 {juridiction.code} ({juridiction.nom}) - {juridiction.nb_notifs} message(s)")
+
+                # Revenir sur la page de sélection avant chaque juridiction
+                if not await auth.verifier_session(crawler) or \
+                        not await detector.selectionner_juridiction(crawler, juridiction):
+                    print(f"[W{numero}] ⚠️  Impossible de sélectionner {juridiction.code}, on passe à la suivante")
+                    continue
+
+                nb_messages = await scraper.scraper_tous_messages(
+                    crawler=crawler,
+                    code_juridiction=juridiction.code,
+                    messages_non_lus_seulement=not config.scraper_messages_lus,
+                    max_messages=config.max_messages_par_juridiction
+                )
+
+                if nb_messages:
+                    nb_pdfs = compte_pdfs_dossier(config.get_pdfs_dir(juridiction.code))
+                    resultats['juridictions_traitees'] += 1
+                    resultats['total_messages'] += nb_messages
+                    resultats['total_pdfs'] += nb_pdfs
+
+                    print(f"\n[W{numero}] ✅ {juridiction.code} : {nb_messages} message(s) extrait(s)")
+
+        finally:
+            await scraper.fermer()
+            await crawler.crawler_strategy.kill_session(config_worker.session_id)
+
+
+async def scraper_juridictions_en_parallele(
+    config: TelecoursConfig,
+    juridictions: List[JuridictionNotification],
+    etat_session: Optional[Dict]
+) -> Dict:
+    """Répartit les juridictions entre config.workers workers
+
+    Args:
+        config: Configuration Télérecours
+        juridictions: Juridictions à traiter
+        etat_session: storage_state de la session authentifiée (TelecoursAuth.exporter_etat_session)
+
+    Returns:
+        Dict: Compteurs agrégés (juridictions_traitees, total_messages, total_pdfs)
+    """
+    # Les juridictions les plus chargées partent en premier
+    file_juridictions = asyncio.Queue()
+    for juridiction in sorted(juridictions, key=lambda j: j.nb_notifs, reverse=True):
+        file_juridictions.put_nowait(juridiction)
+
+    nb_workers = min(config.workers, len(juridictions))
+    print(f"\n⚡ Traitement parallèle : {len(juridictions)} juridiction(s), {nb_workers} worker(s)")
+
+    resultats = {
+        'juridictions_traitees': 0,
+        'total_messages': 0,
+        'total_pdfs': 0
+    }
+
+    await asyncio.gather(*(
+        worker_juridictions(numero, config, file_juridictions, etat_session, resultats)
+        for numero in range(1, nb_workers + 1)
+    ))
+
+    return resultats